@@ -0,0 +1,186 @@
+"""
+Пакетные предсказания каскада моделей.
+
+Model1 (фрукт/овощ) и Model2 (название, использует предсказанный type)
+применяются сразу ко всей таблице: категориальные признаки кодируются
+векторно (Category_Encoder), predict_proba вызывается
+один раз на модель, а argmax и топ-k берутся из матрицы вероятностей.
+
+Для одиночных предсказаний (окно результатов) каскад компилируется один
+раз (CompiledCascade): энкодеры становятся словарями, признаки — плоским
+вектором NumPy, а вероятности деревьев считаются напрямую по tree_ без
+проверок входа sklearn и пула joblib.
+"""
+import numpy as np
+import pandas as pd
+
+import Category_Encoder
+
+ENCODED_SUFFIX = "_encoded"
+UNKNOWN_CODE = 0    # предсказание: неизвестная категория -> самый первый класс
+
+
+def build_features(df, model_data, overrides=None):
+    """
+    Матрица признаков в порядке feature_cols модели.
+
+    overrides: {колонка: значения} — подмена исходной колонки
+               (например, предсказанный type вместо настоящего)
+    """
+    overrides = overrides or {}
+    features = {}
+    for col in model_data['feature_cols']:
+        if col.endswith(ENCODED_SUFFIX):
+            source = col[:-len(ENCODED_SUFFIX)]
+            values = overrides[source] if source in overrides else df[source]
+            features[col] = Category_Encoder.encode(model_data['le_dict'][source], values, UNKNOWN_CODE)
+        else:
+            features[col] = df[col].to_numpy()
+    return pd.DataFrame(features, columns=model_data['feature_cols'])
+
+
+def predict_proba_labels(model_data, X, top_k=1):
+    """
+    Один вызов predict_proba и метки из матрицы вероятностей.
+
+    Returns:
+        tuple: (labels (n,), confidence (n,), top_labels (n, k), top_proba (n, k))
+    """
+    model = model_data['model']
+    proba = model.predict_proba(X)
+    # model.classes_ — коды le_target, в общем случае не совпадают с номером колонки
+    class_labels = model_data['le_target'].classes_[model.classes_]
+
+    top_k = min(top_k, proba.shape[1])
+    if top_k < proba.shape[1]:
+        top = np.argpartition(-proba, top_k - 1, axis=1)[:, :top_k]
+    else:
+        top = np.tile(np.arange(proba.shape[1]), (len(proba), 1))
+    top_proba = np.take_along_axis(proba, top, axis=1)
+    order = np.argsort(-top_proba, axis=1, kind='stable')
+    top = np.take_along_axis(top, order, axis=1)
+    top_proba = np.take_along_axis(top_proba, order, axis=1)
+
+    # Лучший класс — как model.predict(): первый максимум
+    best = proba.argmax(axis=1)
+    confidence = proba[np.arange(len(proba)), best]
+    return class_labels[best], confidence, class_labels[top], top_proba
+
+
+def predict_cascade(df, model1_data, model2_data, top_k=3):
+    """
+    Предсказания обеих моделей для всех строк df.
+
+    Returns:
+        dict: type, type_confidence, name, name_confidence,
+              top_names (n, top_k), top_confidences (n, top_k)
+    """
+    X1 = build_features(df, model1_data)
+    pred_type, type_conf, _, _ = predict_proba_labels(model1_data, X1)
+
+    # Каскад: предсказанный type становится признаком Model2
+    X2 = build_features(df, model2_data, overrides={'type': pred_type})
+    pred_name, name_conf, top_names, top_conf = predict_proba_labels(model2_data, X2, top_k)
+
+    return {
+        'type': pred_type,
+        'type_confidence': type_conf,
+        'name': pred_name,
+        'name_confidence': name_conf,
+        'top_names': top_names,
+        'top_confidences': top_conf,
+    }
+
+
+class CompiledModel:
+    """
+    Модель из артефакта, подготовленная для предсказания одной строки.
+
+    Категории кодируются словарями {класс: код}, признаки собираются в
+    вектор в порядке feature_cols. Для DecisionTree и RandomForest
+    вероятности — среднее нормированных строк tree_.predict по деревьям
+    (то же, что predict_proba); для других моделей — обычный predict_proba.
+    """
+
+    def __init__(self, model_data):
+        self.model = model_data['model']
+        self.feature_cols = list(model_data['feature_cols'])
+        self.encoders = {}
+        self.sources = []
+        for col in self.feature_cols:
+            if col.endswith(ENCODED_SUFFIX):
+                source = col[:-len(ENCODED_SUFFIX)]
+                classes = model_data['le_dict'][source].classes_
+                self.encoders[source] = {str(c): code for code, c in enumerate(classes)}
+                self.sources.append(source)
+            else:
+                self.sources.append(col)
+
+        self.class_labels = model_data['le_target'].classes_[self.model.classes_]
+        self.n_classes = len(self.model.classes_)
+        if hasattr(self.model, 'tree_'):
+            self.trees = [self.model.tree_]
+        elif all(hasattr(e, 'tree_') for e in getattr(self.model, 'estimators_', [None])):
+            self.trees = [e.tree_ for e in self.model.estimators_]
+        else:
+            self.trees = None
+
+    def vector(self, values):
+        """Плоский вектор признаков (1, n) из {исходная колонка: значение}"""
+        row = [self.encoders[source].get(str(values[source]), UNKNOWN_CODE)
+               if source in self.encoders else values[source]
+               for source in self.sources]
+        return np.array([row], dtype=np.float32)
+
+    def predict_proba(self, x):
+        """Вероятности классов для вектора x (один вызов на модель)"""
+        if self.trees is None:
+            return self.model.predict_proba(pd.DataFrame(x, columns=self.feature_cols))[0]
+        proba = np.zeros(self.n_classes)
+        for tree in self.trees:
+            # Как DecisionTreeClassifier.predict_proba: в старых sklearn лист
+            # хранит взвешенные счётчики классов, а не доли
+            row = tree.predict(x)[0, :self.n_classes]
+            total = row.sum()
+            proba += row / total if total > 0 else row
+        return proba / len(self.trees)
+
+
+class CompiledCascade:
+    """
+    Каскад Model1 → Model2 для одиночных предсказаний.
+
+    Строится один раз из артефактов обеих моделей; predict() не создаёт
+    DataFrame и не вызывает энкодеры sklearn.
+    """
+
+    def __init__(self, model1_data, model2_data):
+        self.model1 = CompiledModel(model1_data)
+        self.model2 = CompiledModel(model2_data)
+
+    def predict(self, values, top_k=3):
+        """
+        values: {исходная колонка: значение} — числовые признаки и категории
+                (type не нужен: его предсказывает Model1)
+
+        Returns:
+            dict: type, type_confidence, type_labels, type_proba,
+                  name, name_confidence, top_names (k,), top_confidences (k,)
+        """
+        type_proba = self.model1.predict_proba(self.model1.vector(values))
+        best = int(type_proba.argmax())
+        pred_type = self.model1.class_labels[best]
+
+        # Каскад: предсказанный type становится признаком Model2
+        name_proba = self.model2.predict_proba(self.model2.vector(dict(values, type=pred_type)))
+        top = np.argsort(-name_proba, kind='stable')[:top_k]
+        return {
+            'type': pred_type,
+            'type_confidence': type_proba[best],
+            'type_labels': self.model1.class_labels,
+            'type_proba': type_proba,
+            'name': self.model2.class_labels[top[0]],
+            'name_confidence': name_proba[top[0]],
+            'top_names': self.model2.class_labels[top],
+            'top_confidences': name_proba[top],
+        }
@@ -0,0 +1,54 @@
+"""
+Быстрое кодирование категорий обученными LabelEncoder.
+
+le.transform([x]) на каждую строку — это вызов sklearn на элемент, а проверка
+x in le.classes_ — линейный поиск по массиву. Здесь для каждого энкодера один
+раз строится хэш-индекс классов, а колонка кодируется целиком: сначала
+выделяются уникальные значения, затем ищутся только они.
+"""
+import weakref
+
+import numpy as np
+import pandas as pd
+
+UNKNOWN = -1        # код для значений, которых энкодер не видел при обучении
+
+_indexes = weakref.WeakKeyDictionary()     # LabelEncoder -> (classes_, pd.Index)
+
+
+def class_index(le):
+    """Хэш-индекс классов энкодера (пересчитывается, если энкодер переобучен)"""
+    cached = _indexes.get(le)
+    if cached is None or cached[0] is not le.classes_:
+        cached = (le.classes_, pd.Index(le.classes_))
+        _indexes[le] = cached
+    return cached[1]
+
+
+def encode(le, values, unknown=UNKNOWN):
+    """
+    Векторный аналог le.transform([str(x)])[0] для каждого значения.
+
+    Args:
+        le: обученный LabelEncoder
+        values: Series, массив или список значений
+        unknown: код для неизвестных значений
+
+    Returns:
+        np.ndarray кодов (int64)
+    """
+    values = pd.Series(values) if not isinstance(values, pd.Series) else values
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        uniques = values.cat.categories.astype(str)
+    else:
+        codes, uniques = pd.factorize(values, use_na_sentinel=False)
+        uniques = pd.Index(uniques).astype(str)
+
+    mapped = class_index(le).get_indexer(uniques).astype(np.int64)
+    mapped[mapped < 0] = unknown
+    if codes.min(initial=0) < 0:
+        # NaN в Categorical -> строка 'nan', как у astype(str)
+        nan_code = class_index(le).get_indexer(['nan'])[0]
+        mapped = np.append(mapped, nan_code if nan_code >= 0 else unknown)
+    return mapped[codes]
@@ -3,6 +3,7 @@ import socket
 import threading
 import struct
 import json
+import hashlib
 from pathlib import Path
 import time
 
@@ -11,18 +12,41 @@ from PyQt5.QtWidgets import (QApplication, QWidget, QPushButton, QLabel, QMessag
 from PyQt5.QtGui import QPainter, QPixmap
 from PyQt5.QtCore import Qt, QPoint, pyqtSignal, QObject
 
+# Общие модули клиента лежат рядом с шаблоном
+TEMPLATE_DIR = Path(__file__).resolve().parent
+if str(TEMPLATE_DIR) not in sys.path:
+    sys.path.insert(0, str(TEMPLATE_DIR))
+
+import Transfer_Format
+import Receive_Buffer
+import Compression
+import Model_Registry
+import Core_Budget
+
 SERVER_IP = "127.0.0.1"  # placeholder
 PORT = 9090
 
 CLIENT_NAME = "NameNameName"
 CLIENT_LEVEL = "1"
 CLIENT_MODE = "Parallel"
+CLIENT_STREAMING = False  # True — do_work() обрабатывает строки независимо и может получать части набора
+
+# Ресурсы, которые do_work() читает и пишет: "column:<колонка>", "model:<модель>",
+# "rows" (этап меняет состав или порядок строк). По ним сервер строит граф
+# зависимостей этапов; None — не объявлено (порядок по уровням)
+CLIENT_INPUTS = None
+CLIENT_OUTPUTS = None
+CLIENT_DEPENDENCIES = []  # файлы данных, от которых зависит результат do_work() (входят в версию)
+CLIENT_CACHEABLE = True   # False — у do_work() есть действие вне набора данных, кэш этапов его не повторит
 
 client_socket = None
 connected = False
 
 csv_file_path = None
 csv_data = None
+dataframe = None                          # DataFrame, если сервер прислал бинарный формат
+dataset_format = Transfer_Format.FORMAT_CSV  # формат полученных данных и ответа
+accept_column_patch = False               # сервер принимает ответ return_columns
 processed_count = 0
 
 # Папки для файлов
@@ -43,38 +67,332 @@ signals = Signals()
 
 # ======================= Функции передачи данных =======================
 def recv_exact(sock, n):
-    """Получение точного количества байт"""
-    buf = bytearray()
-    while len(buf) < n:
-        chunk = sock.recv(n - len(buf))
-        if not chunk:
-            raise ConnectionError("Connection interrupted")
-        buf.extend(chunk)
-    return bytes(buf)
-
-
-def recv_message(sock):
-    """Получение структурированного сообщения"""
+    """Получение точного количества байт (recv_into в один буфер)"""
+    return Receive_Buffer.recv_exact(sock, n)
+
+
+def recv_message(sock, spill_dir=None):
+    """
+    Получение структурированного сообщения.
+
+    Тело принимается без промежуточных копий; если задан spill_dir,
+    большое тело принимается прямо в файл (см. Receive_Buffer).
+    Сжатое тело ("codec" в заголовке) распаковывается по кадрам.
+    """
     raw = sock.recv(4)
     if not raw:
         return None, None
+    if len(raw) < 4:
+        raw += recv_exact(sock, 4 - len(raw))
 
     header_len = struct.unpack(">I", raw)[0]
     header_bytes = recv_exact(sock, header_len)
     header = json.loads(header_bytes.decode('utf-8'))
 
-    size = header.get("size", 0)
-    data = recv_exact(sock, size) if size > 0 else b""
+    data = Compression.recv_body(sock, header, spill_dir)
     return header, data
 
 
-def send_message(sock, header, data):
-    """Отправка структурированного сообщения"""
+def send_message(sock, header, data, codec=None):
+    """
+    Отправка структурированного сообщения.
+
+    Если задан codec, тело передаётся сжатым потоком кадров (см. Compression),
+    а "size" в заголовке остаётся размером несжатых данных.
+    """
+    if data and codec:
+        header = dict(header, codec=codec)
     header_bytes = json.dumps(header).encode('utf-8')
     sock.sendall(struct.pack(">I", len(header_bytes)))
     sock.sendall(header_bytes)
     if data:
-        sock.sendall(data)
+        if codec:
+            Compression.send_compressed(sock, data, codec)
+        else:
+            sock.sendall(data)
+
+
+# ======================= Работа с набором данных =======================
+def client_capabilities():
+    """Возможности клиента, которые сервер получает при рукопожатии"""
+    capabilities = {
+        "formats": Transfer_Format.available_formats(),
+        "streaming": CLIENT_STREAMING,
+        "codecs": Compression.available_codecs(),
+        # Хост и его ядра: сервер делит ядра между этапами одного хоста
+        "host": Core_Budget.host_id(),
+        "cores": Core_Budget.host_cores(),
+    }
+    plugin = plugin_path()
+    if plugin:
+        # Путь к файлу плагина: клиент на том же хосте может выполнить его в своём процессе
+        capabilities["plugin"] = plugin
+        # Версия кода: по ней сервер узнаёт, что результат этапа можно взять из кэша
+        capabilities["version"] = plugin_version()
+        capabilities["restore"] = True
+        capabilities["cacheable"] = CLIENT_CACHEABLE
+    if CLIENT_INPUTS is not None or CLIENT_OUTPUTS is not None:
+        capabilities["inputs"] = list(CLIENT_INPUTS or [])
+        capabilities["outputs"] = list(CLIENT_OUTPUTS or [])
+    return capabilities
+
+
+def plugin_version():
+    """
+    Хэш кода плагина, общих модулей шаблона и файлов CLIENT_DEPENDENCIES —
+    от всего этого зависит результат do_work().
+    """
+    digest = hashlib.sha256()
+    files = [Path(plugin_path())] + sorted(TEMPLATE_DIR.glob("*.py"))
+    files += [Path(p) for p in CLIENT_DEPENDENCIES]
+    for file in files:
+        digest.update(file.name.encode("utf-8"))
+        try:
+            digest.update(file.read_bytes())
+        except OSError:
+            digest.update(b"<missing>")
+    return digest.hexdigest()
+
+
+def plugin_path():
+    """Файл плагина, который определил do_work() (None для заглушки шаблона)"""
+    module = sys.modules.get(getattr(do_work, "__module__", None))
+    path = getattr(module, "__file__", None)
+    if module is None or module is sys.modules[__name__] or not path:
+        return None
+    return str(Path(path).resolve())
+
+
+def load_dataframe():
+    """
+    Текущий набор данных как pandas DataFrame.
+
+    Если сервер прислал бинарный формат, таблица уже готова и CSV не разбирается.
+
+    Returns:
+        pd.DataFrame или None, если данные не получены
+    """
+    if dataframe is not None:
+        return dataframe
+    if csv_data:
+        import io
+        import pandas as pd
+        return pd.read_csv(io.StringIO(csv_data))
+    if dataset_format == Transfer_Format.FORMAT_CSV and csv_file_path is not None:
+        # Полученный CSV не держится в памяти строкой — разбирается прямо из файла
+        return Transfer_Format.decode_dataframe(csv_file_path, Transfer_Format.FORMAT_CSV)
+    return None
+
+
+def dump_dataframe(df):
+    """
+    Результат do_work() в формате, в котором пришли данные.
+
+    Returns:
+        str: CSV строка, если данные пришли как CSV
+        pd.DataFrame: сама таблица — её сериализует listen_server()
+    """
+    if dataset_format == Transfer_Format.FORMAT_CSV:
+        return df.to_csv(index=False)
+    return df
+
+
+def return_columns(df, columns):
+    """
+    Результат do_work(), содержащий только новые или изменённые колонки.
+
+    Строки, в которых все эти колонки пустые, не отправляются. Индекс df —
+    row id сервера, поэтому его нельзя сбрасывать (ignore_index/reset_index).
+    Если сервер не принимает патчи, возвращается полный набор данных,
+    как dump_dataframe(df).
+    """
+    if not accept_column_patch:
+        return dump_dataframe(df)
+    return Transfer_Format.ColumnPatch(df[list(columns)].dropna(how='all'))
+
+
+def map_unique(series, func, batch=False):
+    """
+    Построчное преобразование колонки с вычислением один раз на значение.
+
+    Колонка факторизуется, func вызывается для каждого уникального значения
+    (NaN тоже считается значением), результаты раздаются строкам по кодам.
+    Для колонок с малым числом различных значений это O(distinct) вызовов
+    вместо O(rows). func должна зависеть только от значения.
+
+    Args:
+        series: pd.Series
+        func: value -> результат; при batch=True — pd.Series уникальных
+              значений -> последовательность результатов той же длины
+        batch: передать func все уникальные значения одним вызовом
+
+    Returns:
+        pd.Series с тем же индексом и именем
+    """
+    import numpy as np
+    import pandas as pd
+
+    try:
+        codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    except TypeError:
+        # Нехешируемые значения (списки) — обычный построчный путь
+        return series.map(func) if not batch else pd.Series(
+            list(func(series)), index=series.index, name=series.name)
+
+    uniques = pd.Series(uniques, dtype=series.dtype if len(uniques) else object)
+    results = list(func(uniques)) if batch else [func(value) for value in uniques]
+
+    table = np.empty(len(results), dtype=object)
+    for i, result in enumerate(results):  # поэлементно: результаты могут быть списками
+        table[i] = result
+    return pd.Series(table[codes].tolist(), index=series.index, name=series.name)
+
+
+def encode_result(result_data):
+    """
+    Сериализация результата do_work() для отправки серверу.
+
+    Returns:
+        tuple: (action, data: bytes или None, fmt)
+    """
+    if isinstance(result_data, Transfer_Format.ColumnPatch):
+        data, fmt = Transfer_Format.encode_column_patch(result_data.frame, dataset_format)
+        return "return_columns", data, fmt
+    if result_data is not None and not isinstance(result_data, str):
+        # do_work вернул DataFrame — сериализуем в согласованном формате
+        data, fmt = Transfer_Format.encode_dataframe(result_data, dataset_format)
+        return "return_file", data, fmt
+    if result_data:
+        return "return_file", result_data.encode('utf-8'), Transfer_Format.FORMAT_CSV
+    return "return_file", None, None
+
+
+def process_chunk(header, data):
+    """
+    Обработка одной части набора данных в потоковом (конвейерном) режиме.
+
+    Часть приходит с row id основной таблицы, do_work() вызывается как обычно,
+    а ответ всегда содержит row id, чтобы сервер мог передать часть дальше.
+
+    Returns:
+        tuple: (header: dict, data: bytes) ответа work_result
+    """
+    global csv_data, dataframe, dataset_format, accept_column_patch
+    import io
+    import pandas as pd
+
+    fmt = header.get("format", Transfer_Format.FORMAT_CSV)
+    chunk = Transfer_Format.decode_column_patch(Receive_Buffer.payload_source(data), fmt)
+    Receive_Buffer.release_payload(data)
+
+    # Полный набор (если он был получен) не заменяется частью
+    saved = csv_data, dataframe, dataset_format, accept_column_patch
+    csv_data, dataframe, dataset_format = None, chunk, fmt
+    accept_column_patch = True
+    try:
+        with Core_Budget.limit(header.get("cores")):
+            result, new_data = do_work()
+    finally:
+        csv_data, dataframe, dataset_format, accept_column_patch = saved
+
+    if isinstance(new_data, Transfer_Format.ColumnPatch):
+        frame = new_data.frame
+    elif isinstance(new_data, str) and new_data:
+        # CSV без индекса: row id берутся по позиции, поэтому строки нельзя
+        # удалять или переставлять — иначе сервер слил бы их не с теми строками
+        frame = pd.read_csv(io.StringIO(new_data))
+        if len(frame) == len(chunk):
+            frame.index = chunk.index
+        else:
+            result = (f"Error: CSV chunk result has {len(frame)} rows instead of {len(chunk)}; "
+                      f"streaming plugins that drop rows must return return_columns")
+            frame = None
+    else:
+        frame = new_data
+
+    reply = {"action": "work_result", "seq": header.get("seq"), "status": result}
+    if frame is None:
+        reply["size"] = 0
+        return reply, b""
+
+    payload, out_format = Transfer_Format.encode_column_patch(frame, fmt)
+    reply.update({"format": out_format, "columns": list(frame.columns), "size": len(payload)})
+    return reply, payload
+
+
+# ======================= Слияние этапов =======================
+_fused_plugins = {}  # путь к файлу плагина -> его do_work
+
+
+def load_plugin_work(path):
+    """
+    do_work() другого плагина для выполнения в этом процессе.
+
+    Плагин при импорте переписывает CLIENT_NAME, CLIENT_LEVEL, ... и do_work
+    этого модуля, поэтому они сохраняются и восстанавливаются. Плагин
+    загружается один раз на процесс.
+    """
+    global CLIENT_NAME, CLIENT_LEVEL, CLIENT_MODE, CLIENT_STREAMING, CLIENT_INPUTS, CLIENT_OUTPUTS, \
+        CLIENT_DEPENDENCIES, CLIENT_CACHEABLE, do_work
+    import importlib.util
+
+    path = str(Path(path).resolve())
+    if path in _fused_plugins:
+        return _fused_plugins[path]
+
+    saved = (CLIENT_NAME, CLIENT_LEVEL, CLIENT_MODE, CLIENT_STREAMING,
+             CLIENT_INPUTS, CLIENT_OUTPUTS, CLIENT_DEPENDENCIES, CLIENT_CACHEABLE, do_work)
+    try:
+        spec = importlib.util.spec_from_file_location(f"_fused_{Path(path).stem}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        (CLIENT_NAME, CLIENT_LEVEL, CLIENT_MODE, CLIENT_STREAMING,
+         CLIENT_INPUTS, CLIENT_OUTPUTS, CLIENT_DEPENDENCIES, CLIENT_CACHEABLE, do_work) = saved
+
+    _fused_plugins[path] = module.do_work
+    return module.do_work
+
+
+def run_fused(plugin_paths):
+    """
+    Выполнение своего do_work() и do_work() следующих этапов подряд
+    над одной таблицей в памяти.
+
+    Между этапами данные не сериализуются: каждый этап получает DataFrame,
+    патчи колонок сразу сливаются по row id. Результат — весь набор после
+    последнего этапа в формате, в котором пришли данные.
+
+    Returns:
+        tuple: (результат: str, данные) как у do_work()
+    """
+    global csv_data, dataframe, dataset_format, accept_column_patch
+    import io
+    import pandas as pd
+
+    stages = [do_work] + [load_plugin_work(path) for path in plugin_paths]
+    df = load_dataframe()
+    messages = []
+
+    saved = csv_data, dataframe, dataset_format, accept_column_patch
+    try:
+        for work in stages:
+            # Бинарный формат: dump_dataframe() вернёт саму таблицу
+            csv_data, dataframe = None, df
+            dataset_format, accept_column_patch = Transfer_Format.FORMAT_PICKLE, True
+            result, new_data = work()
+            messages.append(str(result))
+
+            if isinstance(new_data, Transfer_Format.ColumnPatch):
+                df = Transfer_Format.merge_columns(df.copy(deep=False), new_data.frame)
+            elif isinstance(new_data, str) and new_data:
+                df = pd.read_csv(io.StringIO(new_data))
+            elif new_data is not None and not isinstance(new_data, str):
+                df = new_data
+    finally:
+        csv_data, dataframe, dataset_format, accept_column_patch = saved
+
+    return "\n".join(messages), dump_dataframe(df)
 
 
 # ======================= Основная функция работы =======================
@@ -88,122 +406,141 @@ def do_work():
     return work, None  # Возвращаем кортеж (результат, новый_csv)
 
 
+# ======================= Слушатель сервера =======================
+def handle_work_request(header, data):
+    """
+    Обработка запроса work_request от сервера.
+
+    Набор данных приходит в теле запроса, текстовый результат do_work()
+    уходит в заголовке ответа work_result, обработанные данные — в теле.
+    Запрос с полем seq — часть набора в потоковом режиме, с полем fuse —
+    цепочка плагинов, выполняемых в этом процессе (run_fused).
+
+    Returns:
+        tuple: (header: dict, data: bytes) ответа work_result
+    """
+    global csv_data, csv_file_path, processed_count, dataframe, dataset_format, \
+        accept_column_patch
+
+    if "seq" in header:
+        return process_chunk(header, data)
+
+    filename = header.get("filename", "received.csv")
+
+    # Сохраняем файл
+    save_path = RECV_DIR / filename
+    i = 1
+    base, suff = save_path.stem, save_path.suffix
+    while save_path.exists():
+        save_path = RECV_DIR / f"{base}_{i}{suff}"
+        i += 1
+
+    # Загружаем данные в память: бинарная таблица восстанавливается прямо из
+    # буфера приёма, CSV не превращается в строку — load_dataframe() читает файл
+    size = len(data)
+    dataset_format = header.get("format", Transfer_Format.FORMAT_CSV)
+    csv_data = None
+    if dataset_format == Transfer_Format.FORMAT_CSV:
+        dataframe = None
+    else:
+        dataframe = Transfer_Format.decode_dataframe(data, dataset_format)
+
+    # Сохраняем файл (тело, принятое на диск, просто переименовывается)
+    Receive_Buffer.save_payload(data, save_path)
+    del data
+    csv_file_path = save_path
+    accept_column_patch = "return_columns" in header.get("accepts", [])
+    print(f"[CSV] Received {dataset_format} file {filename} ({size} bytes) -> {save_path}")
+
+    Model_Registry.take_saved_models()
+    # Этап использует не больше ядер, чем выделил ему сервер (Core_Budget)
+    with Core_Budget.limit(header.get("cores")):
+        if header.get("fuse"):
+            # Следующие этапы на этом же хосте выполняются здесь же, без передачи данных
+            result, new_csv = run_fused(header["fuse"])
+        else:
+            result, new_csv = do_work()
+    # Модели, сохранённые этапом, — сервер запоминает их хэши в кэше этапов
+    artifacts = Model_Registry.take_saved_models()
+
+    if processed_count == 0:
+        print(result)
+        processed_count += 1
+
+    # Обработанный файл (или только новые колонки) уходит в теле ответа
+    action, processed_data, out_format = encode_result(new_csv)
+    reply = {"action": "work_result", "status": result}
+    if artifacts:
+        reply["artifacts"] = artifacts
+
+    if not processed_data:
+        print("[!] No updates to send")
+        reply.update({"result": "no_update", "size": 0})
+        return reply, b""
+
+    filename = f"processed_{CLIENT_NAME}{Transfer_Format.FILE_EXTENSIONS[out_format]}"
+
+    # Сохраняем локально
+    processed_path = PROCESSED_DIR / filename
+    with open(processed_path, 'wb') as f:
+        f.write(processed_data)
+
+    reply.update({
+        "result": action,
+        "filename": filename,
+        "format": out_format,
+        "size": len(processed_data)
+    })
+    if isinstance(new_csv, Transfer_Format.ColumnPatch):
+        reply["columns"] = new_csv.columns
+    print(f"[CSV] Sent {action} {out_format} ({len(processed_data)} bytes)")
+    return reply, processed_data
+
+
 # ======================= Слушатель сервера =======================
 def listen_server():
-    global connected, csv_data, csv_file_path, processed_count
+    global connected
 
     while connected:
         try:
-            if not connected or client_socket is None:
-                break
-
-            client_socket.settimeout(1.0)
-
-            try:
-                peek = client_socket.recv(4, socket.MSG_PEEK)
-                if not peek:
-                    continue
-
-                # Проверяем, это файл или команда
-                try:
-                    header_len = struct.unpack(">I", peek)[0]
-                    if 0 < header_len < 10000:
-                        # Это структурированное сообщение (файл)
-                        client_socket.settimeout(None)
-                        header, data = recv_message(client_socket)
-
-                        if header and header.get("action") == "send_file":
-                            filename = header.get("filename", "received.csv")
-
-                            # Сохраняем файл
-                            save_path = RECV_DIR / filename
-                            i = 1
-                            base, suff = save_path.stem, save_path.suffix
-                            while save_path.exists():
-                                save_path = RECV_DIR / f"{base}_{i}{suff}"
-                                i += 1
-
-                            with open(save_path, 'wb') as f:
-                                f.write(data)
-
-                            # Загружаем CSV в память
-                            csv_data = data.decode('utf-8')
-                            csv_file_path = save_path
-                            print(f"[CSV] Received file {filename} ({len(data)} bytes) -> {save_path}")
-                        continue
-                except (struct.error, UnicodeDecodeError):
-                    pass
-
-            except socket.timeout:
-                continue
-            except (OSError, ConnectionError):
-                # Сокет закрыт или соединение потеряно
+            sock = client_socket
+            if sock is None:
                 break
 
-            # Если не файл, читаем как команду
-            if not connected or client_socket is None:
+            # После рукопожатия сервер присылает только сообщения с заголовком
+            header, data = recv_message(sock, spill_dir=RECV_DIR)
+            if header is None:
                 break
 
-            client_socket.settimeout(None)
-            msg = client_socket.recv(1024).decode('utf-8')
-
-            if not msg:
-                break
+            action = header.get("action")
 
-            if msg == "DISCONNECT":
+            if action == "work_request":
+                print("[WORK] Work request received")
+                reply, payload = handle_work_request(header, data)
+                # Ответ сжимается кодеком, который сервер указал в запросе
+                codec = Compression.choose_codec(header.get("codecs"), len(payload), SERVER_IP)
+                send_message(sock, reply, payload, codec)
+
+            elif action == "restore_artifacts":
+                # Этап взят из кэша сервера: возвращаем соответствующие ему модели
+                restored = all(Model_Registry.restore_model(name, digest)
+                               for name, digest in header.get("artifacts", {}).items())
+                send_message(sock, {"action": "artifacts_restored", "restored": restored}, b"")
+
+            elif action == "disconnect":
                 signals.show_info.emit("Server", "You were disconnected by the server.")
                 disconnect()
                 break
 
-            elif msg.startswith("ERROR:"):
-                signals.show_error.emit("Error", msg.replace("ERROR:", "").strip())
+            elif action == "error":
+                signals.show_error.emit("Error", header.get("message", ""))
                 disconnect()
                 break
 
-            elif msg == "WORK":
-                print("[WORK] Work request received")
-                result, new_csv = do_work()
-
-                if processed_count == 0:
-                    print(result)
-                    processed_count += 1
-
-                # Отправляем текстовый результат
-                client_socket.send(result.encode('utf-8'))
-                time.sleep(0.3)
-
-                # Отправляем обработанный файл обратно
-                if new_csv:
-                    processed_data = new_csv.encode('utf-8')
-
-                    # Сохраняем локально
-                    processed_path = PROCESSED_DIR / f"processed_{CLIENT_NAME}.csv"
-                    with open(processed_path, 'wb') as f:
-                        f.write(processed_data)
-
-                    # Отправляем серверу
-                    header = {
-                        "action": "return_file",
-                        "filename": f"processed_{CLIENT_NAME}.csv",
-                        "size": len(processed_data)
-                    }
-                    send_message(client_socket, header, processed_data)
-                    print(f"[CSV] Sent processed file ({len(processed_data)} bytes)")
-                else:
-                    print("[!] No updates to send")
-                    no_update_data = b"NO_UPDATE"
-                    header = {
-                        "action": "return_file",
-                        "filename": "no_update.txt",
-                        "size": len(no_update_data)
-                    }
-                    send_message(client_socket, header, no_update_data)
-
-        except socket.timeout:
-            continue
         except (OSError, ConnectionError) as e:
             # Сокет закрыт или ошибка соединения
-            print(f"[!] Connection interrupted: {e}")
+            if connected:
+                print(f"[!] Connection interrupted: {e}")
             break
         except Exception as e:
             print(f"[!] Error receiving data: {e}")
@@ -222,7 +559,8 @@ def connect():
     try:
         client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         client_socket.connect((SERVER_IP, PORT))
-        data = f"{CLIENT_NAME}|{CLIENT_LEVEL}|{CLIENT_MODE}"
+        client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        data = f"{CLIENT_NAME}|{CLIENT_LEVEL}|{CLIENT_MODE}|{json.dumps(client_capabilities())}"
         client_socket.send(data.encode('utf-8'))
 
         client_socket.settimeout(2)
@@ -259,6 +597,13 @@ def disconnect():
 
     connected = False  # Останавливаем поток
 
+    try:
+        if client_socket:
+            # shutdown будит поток listen_server, ждущий в recv
+            client_socket.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
     try:
         if client_socket:
             client_socket.close()
@@ -274,10 +619,15 @@ class SettingsDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Server Settings")
-        self.setFixedSize(300, 160)
+        self.setFixedSize(300, 210)
 
         layout = QVBoxLayout()
 
+        # Несколько экземпляров одного плагина (шарды одного уровня) различаются именем
+        layout.addWidget(QLabel("Client name:"))
+        self.name_entry = QLineEdit(CLIENT_NAME)
+        layout.addWidget(self.name_entry)
+
         layout.addWidget(QLabel("Server IP:"))
         self.ip_entry = QLineEdit(SERVER_IP)
         layout.addWidget(self.ip_entry)
@@ -293,18 +643,22 @@ class SettingsDialog(QDialog):
         self.setLayout(layout)
 
     def save_settings(self):
-        global SERVER_IP, PORT
+        global SERVER_IP, PORT, CLIENT_NAME
         try:
             new_ip = self.ip_entry.text().strip()
             new_port = int(self.port_entry.text().strip())
-            if not new_ip:
+            new_name = self.name_entry.text().strip()
+            if not new_ip or not new_name or "|" in new_name:
                 raise ValueError
             SERVER_IP = new_ip
             PORT = new_port
+            CLIENT_NAME = new_name
+            if self.parent() is not None:
+                self.parent().text1.setText(CLIENT_NAME)
             QMessageBox.information(self, "Saved", f"New server: {SERVER_IP}:{PORT}")
             self.accept()
         except:
-            QMessageBox.critical(self, "Error", "Invalid IP or port.")
+            QMessageBox.critical(self, "Error", "Invalid name, IP or port.")
 
 
 # ======================= Главное окно =======================
@@ -0,0 +1,204 @@
+"""
+Сжатие тела сообщения, согласуемое между сервером и клиентом.
+
+Каждая сторона сообщает, какие кодеки у неё есть: клиент — в рукопожатии
+(capabilities["codecs"]), сервер — в заголовке work_request ("codecs").
+Отправитель выбирает кодек для каждой передачи (choose_codec): маленькие
+тела идут как есть, большие — сжатыми первым кодеком, который есть у обеих
+сторон. zlib есть всегда, lz4 и zstd — если установлены пакеты lz4 /
+zstandard. Между процессами одного хоста (loopback) сжатие не используется:
+передача по loopback быстрее любого кодека.
+
+Сжатое тело отмечается в заголовке ("codec"), а "size" остаётся размером
+несжатых данных — получатель заранее выделяет под них буфер (или файл,
+см. Receive_Buffer). Само тело — поток кадров "длина (4 байта) + блок
+сжатых данных", завершённый кадром нулевой длины. Сжатие и распаковка
+идут блоками по BLOCK_SIZE байт, поэтому большой набор данных никогда
+не сжимается одним буфером в памяти.
+"""
+import ipaddress
+import struct
+import zlib
+
+import Receive_Buffer
+
+try:
+    import lz4.frame as _lz4
+except ImportError:
+    _lz4 = None
+
+try:
+    import zstandard as _zstd
+except ImportError:
+    _zstd = None
+
+CODEC_ZLIB = "zlib"
+CODEC_LZ4 = "lz4"
+CODEC_ZSTD = "zstd"
+
+# Тела меньше этого размера не сжимаются: выигрыш не окупает задержку
+COMPRESS_MIN_BYTES = 1024 * 1024
+
+# Размер блока несжатых данных при потоковом сжатии
+BLOCK_SIZE = 1024 * 1024
+
+ZLIB_LEVEL = 1
+ZSTD_LEVEL = 3
+
+_FRAME = struct.Struct(">I")
+
+
+def available_codecs():
+    """Кодеки, доступные в этом процессе, в порядке предпочтения"""
+    codecs = []
+    if _zstd is not None:
+        codecs.append(CODEC_ZSTD)
+    if _lz4 is not None:
+        codecs.append(CODEC_LZ4)
+    codecs.append(CODEC_ZLIB)
+    return codecs
+
+
+def is_loopback(host):
+    """True, если host — адрес loopback (получатель на том же хосте)"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def choose_codec(remote_codecs, size, peer_host=None):
+    """
+    Кодек для передачи size байт получателю с кодеками remote_codecs.
+
+    Returns:
+        str или None — передавать без сжатия
+    """
+    if not remote_codecs or size < COMPRESS_MIN_BYTES:
+        return None
+    if peer_host is not None and is_loopback(peer_host):
+        return None
+    for codec in available_codecs():
+        if codec in remote_codecs:
+            return codec
+    return None
+
+
+class _Lz4Compressor:
+    """LZ4FrameCompressor с интерфейсом compressobj (compress/flush)"""
+
+    def __init__(self):
+        self._compressor = _lz4.LZ4FrameCompressor()
+        self._started = False
+
+    def compress(self, data):
+        out = b""
+        if not self._started:
+            out = self._compressor.begin()
+            self._started = True
+        return out + self._compressor.compress(data)
+
+    def flush(self):
+        out = b"" if self._started else self._compressor.begin()
+        return out + self._compressor.flush()
+
+
+def compressor(codec):
+    """Потоковый компрессор: compress(блок) -> bytes, flush() -> bytes"""
+    if codec == CODEC_ZLIB:
+        return zlib.compressobj(ZLIB_LEVEL)
+    if codec == CODEC_LZ4 and _lz4 is not None:
+        return _Lz4Compressor()
+    if codec == CODEC_ZSTD and _zstd is not None:
+        return _zstd.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    raise ValueError(f"Unsupported codec: {codec}")
+
+
+def decompressor(codec):
+    """Потоковый декомпрессор: decompress(блок) -> bytes"""
+    if codec == CODEC_ZLIB:
+        return zlib.decompressobj()
+    if codec == CODEC_LZ4 and _lz4 is not None:
+        return _lz4.LZ4FrameDecompressor()
+    if codec == CODEC_ZSTD and _zstd is not None:
+        return _zstd.ZstdDecompressor().decompressobj()
+    raise ValueError(f"Unsupported codec: {codec}")
+
+
+def _blocks(source):
+    """Блоки по BLOCK_SIZE байт из bytes-подобного объекта или двоичного файла"""
+    if hasattr(source, "readinto"):
+        buf = bytearray(BLOCK_SIZE)
+        with memoryview(buf) as view:
+            while True:
+                n = source.readinto(buf)
+                if not n:
+                    return
+                yield view[:n]
+    else:
+        with memoryview(source) as view:
+            view = view.cast("B")
+            for start in range(0, len(view), BLOCK_SIZE):
+                yield view[start:start + BLOCK_SIZE]
+
+
+def _send_frame(sock, data):
+    if data:
+        sock.sendall(_FRAME.pack(len(data)) + data)
+    return len(data)
+
+
+def send_compressed(sock, source, codec):
+    """
+    Отправка тела (bytes или открытый двоичный файл) сжатыми кадрами.
+
+    Returns:
+        int: количество сжатых байт (без заголовков кадров)
+    """
+    comp = compressor(codec)
+    sent = 0
+    for block in _blocks(source):
+        sent += _send_frame(sock, comp.compress(block))
+    sent += _send_frame(sock, comp.flush())
+    sock.sendall(_FRAME.pack(0))
+    return sent
+
+
+def recv_compressed(sock, size, codec, spill_dir=None):
+    """
+    Приём сжатого тела с распаковкой по кадрам прямо в буфер на size байт.
+
+    Returns:
+        bytearray или SpilledPayload — как Receive_Buffer.recv_payload
+    """
+    decomp = decompressor(codec)
+    payload = Receive_Buffer.allocate_payload(size, spill_dir)
+    try:
+        pos = 0
+        with memoryview(payload) as view:
+            while True:
+                length = _FRAME.unpack(Receive_Buffer.recv_exact(sock, 4))[0]
+                if not length:
+                    break
+                out = decomp.decompress(Receive_Buffer.recv_exact(sock, length))
+                if pos + len(out) > size:
+                    raise ValueError(f"Decompressed body exceeds declared size {size}")
+                view[pos:pos + len(out)] = out
+                pos += len(out)
+        if pos != size:
+            raise ValueError(f"Decompressed {pos} of {size} bytes")
+        return payload
+    except BaseException:
+        Receive_Buffer.release_payload(payload)
+        raise
+
+
+def recv_body(sock, header, spill_dir=None):
+    """Приём тела сообщения по заголовку: сжатого ("codec") или как есть"""
+    size = header.get("size", 0)
+    codec = header.get("codec")
+    if codec:
+        return recv_compressed(sock, size, codec, spill_dir)
+    return Receive_Buffer.recv_payload(sock, size, spill_dir) if size > 0 else b""
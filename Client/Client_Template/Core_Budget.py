@@ -0,0 +1,121 @@
+"""
+Бюджет ядер для клиентов, работающих на одном хосте.
+
+Клиент сообщает в рукопожатии идентификатор своего хоста и число доступных
+ему ядер (capabilities["host"], capabilities["cores"]). Сервер делит ядра
+каждого хоста между одновременно запущенными на нём этапами (CoreLedger)
+и передаёт долю этапа в заголовке work_request ("cores").
+
+На время работы этапа клиент ограничивает себя этой долей (limit):
+n_jobs() возвращает её вместо числа ядер хоста (n_jobs моделей sklearn,
+процессы кросс-валидации и очистки текста), а пулы потоков BLAS/OpenMP
+ограничиваются через threadpoolctl, если пакет установлен. Без бюджета
+поведение прежнее — все ядра хоста.
+"""
+import os
+import socket
+import threading
+import uuid
+from contextlib import contextmanager
+
+try:
+    from threadpoolctl import threadpool_limits as _threadpool_limits
+except ImportError:
+    _threadpool_limits = None
+
+# Переменные окружения, которые читают пулы потоков дочерних процессов
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+_budget = None              # доля ядер текущего этапа (None — без ограничения)
+_lock = threading.Lock()
+
+
+def host_id():
+    """Идентификатор хоста: одинаковый у всех клиентов одной машины"""
+    return f"{socket.gethostname()}-{uuid.getnode():012x}"
+
+
+def host_cores():
+    """Ядра, доступные процессу (с учётом привязки к ядрам, если она есть)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def n_jobs():
+    """Число процессов/потоков для работы этапа: бюджет или все ядра хоста"""
+    return _budget if _budget is not None else host_cores()
+
+
+@contextmanager
+def limit(cores):
+    """
+    Ограничение этапа долей cores ядер (None — без ограничения).
+
+    Действует на n_jobs(), пулы потоков BLAS/OpenMP этого процесса и
+    переменные окружения для дочерних процессов; по выходе всё
+    возвращается к прежним значениям.
+    """
+    global _budget
+    if not cores:
+        yield
+        return
+
+    cores = max(1, int(cores))
+    with _lock:
+        saved_budget = _budget
+        saved_env = {var: os.environ.get(var) for var in THREAD_ENV_VARS}
+        _budget = cores
+        for var in THREAD_ENV_VARS:
+            os.environ[var] = str(cores)
+    limiter = _threadpool_limits(limits=cores) if _threadpool_limits is not None else None
+    try:
+        yield
+    finally:
+        if limiter is not None:
+            limiter.restore_original_limits()
+        with _lock:
+            _budget = saved_budget
+            for var, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(var, None)
+                else:
+                    os.environ[var] = value
+
+
+def split_cores(total, jobs):
+    """Доля ядер одного из jobs этапов, делящих total ядер (не меньше одного)"""
+    return max(1, total // max(1, jobs))
+
+
+class CoreLedger:
+    """
+    Учёт свободных ядер хостов на стороне сервера.
+
+    cores_by_host: {host: число ядер}. Этап берёт долю свободных ядер
+    своего хоста (acquire) и возвращает её по завершении (release).
+    Когда свободных ядер не осталось, этап всё равно получает одно ядро
+    (счёт свободных ядер уходит в минус до его возврата).
+    """
+
+    def __init__(self, cores_by_host):
+        self.free = dict(cores_by_host)
+        self._lock = threading.Lock()
+
+    def acquire(self, host, sharing=1):
+        """
+        Доля ядер для этапа на host, если одновременно с ним стартуют ещё
+        sharing - 1 этапов этого хоста; None — хост неизвестен.
+        """
+        with self._lock:
+            if host not in self.free:
+                return None
+            cores = split_cores(self.free[host], sharing)
+            self.free[host] -= cores
+            return cores
+
+    def release(self, host, cores):
+        """Возврат ядер, полученных через acquire"""
+        with self._lock:
+            if host in self.free and cores:
+                self.free[host] += cores
@@ -0,0 +1,104 @@
+"""
+Внешний словарь лемм, отображённый в память.
+
+Файл — строки "токен<TAB>лемма" в UTF-8, отсортированные по байтам токена
+(так пишет write_dictionary). Файл не разбирается в dict: он отображается
+через mmap, а поиск — двоичный поиск по строкам. Поэтому словарь на сотни
+тысяч записей открывается мгновенно, память делится страницами ОС между
+процессами, а читаются только страницы с нужными токенами.
+"""
+import mmap
+import os
+from functools import lru_cache
+
+FIELD_SEPARATOR = b"\t"
+LINE_SEPARATOR = b"\n"
+
+
+class MappedLemmaDictionary:
+    """Словарь токен -> лемма поверх отсортированного файла в mmap"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._file = open(self.path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # mmap не умеет отображать пустой файл
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._size = size
+
+    def _line_at(self, pos):
+        """Начало, конец и ключ строки, в которую попадает позиция pos"""
+        start = self._map.rfind(LINE_SEPARATOR, 0, pos) + 1
+        end = self._map.find(LINE_SEPARATOR, pos)
+        if end == -1:
+            end = self._size
+        tab = self._map.find(FIELD_SEPARATOR, start, end)
+        key_end = tab if tab != -1 else end
+        return start, end, key_end
+
+    def get(self, token, default=None):
+        """Лемма токена или default"""
+        key = token.encode("utf-8")
+        lo, hi = 0, self._size
+        while lo < hi:
+            start, end, key_end = self._line_at((lo + hi) // 2)
+            line_key = self._map[start:key_end]
+            if line_key == key:
+                if key_end == end:
+                    return default
+                return self._map[key_end + 1:end].decode("utf-8")
+            if line_key < key:
+                lo = end + 1
+            else:
+                hi = start
+        return default
+
+    def close(self):
+        if self._size:
+            self._map.close()
+        self._file.close()
+
+
+def write_dictionary(mapping, path):
+    """Запись словаря в формате MappedLemmaDictionary (сортировка по байтам UTF-8)"""
+    entries = sorted((str(token).encode("utf-8"), str(lemma).encode("utf-8"))
+                     for token, lemma in mapping.items())
+    with open(path, "wb") as f:
+        for token, lemma in entries:
+            if FIELD_SEPARATOR in token or LINE_SEPARATOR in token + lemma:
+                raise ValueError(f"Invalid dictionary entry: {token!r}")
+            f.write(token + FIELD_SEPARATOR + lemma + LINE_SEPARATOR)
+
+
+@lru_cache(maxsize=4)
+def _open_cached(path, mtime_ns, size):
+    return MappedLemmaDictionary(path)
+
+
+def open_dictionary(path):
+    """
+    Словарь, открытый один раз на процесс.
+
+    Повторные вызовы возвращают тот же объект, пока файл не изменился.
+    Если файла нет, возвращается None.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    st = os.stat(path)
+    return _open_cached(os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def lemmatize_vocabulary(vocabulary, overrides, external=None):
+    """
+    Лемма для каждого токена словаря.
+
+    overrides (небольшой dict) имеет приоритет над внешним словарём;
+    токены, которых нет нигде, остаются как есть.
+    """
+    lemmas = []
+    for token in vocabulary:
+        lemma = overrides.get(token)
+        if lemma is None and external is not None:
+            lemma = external.get(token)
+        lemmas.append(token if lemma is None else lemma)
+    return lemmas
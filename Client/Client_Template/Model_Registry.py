@@ -0,0 +1,251 @@
+"""
+Реестр обученных моделей.
+
+Обучающие плагины сохраняют артефакт через save_model(), остальные
+(валидация, предсказания, окно результатов) получают его через load_model().
+Каждая версия артефакта описывается хэшем содержимого (sha256) в манифесте
+model_registry.json рядом с файлами моделей. Десериализованные модели
+хранятся в LRU кэше процесса по этому хэшу, поэтому повторный вызов
+do_work() не распаковывает RandomForest заново, пока файл не изменился.
+
+Последние версии каждого артефакта хранятся по хэшу в STORE_DIR: кэш этапов
+на сервере может вернуть модель, соответствующую пропущенному этапу
+(restore_model), не обучая её заново.
+"""
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+MANIFEST_FILE = "model_registry.json"
+MAX_CACHED_MODELS = 4           # размер LRU кэша десериализованных моделей
+STORE_DIR = "model_store"       # копии артефактов по хэшу: <hash>.pkl
+MAX_STORED_VERSIONS = 5         # сколько последних версий каждой модели хранить
+
+_cache = OrderedDict()          # hash -> объект модели
+_file_state = {}                # path -> ((mtime_ns, size), hash)
+_saved = {}                     # name -> hash, сохранённые после take_saved_models()
+_lock = threading.RLock()
+
+
+def artifact_path(name, directory=None):
+    """Путь к файлу модели: model1 -> model1_trained.pkl"""
+    return os.path.join(directory or ".", f"{name}_trained.pkl")
+
+
+def _store_path(digest, directory=None):
+    return os.path.join(directory or ".", STORE_DIR, f"{digest}.pkl")
+
+
+def _store_copy(path, digest, directory):
+    """Копия артефакта в хранилище по хэшу (жёсткая ссылка, если возможно)"""
+    stored = _store_path(digest, directory)
+    if os.path.exists(stored):
+        return
+    os.makedirs(os.path.dirname(stored), exist_ok=True)
+    try:
+        os.link(path, stored)
+    except OSError:
+        shutil.copyfile(path, stored + ".tmp")
+        os.replace(stored + ".tmp", stored)
+
+
+def _prune_store(manifest, name, directory):
+    """Удаление из хранилища версий модели name старше MAX_STORED_VERSIONS"""
+    keep = set()
+    for entry in manifest.values():
+        keep.update(e["hash"] for e in entry.get("history", [])[-MAX_STORED_VERSIONS:])
+    for old in manifest[name]["history"][:-MAX_STORED_VERSIONS]:
+        if old["hash"] not in keep:
+            try:
+                os.remove(_store_path(old["hash"], directory))
+            except FileNotFoundError:
+                pass
+
+
+def _remember(digest, model_data):
+    with _lock:
+        _cache[digest] = model_data
+        _cache.move_to_end(digest)
+        while len(_cache) > MAX_CACHED_MODELS:
+            _cache.popitem(last=False)
+
+
+def _update_manifest(name, digest, directory):
+    path = os.path.join(directory or ".", MANIFEST_FILE)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    entry = manifest.get(name, {"version": 0, "history": []})
+    if entry.get("hash") != digest:
+        entry["version"] += 1
+        entry["hash"] = digest
+        entry["history"].append({
+            "version": entry["version"],
+            "hash": digest,
+            "saved_at": datetime.now().isoformat(timespec="seconds")
+        })
+    manifest[name] = entry
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+    _prune_store(manifest, name, directory)
+    return entry["version"]
+
+
+def save_model(name, model_data, directory=None):
+    """
+    Сохранение артефакта модели.
+
+    Файл записывается атомарно (временный файл + os.replace), поэтому
+    читатель никогда не увидит наполовину записанную модель.
+
+    Returns:
+        tuple: (version: int, hash: str)
+    """
+    payload = pickle.dumps(model_data, protocol=pickle.HIGHEST_PROTOCOL)
+    digest = hashlib.sha256(payload).hexdigest()
+    path = artifact_path(name, directory)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+    with _lock:
+        st = os.stat(path)
+        _file_state[path] = ((st.st_mtime_ns, st.st_size), digest)
+        _store_copy(path, digest, directory)
+        version = _update_manifest(name, digest, directory)
+        _saved[name] = digest
+    _remember(digest, model_data)
+    return version, digest
+
+
+def take_saved_models():
+    """
+    Модели, сохранённые в этом процессе после предыдущего вызова.
+
+    Returns:
+        dict: {name: hash}
+    """
+    with _lock:
+        saved = dict(_saved)
+        _saved.clear()
+    return saved
+
+
+def _file_digest(path):
+    """Хэш файла артефакта без распаковки модели (None, если файла нет)"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _lock:
+        known = _file_state.get(path)
+        if known and known[0] == stamp:
+            return known[1]
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    with _lock:
+        _file_state[path] = (stamp, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def restore_model(name, digest, directory=None):
+    """
+    Сделать текущей версию модели name с хэшем digest.
+
+    Returns:
+        bool: True, если текущий артефакт теперь имеет этот хэш;
+              False, если такой версии нет в хранилище
+    """
+    path = artifact_path(name, directory)
+    if _file_digest(path) == digest:
+        return True
+    stored = _store_path(digest, directory)
+    if not os.path.exists(stored):
+        return False
+
+    shutil.copyfile(stored, path + ".tmp")
+    os.replace(path + ".tmp", path)
+    with _lock:
+        st = os.stat(path)
+        _file_state[path] = ((st.st_mtime_ns, st.st_size), digest)
+        _update_manifest(name, digest, directory)
+    return True
+
+
+def model_hash(name, directory=None):
+    """
+    Хэш текущей версии артефакта (файл читается, только если изменился).
+
+    Returns:
+        str или None, если модели нет
+    """
+    path = artifact_path(name, directory)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+
+    with _lock:
+        known = _file_state.get(path)
+        if known and known[0] == stamp:
+            return known[1]
+
+    with open(path, 'rb') as f:
+        payload = f.read()
+    digest = hashlib.sha256(payload).hexdigest()
+    with _lock:
+        _file_state[path] = (stamp, digest)
+        if digest not in _cache:
+            _remember(digest, pickle.loads(payload))
+    return digest
+
+
+def load_model(name, directory=None):
+    """
+    Загрузка модели через LRU кэш.
+
+    Returns:
+        dict с моделью и энкодерами (как сохранил обучающий плагин)
+        или None, если модель ещё не обучена
+    """
+    digest = model_hash(name, directory)
+    if digest is None:
+        return None
+
+    with _lock:
+        model_data = _cache.get(digest)
+        if model_data is not None:
+            _cache.move_to_end(digest)
+            return model_data
+
+    # Модель вытеснена из кэша, а файл не менялся — загружаем заново
+    with open(artifact_path(name, directory), 'rb') as f:
+        payload = f.read()
+    model_data = pickle.loads(payload)
+    _remember(hashlib.sha256(payload).hexdigest(), model_data)
+    return model_data
+
+
+def clear_cache():
+    """Очистка кэша процесса (например, для тестов)"""
+    with _lock:
+        _cache.clear()
+        _file_state.clear()
+        _saved.clear()
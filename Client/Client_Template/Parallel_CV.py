@@ -0,0 +1,98 @@
+"""
+Параллельная кросс-валидация для плагинов валидации.
+
+Фолды обучаются одновременно в пуле процессов (joblib/loky через
+sklearn.model_selection.cross_validate), число процессов не больше числа
+ядер, выделенных этапу (Core_Budget). Разбиения на фолды кэшируются по хэшу набора данных, поэтому
+повторная валидация тех же данных их не пересчитывает.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.model_selection import StratifiedKFold, cross_validate
+
+import Core_Budget
+
+MAX_CACHED_SPLITS = 8           # разбиений в кэше процесса
+
+_split_cache = OrderedDict()    # (hash, n_splits) -> [(train_idx, test_idx), ...]
+_lock = threading.Lock()
+
+
+def dataset_hash(X, y):
+    """Хэш содержимого признаков и целевой переменной (без учёта индекса)"""
+    h = hashlib.sha256()
+    h.update(pd.util.hash_pandas_object(pd.DataFrame(X), index=False).to_numpy().tobytes())
+    h.update(np.ascontiguousarray(y).tobytes())
+    return h.hexdigest()
+
+
+def fold_splits(X, y, n_splits):
+    """
+    Разбиение как у cross_val_score(cv=n_splits) для классификатора (StratifiedKFold).
+
+    Returns:
+        tuple: (splits: list, cache_hit: bool)
+    """
+    key = (dataset_hash(X, y), n_splits)
+    with _lock:
+        if key in _split_cache:
+            _split_cache.move_to_end(key)
+            return _split_cache[key], True
+
+    splits = list(StratifiedKFold(n_splits=n_splits).split(X, y))
+    with _lock:
+        _split_cache[key] = splits
+        while len(_split_cache) > MAX_CACHED_SPLITS:
+            _split_cache.popitem(last=False)
+    return splits, False
+
+
+def worker_count(n_folds):
+    """Процессов для фолдов: не больше фолдов и не больше ядер этапа"""
+    return max(1, min(n_folds, Core_Budget.n_jobs()))
+
+
+def cross_validate_folds(model, X, y, n_splits=5):
+    """
+    Кросс-валидация с параллельными фолдами.
+
+    Returns:
+        tuple: (scores: np.ndarray, timing: dict) — timing содержит время
+               каждого фолда (fit/score) для отчёта валидации
+    """
+    started = time.perf_counter()
+    splits, cache_hit = fold_splits(X, y, n_splits)
+    split_time = time.perf_counter() - started
+
+    n_jobs = worker_count(len(splits))
+    estimator = clone(model)
+    if n_jobs > 1 and 'n_jobs' in estimator.get_params():
+        # Ядра уже заняты фолдами — деревья внутри фолда строятся в одном потоке
+        estimator.set_params(n_jobs=1)
+
+    result = cross_validate(estimator, X, y, cv=splits, n_jobs=n_jobs)
+
+    timing = {
+        'n_jobs': n_jobs,
+        'split_cache_hit': cache_hit,
+        'split_time': split_time,
+        'wall_time': time.perf_counter() - started,
+        'folds': [
+            {
+                'fold': i + 1,
+                'train_size': int(len(train_idx)),
+                'test_size': int(len(test_idx)),
+                'fit_time': float(result['fit_time'][i]),
+                'score_time': float(result['score_time'][i]),
+                'score': float(result['test_score'][i]),
+            }
+            for i, (train_idx, test_idx) in enumerate(splits)
+        ],
+    }
+    return result['test_score'], timing
@@ -0,0 +1,211 @@
+"""
+История предсказаний (замена predictions_results.json).
+
+Каждый запуск Prediction_Client дописывает свои предсказания в базу SQLite
+HISTORY_FILE одной транзакцией (append_run): старые записи не
+перезаписываются, сколько бы строк ни было в наборе. Предсказания лежат
+по колонкам в таблице с ключом (run_id, sample_id), есть индекс по
+sample_id; таблица runs хранит число строк каждого запуска, поэтому сводка
+(summary) не пересчитывает всю историю.
+
+Окно результатов читает историю страницами (read_page): страница ищется
+по ключу от последней показанной записи, а не через OFFSET и не сортировкой
+всей таблицы, поэтому время открытия вкладки не зависит от размера истории.
+"""
+import os
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+
+HISTORY_FILE = "predictions_history.sqlite"
+PAGE_SIZE = 20                  # записей на странице вкладки истории
+TOP_K = 3                       # лучших названий Model2 в записи
+
+_TOP_COLUMNS = tuple(f"top{i}_{part}" for i in range(1, TOP_K + 1) for part in ("name", "confidence"))
+
+# Колонки предсказаний в порядке таблицы (кроме run_id)
+COLUMNS = ("sample_id", "size", "shape", "weight", "price", "color", "taste",
+           "type", "type_confidence", "name", "name_confidence") + _TOP_COLUMNS + (
+           "actual_type", "actual_name")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    created TEXT NOT NULL,
+    client TEXT,
+    rows INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS predictions (
+    run_id INTEGER NOT NULL,
+    sample_id INTEGER NOT NULL,
+    size REAL, shape TEXT, weight REAL, price REAL, color TEXT, taste TEXT,
+    type TEXT, type_confidence REAL,
+    name TEXT, name_confidence REAL,
+    top1_name TEXT, top1_confidence REAL, top2_name TEXT, top2_confidence REAL,
+    top3_name TEXT, top3_confidence REAL,
+    actual_type TEXT, actual_name TEXT,
+    PRIMARY KEY (run_id, sample_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS predictions_sample ON predictions (sample_id);
+"""
+
+
+def history_path(directory=None):
+    return os.path.join(directory or ".", HISTORY_FILE)
+
+
+def exists(directory=None):
+    return os.path.exists(history_path(directory))
+
+
+def _connect(directory=None):
+    conn = sqlite3.connect(history_path(directory), timeout=30)
+    # WAL: окно результатов читает историю, пока клиент дописывает новый запуск
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def append_run(columns, client=None, directory=None):
+    """
+    Дописывание предсказаний одного запуска.
+
+    Args:
+        columns: {колонка: последовательность значений} — колонки COLUMNS,
+                 кроме top*; вместо них top_names и top_confidences —
+                 массивы (строки, TOP_K); actual_* необязательны
+        client: имя клиента, сделавшего предсказания
+
+    Returns:
+        int: run_id нового запуска
+    """
+    n_rows = len(columns["sample_id"])
+    columns = dict(columns)
+    top_names = np.asarray(columns.pop("top_names"), dtype=object).reshape(n_rows, -1)
+    top_confidences = np.asarray(columns.pop("top_confidences"), dtype=float).reshape(n_rows, -1)
+    for i in range(min(TOP_K, top_names.shape[1])):
+        # Колонки массивов (строки, TOP_K): без сериализации каждой строки
+        columns[f"top{i + 1}_name"] = top_names[:, i]
+        columns[f"top{i + 1}_confidence"] = top_confidences[:, i]
+
+    values = []
+    for col in COLUMNS:
+        seq = columns.get(col)
+        if seq is None:
+            values.append([None] * n_rows)
+        else:
+            values.append(seq.tolist() if hasattr(seq, "tolist") else list(seq))
+
+    conn = _connect(directory)
+    try:
+        with conn:
+            cursor = conn.execute("INSERT INTO runs (created, client, rows) VALUES (?, ?, ?)",
+                                  (datetime.now().isoformat(timespec="seconds"), client, n_rows))
+            run_id = cursor.lastrowid
+            conn.executemany(
+                f"INSERT INTO predictions (run_id, {', '.join(COLUMNS)}) "
+                f"VALUES (?, {', '.join('?' * len(COLUMNS))})",
+                zip([run_id] * n_rows, *values))
+    finally:
+        conn.close()
+    return run_id
+
+
+def summary(directory=None):
+    """{"runs": число запусков, "predictions": всего записей, "last_run": дата или None}"""
+    conn = _connect(directory)
+    try:
+        runs, total, last = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(rows), 0), MAX(created) FROM runs").fetchone()
+    finally:
+        conn.close()
+    return {"runs": runs, "predictions": total, "last_run": last}
+
+
+def _record(row):
+    """Строка таблицы -> запись в формате бывшего predictions_results.json"""
+    data = dict(zip(("run_id",) + COLUMNS, row))
+    record = {
+        "run_id": data["run_id"],
+        "sample_id": data["sample_id"],
+        "input": {key: data[key] for key in ("size", "shape", "weight", "price", "color", "taste")},
+        "predictions": {
+            "model1": {"type": data["type"], "confidence": data["type_confidence"]},
+            "model2": {
+                "name": data["name"],
+                "confidence": data["name_confidence"],
+                "top3": [{"name": data[f"top{i}_name"], "confidence": data[f"top{i}_confidence"]}
+                         for i in range(1, TOP_K + 1) if data[f"top{i}_name"] is not None],
+            },
+        },
+    }
+    if data["actual_name"] is not None:
+        record["actual"] = {"type": data["actual_type"], "name": data["actual_name"]}
+        record["correct"] = {"model1": data["type"] == data["actual_type"],
+                             "model2": data["name"] == data["actual_name"]}
+    return record
+
+
+def read_page(after=None, limit=PAGE_SIZE, directory=None):
+    """
+    Страница истории: последний запуск первым, внутри запуска — по sample_id.
+
+    Страница набирается по запускам: внутри запуска — поиск по первичному
+    ключу от курсора, следующий (более ранний) запуск — по таблице runs.
+
+    Args:
+        after: курсор (run_id, sample_id) последней записи предыдущей
+               страницы; None — первая страница
+
+    Returns:
+        tuple: (записи, курсор следующей страницы или None)
+    """
+    select = f"SELECT run_id, {', '.join(COLUMNS)} FROM predictions"
+    conn = _connect(directory)
+    try:
+        if after is None:
+            run_id, sample_id = _previous_run(conn, None), None
+        else:
+            run_id, sample_id = after
+
+        rows = []
+        while run_id is not None and len(rows) <= limit:
+            if sample_id is None:
+                rows += conn.execute(f"{select} WHERE run_id = ? ORDER BY sample_id LIMIT ?",
+                                     (run_id, limit + 1 - len(rows))).fetchall()
+            else:
+                rows += conn.execute(f"{select} WHERE run_id = ? AND sample_id > ? "
+                                     f"ORDER BY sample_id LIMIT ?",
+                                     (run_id, sample_id, limit + 1 - len(rows))).fetchall()
+            run_id, sample_id = _previous_run(conn, run_id), None
+    finally:
+        conn.close()
+
+    records = [_record(row) for row in rows[:limit]]
+    cursor = None
+    if len(rows) > limit:
+        cursor = (records[-1]["run_id"], records[-1]["sample_id"])
+    return records, cursor
+
+
+def _previous_run(conn, run_id):
+    """Непустой запуск перед run_id (None — последний запуск)"""
+    if run_id is None:
+        row = conn.execute("SELECT MAX(run_id) FROM runs WHERE rows > 0").fetchone()
+    else:
+        row = conn.execute("SELECT MAX(run_id) FROM runs WHERE rows > 0 AND run_id < ?",
+                           (run_id,)).fetchone()
+    return row[0]
+
+
+def find_sample(sample_id, directory=None):
+    """Все предсказания строки sample_id по запускам (через индекс по sample_id)"""
+    conn = _connect(directory)
+    try:
+        rows = conn.execute(
+            f"SELECT run_id, {', '.join(COLUMNS)} FROM predictions WHERE sample_id = ? "
+            f"ORDER BY run_id DESC", (sample_id,)).fetchall()
+    finally:
+        conn.close()
+    return [_record(row) for row in rows]
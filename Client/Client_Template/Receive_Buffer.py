@@ -0,0 +1,105 @@
+"""
+Приём тела сообщения без лишних копий.
+
+Данные читаются через recv_into прямо в заранее выделенный буфер нужного
+размера (bytearray), а большие сообщения (от SPILL_THRESHOLD байт) — прямо
+в файл на диске, отображённый в память. Получатель работает с этим
+буфером без копирования: pickle.loads/memoryview читают его напрямую,
+а файл можно переименовать в нужное место (save_payload) и разбирать
+CSV с диска.
+"""
+import mmap
+import os
+import tempfile
+
+SPILL_THRESHOLD = 64 * 1024 * 1024
+
+
+class SpilledPayload(mmap.mmap):
+    """Тело сообщения, принятое в файл на диске (path) и отображённое в память"""
+    path = None
+
+
+def recv_into_view(sock, view):
+    """Заполнение memoryview данными из сокета"""
+    received, size = 0, len(view)
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if not n:
+            raise ConnectionError("Connection closed by peer")
+        received += n
+
+
+def recv_exact(sock, n):
+    """Получение точного количества байт в один буфер"""
+    buf = bytearray(n)
+    recv_into_view(sock, memoryview(buf))
+    return buf
+
+
+def allocate_payload(size, spill_dir=None):
+    """
+    Буфер для тела сообщения размером size.
+
+    Returns:
+        bytearray — если сообщение меньше SPILL_THRESHOLD или spill_dir не задан;
+        SpilledPayload — файл в spill_dir, отображённый в память
+    """
+    if spill_dir is None or size < SPILL_THRESHOLD:
+        return bytearray(size)
+
+    fd, path = tempfile.mkstemp(prefix="recv_", suffix=".part", dir=spill_dir)
+    try:
+        with os.fdopen(fd, "r+b") as f:
+            f.truncate(size)
+            payload = SpilledPayload(f.fileno(), size)
+    except BaseException:
+        os.remove(path)
+        raise
+    payload.path = path
+    return payload
+
+
+def recv_payload(sock, size, spill_dir=None):
+    """Приём тела сообщения размером size в буфер allocate_payload"""
+    if size <= 0:
+        return bytearray()
+    payload = allocate_payload(size, spill_dir)
+    try:
+        with memoryview(payload) as view:
+            recv_into_view(sock, view)
+        return payload
+    except BaseException:
+        release_payload(payload)
+        raise
+
+
+def is_spilled(data):
+    return isinstance(data, SpilledPayload)
+
+
+def payload_source(data):
+    """Путь к файлу (принятое на диск сообщение) или сами байты — для разбора"""
+    return data.path if is_spilled(data) else data
+
+
+def save_payload(data, path):
+    """
+    Сохранение принятого тела в path.
+
+    Файл, принятый на диск, переименовывается (без копирования) и
+    закрывается — после этого data использовать нельзя.
+    """
+    if is_spilled(data):
+        data.close()
+        os.replace(data.path, path)
+    else:
+        with open(path, "wb") as f:
+            f.write(data)
+
+
+def release_payload(data):
+    """Освобождение тела сообщения (файл, принятый на диск, удаляется)"""
+    if is_spilled(data) and not data.closed:
+        data.close()
+        os.remove(data.path)
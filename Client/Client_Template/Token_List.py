@@ -0,0 +1,118 @@
+"""
+Компактное представление колонок-списков (tokens, lemmas).
+
+Список токенов хранится одной строкой: токены через SEPARATOR, а символы
+SEPARATOR и ESCAPE внутри токена экранируются через ESCAPE. Начальный '['
+тоже экранируется, поэтому строка не путается со старым форматом — repr
+списка Python ("['a', 'b']"), который ещё понимает decode_tokens.
+
+Такая строка одинаково проходит через CSV и бинарные форматы, а разбор —
+это str.split, без ast.literal_eval на каждую строку.
+
+Ограничение: список из одного пустого токена кодируется так же, как пустой
+список (Tokenizer пустых токенов не создаёт).
+"""
+import ast
+
+SEPARATOR = "|"
+ESCAPE = "\\"
+_LEGACY_PREFIX = "["
+
+
+def _escape(token):
+    return token.replace(ESCAPE, ESCAPE + ESCAPE).replace(SEPARATOR, ESCAPE + SEPARATOR)
+
+
+def encode_tokens(tokens):
+    """Список токенов -> строка"""
+    try:
+        joined = SEPARATOR.join(tokens)
+    except TypeError:
+        tokens = [str(t) for t in tokens]
+        joined = SEPARATOR.join(tokens)
+    if ESCAPE in joined or joined.count(SEPARATOR) != len(tokens) - 1:
+        joined = SEPARATOR.join(_escape(t) for t in tokens)
+    if joined.startswith(_LEGACY_PREFIX):
+        joined = ESCAPE + joined
+    return joined
+
+
+def _split_escaped(value):
+    """Разбор строки с экранированием (медленный путь)"""
+    tokens, current, i = [], [], 0
+    while i < len(value):
+        ch = value[i]
+        if ch == ESCAPE and i + 1 < len(value):
+            current.append(value[i + 1])
+            i += 2
+            continue
+        if ch == SEPARATOR:
+            tokens.append("".join(current))
+            current = []
+        else:
+            current.append(ch)
+        i += 1
+    tokens.append("".join(current))
+    return tokens
+
+
+def decode_tokens(value):
+    """
+    Строка -> список токенов.
+
+    Понимает также уже готовые списки (list/tuple/ndarray), старый repr
+    списка и пустые значения (NaN, None, "") — для них возвращается [].
+    """
+    if isinstance(value, str):
+        if not value:
+            return []
+        if value.startswith(_LEGACY_PREFIX):
+            try:
+                return list(ast.literal_eval(value))
+            except (ValueError, SyntaxError):
+                pass
+        if ESCAPE in value:
+            return _split_escaped(value)
+        return value.split(SEPARATOR)
+    if hasattr(value, "__len__") and not isinstance(value, (bytes, dict)):
+        return [str(t) for t in value]
+    return []
+
+
+def encode_column(series):
+    """Колонка списков -> колонка строк"""
+    return series.map(encode_tokens) if len(series) else series.astype(object)
+
+
+def decode_column(series):
+    """
+    Колонка строк -> список списков (по строкам series).
+
+    Быстрый путь: строка без ESCAPE и без старого префикса — один str.split.
+    """
+    result = []
+    append = result.append
+    for value in series.tolist():
+        if type(value) is str and value and ESCAPE not in value and value[0] != _LEGACY_PREFIX:
+            append(value.split(SEPARATOR))
+        else:
+            append(decode_tokens(value))
+    return result
+
+
+def explode_column(series):
+    """
+    Колонка строк -> (все токены подряд, смещения строк).
+
+    Токены строки i — tokens[offsets[i]:offsets[i + 1]].
+    """
+    tokens, offsets = [], [0]
+    for row in decode_column(series):
+        tokens.extend(row)
+        offsets.append(len(tokens))
+    return tokens, offsets
+
+
+def implode_column(tokens, offsets):
+    """Обратно к explode_column: список закодированных строк по смещениям"""
+    return [encode_tokens(tokens[start:end]) for start, end in zip(offsets, offsets[1:])]
@@ -0,0 +1,150 @@
+"""
+Форматы передачи набора данных между сервером и клиентами.
+
+CSV остаётся базовым форматом, который понимают все. Если обе стороны
+поддерживают бинарный формат, DataFrame передаётся напрямую, без
+полного разбора и сериализации CSV на каждом этапе:
+- arrow   — Arrow IPC stream (нужен pyarrow)
+- parquet — Parquet (нужен pyarrow)
+- pickle  — pickle protocol 5 (блоки NumPy, без внешних зависимостей)
+"""
+import io
+import os
+import pickle
+
+FORMAT_CSV = "csv"
+FORMAT_PICKLE = "pickle"
+FORMAT_PARQUET = "parquet"
+FORMAT_ARROW = "arrow"
+
+# Колонка с идентификатором строки в патчах колонок (return_columns)
+ROW_ID_COLUMN = "_row_id"
+
+FILE_EXTENSIONS = {
+    FORMAT_CSV: ".csv",
+    FORMAT_PICKLE: ".pkl",
+    FORMAT_PARQUET: ".parquet",
+    FORMAT_ARROW: ".arrow",
+}
+
+try:
+    import pyarrow  # noqa: F401
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
+
+def available_formats():
+    """Поддерживаемые форматы в порядке предпочтения"""
+    formats = []
+    if _HAS_PYARROW:
+        formats += [FORMAT_ARROW, FORMAT_PARQUET]
+    formats += [FORMAT_PICKLE, FORMAT_CSV]
+    return formats
+
+
+def choose_format(remote_formats):
+    """Первый из наших форматов, который поддерживает другая сторона (иначе CSV)"""
+    remote_formats = set(remote_formats or [FORMAT_CSV])
+    for fmt in available_formats():
+        if fmt in remote_formats:
+            return fmt
+    return FORMAT_CSV
+
+
+def encode_dataframe(df, fmt):
+    """
+    Сериализация DataFrame в байты.
+
+    Returns:
+        tuple: (data: bytes, fmt: str) — если выбранный формат не смог
+               сохранить таблицу (например, смешанные типы в object колонке
+               для Arrow), используется pickle
+    """
+    if fmt == FORMAT_CSV:
+        return df.to_csv(index=False).encode('utf-8'), FORMAT_CSV
+
+    if fmt in (FORMAT_ARROW, FORMAT_PARQUET) and _HAS_PYARROW:
+        try:
+            import pyarrow as pa
+            if fmt == FORMAT_PARQUET:
+                buf = io.BytesIO()
+                df.to_parquet(buf)
+                return buf.getvalue(), FORMAT_PARQUET
+
+            table = pa.Table.from_pandas(df)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return sink.getvalue().to_pybytes(), FORMAT_ARROW
+        except (pa.ArrowException, ValueError, TypeError):
+            pass
+
+    return pickle.dumps(df, protocol=5), FORMAT_PICKLE
+
+
+def decode_dataframe(data, fmt):
+    """
+    Восстановление DataFrame в указанном формате.
+
+    data — байты (bytes/bytearray/memoryview) или путь к файлу с ними
+    (например, сообщение, принятое на диск, см. Receive_Buffer).
+    """
+    import pandas as pd
+
+    is_path = isinstance(data, (str, os.PathLike))
+
+    if fmt == FORMAT_CSV:
+        return pd.read_csv(data if is_path else io.BytesIO(data))
+
+    if fmt == FORMAT_PICKLE:
+        if is_path:
+            with open(data, "rb") as f:
+                return pickle.load(f)
+        return pickle.loads(data)
+
+    if fmt == FORMAT_PARQUET:
+        return pd.read_parquet(data if is_path else io.BytesIO(data))
+
+    if fmt == FORMAT_ARROW:
+        import pyarrow as pa
+        with pa.ipc.open_stream(pa.memory_map(str(data)) if is_path else data) as reader:
+            return reader.read_pandas()
+
+    raise ValueError(f"Unknown transfer format: {fmt}")
+
+
+class ColumnPatch:
+    """
+    Результат этапа, содержащий только новые или изменённые колонки.
+
+    Строки идентифицируются индексом DataFrame — это row id основной
+    таблицы сервера, поэтому плагин не должен сбрасывать индекс.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    @property
+    def columns(self):
+        return list(self.frame.columns)
+
+
+def encode_column_patch(frame, fmt):
+    """Сериализация патча: row id передаётся явной колонкой в любом формате"""
+    return encode_dataframe(frame.rename_axis(ROW_ID_COLUMN).reset_index(), fmt)
+
+
+def decode_column_patch(data, fmt):
+    """Восстановление патча с индексом по row id"""
+    return decode_dataframe(data, fmt).set_index(ROW_ID_COLUMN)
+
+
+def merge_columns(df, patch):
+    """Запись колонок патча в df по row id (новые колонки для остальных строк пустые)"""
+    for col in patch.columns:
+        if col in df.columns:
+            df.loc[patch.index, col] = patch[col]
+        else:
+            df[col] = patch[col].reindex(df.index)
+    return df
@@ -7,27 +7,28 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../Client/Client_Template')))
 import Client_Template as base
+import Model_Registry
 
 base.CLIENT_NAME = "Model1_Training"
 base.CLIENT_LEVEL = "4"
 base.CLIENT_MODE = "Parallel"
+base.CLIENT_INPUTS = ["column:model_target",
+                     "column:size (cm)", "column:weight (g)", "column:avg_price (MDL)",
+                     "column:shape", "column:color", "column:taste", "column:type"]
+base.CLIENT_OUTPUTS = ["model:model1", "column:model1_trained", "column:model1_train_acc",
+                      "column:model1_test_acc"]
 
 def do_work():
     import pandas as pd
-    import io
     from sklearn.tree import DecisionTreeClassifier
     from sklearn.model_selection import train_test_split
     from sklearn.preprocessing import LabelEncoder
-    import pickle
     import json
 
-    csv_data = base.csv_data
-
-    if not csv_data:
-        return "Error: CSV data not received", None
-
     try:
-        df = pd.read_csv(io.StringIO(csv_data))
+        df = base.load_dataframe()
+        if df is None:
+            return "Error: CSV data not received", None
 
         # Фильтруем только данные для Model1
         df_model1 = df[df['model_target'] == 'model1'].copy()
@@ -99,15 +100,13 @@ def do_work():
         df_model1['model1_test_acc'] = test_acc
 
         # Сохраняем модель в файл для Plugin 5
-        model_path = 'model1_trained.pkl'
-        with open(model_path, 'wb') as f:
-            pickle.dump(model_data, f)
+        Model_Registry.save_model('model1', model_data)
 
-        # Объединяем с остальными данными
+        # Объединяем с остальными данными (индекс = row id сервера, не сбрасываем)
         df_other = df[df['model_target'] != 'model1']
-        df_final = pd.concat([df_model1, df_other], ignore_index=True)
+        df_final = pd.concat([df_model1, df_other])
 
-        result_csv = df_final.to_csv(index=False)
+        result_csv = base.return_columns(df_final, ['model1_trained', 'model1_train_acc', 'model1_test_acc'])
         result_msg = (
             f"Model1_Training: Decision Tree trained on {len(X_train)} samples.\n"
             f"Train Accuracy: {train_acc:.4f}, Test Accuracy: {test_acc:.4f}\n"
@@ -7,27 +7,29 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../Client/Client_Template')))
 import Client_Template as base
+import Model_Registry
+import Core_Budget
 
 base.CLIENT_NAME = "Model2_Training"
 base.CLIENT_LEVEL = "6"
 base.CLIENT_MODE = "Parallel"
+base.CLIENT_INPUTS = ["column:model_target",
+                     "column:size (cm)", "column:weight (g)", "column:avg_price (MDL)",
+                     "column:shape", "column:color", "column:taste", "column:type", "column:name"]
+base.CLIENT_OUTPUTS = ["model:model2", "column:model2_trained", "column:model2_train_acc",
+                      "column:model2_test_acc"]
 
 def do_work():
     import pandas as pd
-    import io
     from sklearn.ensemble import RandomForestClassifier
     from sklearn.model_selection import train_test_split
     from sklearn.preprocessing import LabelEncoder
-    import pickle
     import json
 
-    csv_data = base.csv_data
-
-    if not csv_data:
-        return "Error: CSV data not received", None
-
     try:
-        df = pd.read_csv(io.StringIO(csv_data))
+        df = base.load_dataframe()
+        if df is None:
+            return "Error: CSV data not received", None
 
         # Фильтруем только данные для Model2
         df_model2 = df[df['model_target'] == 'model2'].copy()
@@ -73,7 +75,7 @@ def do_work():
             min_samples_split=5,
             min_samples_leaf=2,
             random_state=42,
-            n_jobs=-1
+            n_jobs=Core_Budget.n_jobs()  # ядра, выделенные этапу сервером
         )
 
         model.fit(X_train, y_train)
@@ -107,15 +109,13 @@ def do_work():
         df_model2['model2_test_acc'] = test_acc
 
         # Сохраняем модель в файл для Plugin 7
-        model_path = 'model2_trained.pkl'
-        with open(model_path, 'wb') as f:
-            pickle.dump(model_data, f)
+        Model_Registry.save_model('model2', model_data)
 
-        # Объединяем с остальными данными
+        # Объединяем с остальными данными (индекс = row id сервера, не сбрасываем)
         df_other = df[df['model_target'] != 'model2']
-        df_final = pd.concat([df_model2, df_other], ignore_index=True)
+        df_final = pd.concat([df_model2, df_other])
 
-        result_csv = df_final.to_csv(index=False)
+        result_csv = base.return_columns(df_final, ['model2_trained', 'model2_train_acc', 'model2_test_acc'])
         result_msg = (
             f"Model2_Training: Random Forest trained on {len(X_train)} samples.\n"
             f"Train Accuracy: {train_acc:.4f}, Test Accuracy: {test_acc:.4f}\n"
@@ -8,65 +8,67 @@ import os
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../Client/Client_Template')))
 import Client_Template as base
+import Model_Registry
+import Cascade_Predictor
+import Prediction_History
 
 base.CLIENT_NAME = "Prediction_Client"
 base.CLIENT_LEVEL = "8"
 base.CLIENT_MODE = "Sequential"
+base.CLIENT_INPUTS = ["model:model1", "model:model2",
+                     "column:size (cm)", "column:weight (g)", "column:avg_price (MDL)",
+                     "column:shape", "column:color", "column:taste",
+                     "column:type", "column:name"]  # настоящие метки: точность и actual_* в истории
+base.CLIENT_OUTPUTS = ["column:predicted_type", "column:predicted_name",
+                      "column:prediction_confidence_type", "column:prediction_confidence_name"]
+base.CLIENT_CACHEABLE = False  # каждый запуск дописывает историю предсказаний (Prediction_History)
 
+PREVIEW_ROWS = 10   # строк с подробным выводом в консоль
 
-def do_work():
-    import pandas as pd
-    import io
-    import pickle
-    import os.path
-    import json
-
-    csv_data = base.csv_data
 
-    if not csv_data:
-        return "Error: CSV data not received", None
+def do_work():
+    import time
 
     try:
-        # Проверяем наличие обученных моделей
-        model1_path = 'model1_trained.pkl'
-        model2_path = 'model2_trained.pkl'
+        # Загружаем обе модели (из кэша реестра, если файлы не менялись)
+        model1_data = Model_Registry.load_model('model1')
+        model2_data = Model_Registry.load_model('model2')
 
-        if not os.path.exists(model1_path):
+        if model1_data is None:
             return "❌ Model1 not found! Please train Model1 first.", None
 
-        if not os.path.exists(model2_path):
+        if model2_data is None:
             return "❌ Model2 not found! Please train Model2 first.", None
 
-        # Загружаем обе модели
-        with open(model1_path, 'rb') as f:
-            model1_data = pickle.load(f)
-
-        with open(model2_path, 'rb') as f:
-            model2_data = pickle.load(f)
-
-        model1 = model1_data['model']
-        model1_features = model1_data['feature_cols']
-        model1_le_dict = model1_data['le_dict']
-        model1_le_target = model1_data['le_target']
+        # Читаем новые данные для предсказания
+        df = base.load_dataframe()
+        if df is None:
+            return "Error: CSV data not received", None
 
-        model2 = model2_data['model']
-        model2_features = model2_data['feature_cols']
-        model2_le_dict = model2_data['le_dict']
-        model2_le_target = model2_data['le_target']
+        # === ПАКЕТНОЕ ПРЕДСКАЗАНИЕ ДЛЯ ВСЕХ СТРОК ===
+        started = time.perf_counter()
+        pred = Cascade_Predictor.predict_cascade(df, model1_data, model2_data, top_k=3)
+        elapsed = time.perf_counter() - started
 
-        # Читаем новые данные для предсказания
-        df = pd.read_csv(io.StringIO(csv_data))
+        df['predicted_type'] = pred['type']
+        df['predicted_name'] = pred['name']
+        df['prediction_confidence_type'] = pred['type_confidence']
+        df['prediction_confidence_name'] = pred['name_confidence']
 
-        # Берем первые 10 строк для тестирования (или все данные)
-        test_samples = df.head(10).copy()
+        has_actual = 'type' in df.columns and 'name' in df.columns
 
         print("\n" + "=" * 70)
         print("🔮 PREDICTION CLIENT - Making Live Predictions")
         print("=" * 70)
+        print(f"   Scored {len(df):,} rows in {elapsed:.3f}s")
 
-        predictions = []
+        # Подробный вывод — только для первых строк
+        for pos, (idx, row) in enumerate(df.head(PREVIEW_ROWS).iterrows()):
+            pred1_label = pred['type'][pos]
+            pred2_label = pred['name'][pos]
+            top3_labels = pred['top_names'][pos]
+            top3_probas = pred['top_confidences'][pos]
 
-        for idx, row in test_samples.iterrows():
             print(f"\n📊 Sample {idx + 1}:")
             print(f"   Size: {row['size (cm)']} cm")
             print(f"   Shape: {row['shape']}")
@@ -75,77 +77,19 @@ def do_work():
             print(f"   Color: {row['color']}")
             print(f"   Taste: {row['taste']}")
 
-            # === PREDICTION MODEL 1 (Binary: fruit vs vegetable) ===
-            # Подготовка данных для Model1
-            X1_sample = []
-            X1_sample.append(row['size (cm)'])
-            X1_sample.append(row['weight (g)'])
-            X1_sample.append(row['avg_price (MDL)'])
-
-            # Кодируем категориальные признаки для Model1
-            for col in ['shape', 'color', 'taste']:
-                le = model1_le_dict[col]
-                val = str(row[col])
-                if val in le.classes_:
-                    encoded_val = le.transform([val])[0]
-                else:
-                    # Если значение неизвестно, используем самое частое
-                    encoded_val = 0
-                X1_sample.append(encoded_val)
-
-            # Предсказание Model1
-            import numpy as np
-            X1_sample = np.array(X1_sample).reshape(1, -1)
-            pred1_encoded = model1.predict(X1_sample)[0]
-            pred1_label = model1_le_target.inverse_transform([pred1_encoded])[0]
-            pred1_proba = model1.predict_proba(X1_sample)[0]
-
             print(f"\n   🎯 Model 1 Prediction (Binary):")
             print(f"      Type: {pred1_label.upper()}")
-            print(f"      Confidence: {max(pred1_proba) * 100:.2f}%")
-
-            # === PREDICTION MODEL 2 (Multi-class: predict name) ===
-            # Подготовка данных для Model2
-            X2_sample = []
-            X2_sample.append(row['size (cm)'])
-            X2_sample.append(row['weight (g)'])
-            X2_sample.append(row['avg_price (MDL)'])
-
-            # Кодируем категориальные признаки для Model2
-            for col in ['shape', 'color', 'taste', 'type']:
-                le = model2_le_dict[col]
-                # Для 'type' используем предсказание Model1
-                if col == 'type':
-                    val = pred1_label
-                else:
-                    val = str(row[col])
-
-                if val in le.classes_:
-                    encoded_val = le.transform([val])[0]
-                else:
-                    encoded_val = 0
-                X2_sample.append(encoded_val)
-
-            # Предсказание Model2
-            X2_sample = np.array(X2_sample).reshape(1, -1)
-            pred2_encoded = model2.predict(X2_sample)[0]
-            pred2_label = model2_le_target.inverse_transform([pred2_encoded])[0]
-            pred2_proba = model2.predict_proba(X2_sample)[0]
-
-            # Топ-3 предсказания
-            top3_indices = np.argsort(pred2_proba)[-3:][::-1]
-            top3_labels = model2_le_target.inverse_transform(top3_indices)
-            top3_probas = pred2_proba[top3_indices]
+            print(f"      Confidence: {pred['type_confidence'][pos] * 100:.2f}%")
 
             print(f"\n   🎯 Model 2 Prediction (Multi-class):")
             print(f"      Name: {pred2_label.upper()}")
-            print(f"      Confidence: {max(pred2_proba) * 100:.2f}%")
+            print(f"      Confidence: {pred['name_confidence'][pos] * 100:.2f}%")
             print(f"\n      Top 3 predictions:")
             for i, (label, proba) in enumerate(zip(top3_labels, top3_probas), 1):
                 print(f"         {i}. {label} ({proba * 100:.2f}%)")
 
             # Проверяем с реальным значением если есть
-            if 'type' in row and 'name' in row:
+            if has_actual:
                 actual_type = row['type']
                 actual_name = row['name']
 
@@ -156,79 +100,48 @@ def do_work():
                 print(f"      Type: {actual_type} {model1_correct}")
                 print(f"      Name: {actual_name} {model2_correct}")
 
-            # Сохраняем результат
-            prediction = {
-                'sample_id': int(idx),
-                'input': {
-                    'size': float(row['size (cm)']),
-                    'shape': str(row['shape']),
-                    'weight': float(row['weight (g)']),
-                    'price': float(row['avg_price (MDL)']),
-                    'color': str(row['color']),
-                    'taste': str(row['taste'])
-                },
-                'predictions': {
-                    'model1': {
-                        'type': pred1_label,
-                        'confidence': float(max(pred1_proba))
-                    },
-                    'model2': {
-                        'name': pred2_label,
-                        'confidence': float(max(pred2_proba)),
-                        'top3': [
-                            {'name': label, 'confidence': float(proba)}
-                            for label, proba in zip(top3_labels, top3_probas)
-                        ]
-                    }
-                }
-            }
-
-            if 'type' in row and 'name' in row:
-                prediction['actual'] = {
-                    'type': str(row['type']),
-                    'name': str(row['name'])
-                }
-                prediction['correct'] = {
-                    'model1': pred1_label == row['type'],
-                    'model2': pred2_label == row['name']
-                }
-
-            predictions.append(prediction)
-
             print("-" * 70)
 
-        # Сохраняем все предсказания в JSON
-        with open('predictions_results.json', 'w') as f:
-            json.dump(predictions, f, indent=2)
-
-        # Подсчитываем точность если есть реальные значения
-        if 'type' in test_samples.columns and 'name' in test_samples.columns:
-            model1_accuracy = sum(1 for p in predictions if p.get('correct', {}).get('model1', False)) / len(
-                predictions)
-            model2_accuracy = sum(1 for p in predictions if p.get('correct', {}).get('model2', False)) / len(
-                predictions)
-
-            print(f"\n📈 Accuracy on {len(predictions)} samples:")
+        # Все предсказания запуска дописываются в историю (старые не перезаписываются)
+        history = {
+            'sample_id': df.index.to_numpy() if df.index.is_unique else range(len(df)),
+            'size': df['size (cm)'].to_numpy(),
+            'shape': df['shape'].astype(str).to_numpy(),
+            'weight': df['weight (g)'].to_numpy(),
+            'price': df['avg_price (MDL)'].to_numpy(),
+            'color': df['color'].astype(str).to_numpy(),
+            'taste': df['taste'].astype(str).to_numpy(),
+            'type': pred['type'],
+            'type_confidence': pred['type_confidence'],
+            'name': pred['name'],
+            'name_confidence': pred['name_confidence'],
+            'top_names': pred['top_names'],
+            'top_confidences': pred['top_confidences'],
+        }
+        if has_actual:
+            history['actual_type'] = df['type'].astype(str).to_numpy()
+            history['actual_name'] = df['name'].astype(str).to_numpy()
+        run_id = Prediction_History.append_run(history, client=base.CLIENT_NAME)
+
+        # Точность по всем строкам, если есть реальные значения
+        if has_actual:
+            model1_accuracy = (df['predicted_type'] == df['type']).mean()
+            model2_accuracy = (df['predicted_name'] == df['name']).mean()
+
+            print(f"\n📈 Accuracy on {len(df):,} samples:")
             print(f"   Model 1 (Binary): {model1_accuracy * 100:.2f}%")
             print(f"   Model 2 (Multi-class): {model2_accuracy * 100:.2f}%")
 
-        print("\n💾 Results saved to: predictions_results.json")
+        print(f"\n💾 Results saved to: {Prediction_History.HISTORY_FILE} (run {run_id})")
         print("=" * 70 + "\n")
 
         result_msg = (
-            f"Prediction_Client: Made {len(predictions)} predictions.\n"
-            f"Results saved to predictions_results.json"
+            f"Prediction_Client: Made {len(df)} predictions.\n"
+            f"Results saved to {Prediction_History.HISTORY_FILE} (run {run_id})"
         )
 
-        # Добавляем предсказания в CSV
-        for i, pred in enumerate(predictions):
-            idx = pred['sample_id']
-            df.loc[idx, 'predicted_type'] = pred['predictions']['model1']['type']
-            df.loc[idx, 'predicted_name'] = pred['predictions']['model2']['name']
-            df.loc[idx, 'prediction_confidence_type'] = pred['predictions']['model1']['confidence']
-            df.loc[idx, 'prediction_confidence_name'] = pred['predictions']['model2']['confidence']
-
-        result_csv = df.to_csv(index=False)
+        result_csv = base.return_columns(df, ['predicted_type', 'predicted_name',
+                                              'prediction_confidence_type', 'prediction_confidence_name'])
 
         return result_msg, result_csv
 
@@ -7,40 +7,37 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../Client/Client_Template')))
 import Client_Template as base
+import Model_Registry
+import Category_Encoder
+import Parallel_CV
 
 base.CLIENT_NAME = "Model1_Validation"
 base.CLIENT_LEVEL = "5"
 base.CLIENT_MODE = "Parallel"
+base.CLIENT_INPUTS = ["model:model1", "column:model_target",
+                     "column:size (cm)", "column:weight (g)", "column:avg_price (MDL)",
+                     "column:shape", "column:color", "column:taste", "column:type"]
+base.CLIENT_OUTPUTS = ["column:model1_validated", "column:model1_val_accuracy", "column:model1_cv_mean"]
 
 def do_work():
     import pandas as pd
-    import io
-    import pickle
-    import os.path
     from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
-    from sklearn.model_selection import cross_val_score
     import json
 
-    csv_data = base.csv_data
-
-    if not csv_data:
-        return "Error: CSV data not received", None
-
     try:
         # Загружаем обученную модель
-        model_path = 'model1_trained.pkl'
-        if not os.path.exists(model_path):
+        model_data = Model_Registry.load_model('model1')
+        if model_data is None:
             return "Error: Model1 not found. Please run Model1_Training first", None
 
-        with open(model_path, 'rb') as f:
-            model_data = pickle.load(f)
-
         model = model_data['model']
         feature_cols = model_data['feature_cols']
         le_dict = model_data['le_dict']
         le_target = model_data['le_target']
 
-        df = pd.read_csv(io.StringIO(csv_data))
+        df = base.load_dataframe()
+        if df is None:
+            return "Error: CSV data not received", None
 
         # Фильтруем только данные для Model1
         df_model1 = df[df['model_target'] == 'model1'].copy()
@@ -52,10 +49,7 @@ def do_work():
         # Применяем те же преобразования
         categorical_cols = ['shape', 'color', 'taste']
         for col in categorical_cols:
-            le = le_dict[col]
-            df_model1[f'{col}_encoded'] = df_model1[col].astype(str).map(
-                lambda x: le.transform([x])[0] if x in le.classes_ else -1
-            )
+            df_model1[f'{col}_encoded'] = Category_Encoder.encode(le_dict[col], df_model1[col])
 
         y_true = le_target.transform(df_model1['type'])
         X = df_model1[feature_cols]
@@ -64,8 +58,8 @@ def do_work():
         y_pred = model.predict(X)
         accuracy = accuracy_score(y_true, y_pred)
 
-        # Cross-validation (на всех данных)
-        cv_scores = cross_val_score(model, X, y_true, cv=5)
+        # Cross-validation (на всех данных, фолды параллельно)
+        cv_scores, cv_timing = Parallel_CV.cross_validate_folds(model, X, y_true, n_splits=5)
         cv_mean = cv_scores.mean()
         cv_std = cv_scores.std()
 
@@ -84,6 +78,7 @@ def do_work():
             'accuracy': accuracy,
             'cv_mean': cv_mean,
             'cv_std': cv_std,
+            'cv_timing': cv_timing,
             'classification_report': class_report,
             'confusion_matrix': conf_matrix.tolist(),
             'classes': le_target.classes_.tolist()
@@ -94,16 +89,17 @@ def do_work():
         df_model1['model1_val_accuracy'] = accuracy
         df_model1['model1_cv_mean'] = cv_mean
 
-        # Объединяем с остальными данными
+        # Объединяем с остальными данными (индекс = row id сервера, не сбрасываем)
         df_other = df[df['model_target'] != 'model1']
-        df_final = pd.concat([df_model1, df_other], ignore_index=True)
+        df_final = pd.concat([df_model1, df_other])
 
-        result_csv = df_final.to_csv(index=False)
+        result_csv = base.return_columns(df_final, ['model1_validated', 'model1_val_accuracy', 'model1_cv_mean'])
 
         result_msg = (
             f"Model1_Validation: Decision Tree validated\n"
             f"Validation Accuracy: {accuracy:.4f}\n"
             f"Cross-Validation: {cv_mean:.4f} (+/- {cv_std:.4f})\n"
+            f"CV time: {cv_timing['wall_time']:.2f}s on {cv_timing['n_jobs']} process(es)\n"
             f"Classes: {le_target.classes_.tolist()}\n\n"
             f"Classification Report:\n"
         )
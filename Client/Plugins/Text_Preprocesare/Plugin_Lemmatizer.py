@@ -6,10 +6,15 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../Client/Client_Template')))
 import Client_Template as base
+import Token_List
+import Lemma_Dictionary
 
 base.CLIENT_NAME = "Lemmatizer"
 base.CLIENT_LEVEL = "3"
 base.CLIENT_MODE = "Sequential"
+base.CLIENT_STREAMING = False  # барьер: перемешивание и разбиение всего набора
+base.CLIENT_INPUTS = ["column:tokens"]
+base.CLIENT_OUTPUTS = ["column:lemmas", "column:model_target", "rows"]
 
 LEMMA_DICT = {
     "products": "product", "services": "service", "phones": "phone",
@@ -19,31 +24,47 @@ LEMMA_DICT = {
     "apples": "apple", "bananas": "banana", "oranges": "orange"
 }
 
+# Большой внешний словарь (строки "токен<TAB>лемма", см. Lemma_Dictionary.write_dictionary).
+# Открывается один раз и отображается в память; LEMMA_DICT имеет приоритет.
+LEMMA_DICT_FILE = os.environ.get(
+    "LEMMA_DICT_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "lemma_dictionary.tsv")
+)
+base.CLIENT_DEPENDENCIES = [LEMMA_DICT_FILE]  # словарь меняет результат — он входит в версию этапа
+
+
+def lemmatize_column(values):
+    """
+    Лемматизация колонки токенов через словарь токенов набора.
+
+    Все токены разворачиваются в один список, каждому сопоставляется id
+    в словаре (vocabulary); леммы ищутся один раз на токен словаря, а
+    колонка lemmas собирается обратно из массива id по смещениям строк.
+    """
+    import numpy as np
+    import pandas as pd
+
+    tokens, offsets = Token_List.explode_column(values)
+    ids, vocabulary = pd.factorize(pd.Series(tokens, dtype=object))
+    lemma_vocabulary = Lemma_Dictionary.lemmatize_vocabulary(
+        vocabulary, LEMMA_DICT, Lemma_Dictionary.open_dictionary(LEMMA_DICT_FILE)
+    )
+    lemmas = np.asarray(lemma_vocabulary, dtype=object)[ids].tolist()
+    return Token_List.implode_column(lemmas, offsets)
+
+
 def do_work():
     import pandas as pd
-    import io
-    import ast
-    
-    csv_data = base.csv_data
-    
-    if not csv_data:
-        return "Error: CSV data not received", None
     
     try:
-        df = pd.read_csv(io.StringIO(csv_data))
+        df = base.load_dataframe()
+        if df is None:
+            return "Error: CSV data not received", None
         
         if 'tokens' not in df.columns:
             return f"Error: Column 'tokens' not found. Available: {list(df.columns)}", None
         
-        # Преобразуем строку обратно в список
-        df['tokens'] = df['tokens'].apply(
-            lambda x: ast.literal_eval(x) if isinstance(x, str) and x.startswith('[') else []
-        )
-        
-        # Применяем лемматизацию
-        df['lemmas'] = df['tokens'].apply(
-            lambda tokens: [LEMMA_DICT.get(t, t) for t in tokens] if isinstance(tokens, list) else []
-        )
+        # Лемматизация различных строк токенов (Token_List) через словарь токенов
+        df['lemmas'] = base.map_unique(df['tokens'], lemmatize_column, batch=True)
         
         # ===== РАЗДЕЛЕНИЕ НА 2 ЧАСТИ =====
         # Перемешиваем данные
@@ -63,7 +84,7 @@ def do_work():
         # Объединяем обратно
         df_final = pd.concat([df1, df2], ignore_index=True)
         
-        result_csv = df_final.to_csv(index=False)
+        result_csv = base.dump_dataframe(df_final)
         result_msg = f"Lemmatizer: Lemmatized {len(df)} rows. Split: Model1={len(df1)}, Model2={len(df2)}"
         
         return result_msg, result_csv
@@ -6,22 +6,22 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../Client/Client_Template')))
 import Client_Template as base
+import Token_List
 
 base.CLIENT_NAME = "Tokenizer"
 base.CLIENT_LEVEL = "2"
 base.CLIENT_MODE = "Sequential"
+base.CLIENT_STREAMING = True  # построчная обработка: может работать в конвейере по частям
+base.CLIENT_INPUTS = ["column:cleaned_text", "column:name"]
+base.CLIENT_OUTPUTS = ["column:tokens"]
 
 def do_work():
     import pandas as pd
-    import io
-    
-    csv_data = base.csv_data
-    
-    if not csv_data:
-        return "Error: CSV data not received", None
     
     try:
-        df = pd.read_csv(io.StringIO(csv_data))
+        df = base.load_dataframe()
+        if df is None:
+            return "Error: CSV data not received", None
         
         # Ищем колонку cleaned_text
         text_column = 'cleaned_text' if 'cleaned_text' in df.columns else 'name'
@@ -29,12 +29,14 @@ def do_work():
         if text_column not in df.columns:
             return f"Error: Column '{text_column}' not found. Available: {list(df.columns)}", None
         
-        # Токенизация: разбиваем на слова длиной > 1
-        df['tokens'] = df[text_column].apply(
-            lambda x: [t for t in str(x).split() if len(t) > 1]
+        # Токенизация: разбиваем на слова длиной > 1 (один раз на различное значение);
+        # список хранится компактной строкой (Token_List), а не repr списка
+        df['tokens'] = base.map_unique(
+            df[text_column],
+            lambda x: Token_List.encode_tokens([t for t in str(x).split() if len(t) > 1])
         )
         
-        result_csv = df.to_csv(index=False)
+        result_csv = base.return_columns(df, ['tokens'])
         result_msg = f"Tokenizer: Tokenized {len(df)} rows"
         
         return result_msg, result_csv
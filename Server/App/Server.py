@@ -1,5 +1,4 @@
 import socket
-import threading
 import sys
 from PyQt5.QtWidgets import QApplication, QWidget, QPushButton, QLabel, QListWidget, QVBoxLayout, QHBoxLayout, \
     QMessageBox
@@ -18,9 +17,18 @@ PROJECT_ROOT = BASE_DIR.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from App_Functions.CSV_Manager import load_initial_csv
+# Общие модули протокола лежат рядом с шаблоном клиента
+CLIENT_TEMPLATE_DIR = PROJECT_ROOT.parent / "Client" / "Client_Template"
+if str(CLIENT_TEMPLATE_DIR) not in sys.path:
+    sys.path.append(str(CLIENT_TEMPLATE_DIR))
+
+import Receive_Buffer
+import Compression
+
+from App_Functions.CSV_Manager import load_initial_csv, reset_to_initial
+from App_Functions.Connection_Manager import ConnectionManager
 from App_Functions.Results_Window import show_results_window
-from App_Functions.Workflow_Manager import WorkflowManager, set_csv_data
+from App_Functions.Workflow_Manager import WorkflowManager
 
 
 # ===================================== Настройки сервера =====================================
@@ -41,7 +49,6 @@ PORT = 9090
 
 clients = {}
 names = set()
-server_running = True
 
 # Папки для файлов
 RECEIVED_DIR = Path("received_from_clients")
@@ -49,133 +56,125 @@ RECEIVED_DIR.mkdir(exist_ok=True)
 
 
 # ===================================== Передача файлов =====================================
-def recv_exact(conn: socket.socket, n: int) -> bytes:
-    """Получение точного количества байт"""
-    buf = bytearray()
-    while len(buf) < n:
-        chunk = conn.recv(n - len(buf))
-        if not chunk:
-            raise ConnectionError("Connection closed by client")
-        buf.extend(chunk)
-    return bytes(buf)
-
-
-def send_message(conn: socket.socket, header: dict, data: bytes):
-    """Отправка структурированного сообщения"""
+def recv_exact(conn: socket.socket, n: int) -> bytearray:
+    """Получение точного количества байт (recv_into в один буфер)"""
+    return Receive_Buffer.recv_exact(conn, n)
+
+
+def send_header(conn: socket.socket, header: dict):
+    """Отправка заголовка сообщения (длина + JSON) одним вызовом"""
     header_bytes = json.dumps(header).encode('utf-8')
-    conn.sendall(struct.pack(">I", len(header_bytes)))
-    conn.sendall(header_bytes)
+    conn.sendall(struct.pack(">I", len(header_bytes)) + header_bytes)
+
+
+def send_message(conn: socket.socket, header: dict, data: bytes, codec=None):
+    """
+    Отправка структурированного сообщения.
+
+    Если задан codec, тело передаётся сжатым потоком кадров (см. Compression),
+    а "size" в заголовке остаётся размером несжатых данных.
+    """
+    if data and codec:
+        header = dict(header, codec=codec)
+    send_header(conn, header)
     if data:
-        conn.sendall(data)
+        if codec:
+            Compression.send_compressed(conn, data, codec)
+        else:
+            conn.sendall(data)
 
 
-def recv_message(conn: socket.socket):
-    """Получение структурированного сообщения"""
+def send_file_body(conn: socket.socket, f, size: int):
+    """
+    Потоковая отправка size байт файла без чтения его в память целиком.
+
+    socket.sendfile передаёт данные из кэша страниц ОС прямо в сокет
+    (os.sendfile); там, где его нет, он сам читает файл небольшими блоками.
+    """
+    sent = conn.sendfile(f, 0, size)
+    if sent != size:
+        raise ConnectionError(f"File ended after {sent} of {size} bytes")
+
+
+def recv_message(conn: socket.socket, spill_dir=None):
+    """
+    Получение структурированного сообщения.
+
+    Тело принимается без промежуточных копий; если задан spill_dir,
+    большое тело принимается прямо в файл (см. Receive_Buffer).
+    Сжатое тело ("codec" в заголовке) распаковывается по кадрам.
+    """
     raw = conn.recv(4)
     if not raw:
         return None, None
+    if len(raw) < 4:
+        raw += recv_exact(conn, 4 - len(raw))
     header_len = struct.unpack(">I", raw)[0]
     header_bytes = recv_exact(conn, header_len)
     header = json.loads(header_bytes.decode('utf-8'))
-    size = header.get("size", 0)
-    data = recv_exact(conn, size) if size > 0 else b""
+    data = Compression.recv_body(conn, header, spill_dir)
     return header, data
 
 
-def send_file_to_client(conn, filepath):
-    """Отправка файла клиенту"""
+def send_file_to_client(conn, filepath, extra_header=None, codec=None):
+    """
+    Отправка файла клиенту.
+
+    Без сжатия файл уходит через sendfile; с codec — читается и сжимается
+    блоками (см. Compression.send_compressed).
+    """
     if not os.path.exists(filepath):
         print(f"[!] File not found: {filepath}")
         return False
 
-    with open(filepath, 'rb') as f:
-        data = f.read()
-
     filename = os.path.basename(filepath)
-    header = {
-        "action": "send_file",
-        "filename": filename,
-        "size": len(data)
-    }
-
-    send_message(conn, header, data)
-    print(f"[-->] Sent file {filename} ({len(data)} bytes)")
+    with open(filepath, 'rb') as f:
+        # Размер берётся у открытого файла, тело передаётся потоком с диска
+        size = os.fstat(f.fileno()).st_size
+        header = {
+            "action": "send_file",
+            "filename": filename,
+            "size": size
+        }
+        if extra_header:
+            header.update(extra_header)
+        if codec and size:
+            header["codec"] = codec
+
+        send_header(conn, header)
+        if codec and size:
+            sent = Compression.send_compressed(conn, f, codec)
+            print(f"[-->] Sent file {filename} ({size} bytes, {codec}: {sent} bytes)")
+            return True
+        send_file_body(conn, f, size)
+
+    print(f"[-->] Sent file {filename} ({size} bytes)")
     return True
 
 
 def receive_file_from_client(conn):
     """Получение файла от клиента"""
-    header, data = recv_message(conn)
+    header, data = recv_message(conn, spill_dir=RECEIVED_DIR)
     return header, data
 
 
 # ===================================== Работа с клиентами =====================================
-def handle_client(conn, addr):
-    try:
-        conn.settimeout(5)
-        data = conn.recv(1024).decode('utf-8')
-        name, level, mode = data.split('|')
-
-        if name in names:
-            conn.send("ERROR: Name already in use".encode('utf-8'))
-            conn.close()
-            return
-
-        clients[addr] = (conn, name, int(level), mode)
-        names.add(name)
-        conn.send("CONNECTED".encode('utf-8'))
-
-        conn.settimeout(None)
+def _on_clients_changed():
+    """Сигнал для обновления GUI"""
+    gui_signals.update_list.emit()
 
-        # Сигнал для обновления GUI
-        gui_signals.update_list.emit()
-        print(f"[+] Client connected: {name} (Lvl {level}, {mode}) — {addr}")
 
-        # Держим соединение открытым
-        while True:
-            time.sleep(1)
-
-    except socket.timeout:
-        print(f"[!] Connection timeout {addr}")
-    except Exception as e:
-        print(f"[!] Client error {addr}: {e}")
-    finally:
-        if addr in clients:
-            disconnect_client(addr, silent=True)
+# Все клиентские сокеты обслуживаются одним циклом событий
+connection_manager = ConnectionManager(clients, names, on_change=_on_clients_changed)
 
 
 def start_server():
-    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    server.bind((HOST, PORT))
-    server.listen()
+    connection_manager.start(HOST, PORT)
     print(f"[SERVER STARTED] {HOST}:{PORT}")
-    threading.Thread(target=accept_clients, args=(server,), daemon=True).start()
-
-
-def accept_clients(server):
-    while server_running:
-        try:
-            conn, addr = server.accept()
-            threading.Thread(target=handle_client, args=(conn, addr), daemon=True).start()
-        except:
-            break
 
 
 def disconnect_client(addr, silent=False):
-    if addr not in clients:
-        return
-    conn, name, _, _ = clients[addr]
-    try:
-        conn.send("DISCONNECT".encode('utf-8'))
-        conn.close()
-    except:
-        pass
-    del clients[addr]
-    if name in names:
-        names.remove(name)
-    if not silent:
-        print(f"[-] Client disconnected: {name}")
-    gui_signals.update_list.emit()
+    connection_manager.disconnect(addr, silent=silent)
 
 
 def disconnect_all():
@@ -191,12 +190,18 @@ def request_work_from_clients():
         QMessageBox.information(None, "Info", "No connected clients.")
         return
 
+    # Каждый запуск начинается с исходного набора данных: неизменённые этапы
+    # получают те же ключи кэша и берутся из Stage_Cache
+    reset_to_initial()
+
     # Создаём WorkflowManager с callback'ами
     workflow = WorkflowManager(
         clients_dict=clients,
         send_file_func=send_file_to_client,
         receive_file_func=receive_file_from_client,
         send_message_func=send_message,
+        borrow_func=connection_manager.borrow,
+        capabilities_dict=connection_manager.capabilities,
         update_callback=lambda delay, func: QApplication.instance().processEvents() or func(),
         results_callback=show_results_window
     )
@@ -348,10 +353,8 @@ class ServerWindow(QWidget):
         # Подключение сигнала обновления списка
         gui_signals.update_list.connect(self.update_client_list)
 
-        # Загрузка начальных CSV данных
-        csv_data, csv_file = load_initial_csv()
-        if csv_data and csv_file:
-            set_csv_data(csv_data, csv_file)
+        # Загрузка начальных CSV данных (общая таблица CSV_Manager, её использует и WorkflowManager)
+        load_initial_csv()
 
         # Запуск сервера
         start_server()
@@ -1,16 +1,37 @@
 import pandas as pd
+import io
 import os
+import sys
+import threading
 from pathlib import Path
 
+# Общие модули протокола лежат рядом с шаблоном клиента
+CLIENT_TEMPLATE_DIR = Path(__file__).resolve().parents[2] / "Client" / "Client_Template"
+if str(CLIENT_TEMPLATE_DIR) not in sys.path:
+    sys.path.append(str(CLIENT_TEMPLATE_DIR))
+
+import Transfer_Format
+
 # ===================================== Пути и конфигурация =====================================
 # Путь к CSV относительно папки Server/App
 script_dir = os.path.dirname(os.path.abspath(__file__))
 csv_file_path = os.path.join(script_dir, "../../data/fruit_vegetable_classification_dataset.csv")
 csv_file_path = os.path.normpath(csv_file_path)
 
-# Глобальные переменные для хранения данных
-current_csv_data = None
+# Глобальные переменные для хранения данных.
+# Основная таблица — разобранный DataFrame с номером версии. CSV, временный
+# файл, бинарные форматы и метаданные создаются по требованию и кэшируются для
+# текущей версии. Это единственная копия данных: её используют WorkflowManager
+# и окно результатов.
 current_csv_file = "temp_processing.csv"
+current_dataframe = None    # источник истины (из CSV разбирается не больше раза на версию)
+current_csv_data = None     # CSV текущей версии: кэш или данные, пришедшие от клиента
+current_version = 0         # растёт при каждом обновлении данных
+_csv_file_version = None    # версия, записанная во временный файл
+_csv_only_in_file = False   # версия пришла файлом (принята на диск) и ещё не читалась
+_encoded_cache = {}         # fmt -> (bytes, fmt) для current_version
+_metadata = None            # rows/columns для current_version
+_data_lock = threading.RLock()
 
 # ===================================== Основные функции =====================================
 
@@ -29,8 +50,6 @@ def load_initial_csv():
         FileNotFoundError: Если CSV файл не найден
         pd.errors.EmptyDataError: Если файл пустой
     """
-    global current_csv_data
-    
     try:
         # Проверяем существование файла
         if not os.path.exists(csv_file_path):
@@ -45,20 +64,20 @@ def load_initial_csv():
             print(f"[CSV ERROR] File is empty: {csv_file_path}")
             return None, None
         
-        # Сохраняем в памяти
-        current_csv_data = df.to_csv(index=False)
+        # Сохраняем в памяти (разобранная таблица — новая версия данных)
+        set_dataframe(df)
         
         # Сохраняем во временный файл для обработки
-        with open(current_csv_file, 'w', encoding='utf-8') as f:
-            f.write(current_csv_data)
+        csv_data = get_current_csv_data()
+        materialize_csv_file()
         
         print(f"[CSV] ✅ Original file loaded")
-        print(f"[CSV] 📊 Size: {len(current_csv_data):,} bytes")
+        print(f"[CSV] 📊 Size: {len(csv_data):,} bytes")
         print(f"[CSV] 📋 Rows: {len(df):,}")
         print(f"[CSV] 📁 Columns: {len(df.columns)}")
         print(f"[CSV] 💾 Temp file: {current_csv_file}")
         
-        return current_csv_data, current_csv_file
+        return csv_data, current_csv_file
         
     except FileNotFoundError:
         print(f"[CSV ERROR] File not found: {csv_file_path}")
@@ -73,14 +92,108 @@ def load_initial_csv():
         traceback.print_exc()
         return None, None
 
+def _new_version(df=None, csv_text=None, in_file=False):
+    """Новая версия данных: сбрасывает все производные формы старой версии"""
+    global current_dataframe, current_csv_data, current_version, _csv_file_version, _metadata, \
+        _csv_only_in_file
+    with _data_lock:
+        current_dataframe = df
+        current_csv_data = csv_text
+        current_version += 1
+        _csv_file_version = current_version if in_file else None
+        _csv_only_in_file = in_file
+        _encoded_cache.clear()
+        _metadata = None
+
+
+def has_data():
+    """Загружены ли данные"""
+    return current_dataframe is not None or current_csv_data is not None or _csv_only_in_file
+
+
+def get_version():
+    """Номер текущей версии данных"""
+    return current_version
+
+
 def get_current_csv_data():
     """
     Получить текущие CSV данные в виде строки.
     
+    CSV создаётся из таблицы один раз на версию.
+    
     Returns:
         str: CSV данные в текстовом формате или None если данные не загружены
     """
-    return current_csv_data
+    global current_csv_data
+    with _data_lock:
+        if current_csv_data is None and current_dataframe is not None:
+            current_csv_data = current_dataframe.to_csv(index=False)
+        elif current_csv_data is None and _csv_only_in_file:
+            with open(current_csv_file, 'r', encoding='utf-8') as f:
+                current_csv_data = f.read()
+        return current_csv_data
+
+
+def materialize_csv_file():
+    """
+    Записать текущую версию во временный файл (если она ещё не записана).
+    
+    Returns:
+        str: Путь к временному файлу или None если данные не загружены
+    """
+    global _csv_file_version
+    with _data_lock:
+        if not has_data():
+            return None
+        if _csv_file_version != current_version:
+            # Запись через временный файл и os.replace: файл, который сейчас
+            # отправляется клиенту потоком (sendfile), не обрезается
+            tmp_path = f"{current_csv_file}.{current_version}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(get_current_csv_data())
+            try:
+                os.replace(tmp_path, current_csv_file)
+            except PermissionError:
+                # Windows не заменяет открытый файл — записываем на месте
+                os.remove(tmp_path)
+                with open(current_csv_file, 'w', encoding='utf-8') as f:
+                    f.write(get_current_csv_data())
+            _csv_file_version = current_version
+        return current_csv_file
+
+
+def get_encoded(fmt):
+    """
+    Текущая таблица в формате передачи (кэшируется для версии).
+    
+    Returns:
+        tuple: (data: bytes, fmt: str) — см. Transfer_Format.encode_dataframe
+    """
+    with _data_lock:
+        if fmt not in _encoded_cache:
+            _encoded_cache[fmt] = Transfer_Format.encode_dataframe(get_dataframe(), fmt)
+        return _encoded_cache[fmt]
+
+
+def set_dataframe(df):
+    """
+    Установить разобранную таблицу как новую версию данных.
+    
+    Индекс сбрасывается: row id строк — их позиция в таблице.
+    """
+    _new_version(df=df.reset_index(drop=True))
+
+
+def apply_columns(patch):
+    """
+    Слить колонки патча (индекс — row id) с текущей таблицей как новую версию.
+    
+    Новые колонки для строк, которых нет в патче, остаются пустыми.
+    """
+    with _data_lock:
+        df = Transfer_Format.merge_columns(get_dataframe().copy(deep=False), patch)
+        _new_version(df=df)
 
 def get_current_csv_file():
     """
@@ -91,33 +204,50 @@ def get_current_csv_file():
     """
     return current_csv_file
 
-def set_current_csv_data(data):
+def set_csv_file_data(path):
+    """
+    Установить CSV, уже лежащий в файле path, как новую версию данных.
+    
+    Файл переносится на место временного (переименование, без копирования,
+    если оба на одном диске); текст и таблица читаются из него только при
+    первом обращении.
+    """
+    import shutil
+    with _data_lock:
+        shutil.move(path, current_csv_file)
+        _new_version(in_file=True)
+    print(f"[CSV] 🔄 Data updated from file ({os.path.getsize(current_csv_file):,} bytes)")
+
+
+def set_current_csv_data(data, filepath=None):
     """
     Установить текущие CSV данные.
     
-    Обновляет данные в памяти и записывает их во временный файл.
+    Данные становятся новой версией; таблица разбирается из CSV при первом
+    обращении, временный файл записывается при первой необходимости
+    (materialize_csv_file).
     
     Args:
         data (str or bytes): CSV данные в текстовом формате или байтах
+        filepath (str, optional): Новый путь к временному файлу
     
     Returns:
         bool: True если обновление успешно, False в случае ошибки
     """
-    global current_csv_data
+    global current_csv_file
     
     try:
         # Преобразуем bytes в строку если необходимо
-        if isinstance(data, bytes):
+        if isinstance(data, (bytes, bytearray)):
             data = data.decode('utf-8')
         
         # Обновляем данные в памяти
-        current_csv_data = data
-        
-        # Сохраняем во временный файл
-        with open(current_csv_file, 'w', encoding='utf-8') as f:
-            f.write(current_csv_data)
+        with _data_lock:
+            if filepath is not None:
+                current_csv_file = filepath
+            _new_version(csv_text=data)
         
-        print(f"[CSV] 🔄 Data updated ({len(current_csv_data):,} bytes)")
+        print(f"[CSV] 🔄 Data updated ({len(data):,} bytes)")
         return True
         
     except Exception as e:
@@ -135,7 +265,7 @@ def reload_csv_from_file():
     Returns:
         bool: True если перезагрузка успешна, False в случае ошибки
     """
-    global current_csv_data
+    global _csv_file_version
     
     try:
         if not os.path.exists(current_csv_file):
@@ -143,7 +273,9 @@ def reload_csv_from_file():
             return False
         
         with open(current_csv_file, 'r', encoding='utf-8') as f:
-            current_csv_data = f.read()
+            with _data_lock:
+                _new_version(csv_text=f.read())
+                _csv_file_version = current_version
         
         print(f"[CSV] 🔄 Data reloaded from {current_csv_file}")
         return True
@@ -168,25 +300,34 @@ def get_csv_info():
             'file_path': str
         }
     """
-    if current_csv_data is None:
+    if not has_data():
         return None
     
     try:
-        import io
-        df = pd.read_csv(io.StringIO(current_csv_data))
-        
-        return {
-            'rows': len(df),
-            'columns': len(df.columns),
-            'size_bytes': len(current_csv_data),
-            'columns_list': df.columns.tolist(),
-            'file_path': current_csv_file
-        }
+        info = dict(_get_metadata())
+        info['size_bytes'] = len(get_current_csv_data())
+        info['columns_list'] = list(info['columns_list'])
+        info['file_path'] = current_csv_file
+        return info
         
     except Exception as e:
         print(f"[CSV ERROR] Error getting info: {e}")
         return None
 
+
+def _get_metadata():
+    """Метаданные текущей версии (вычисляются один раз на версию)"""
+    global _metadata
+    with _data_lock:
+        if _metadata is None:
+            df = get_dataframe()
+            _metadata = {
+                'rows': len(df),
+                'columns': len(df.columns),
+                'columns_list': tuple(df.columns),
+            }
+        return _metadata
+
 def validate_csv_data():
     """
     Проверить корректность текущих CSV данных.
@@ -194,17 +335,16 @@ def validate_csv_data():
     Returns:
         tuple: (bool, str) - (валидность, сообщение об ошибке)
     """
-    if current_csv_data is None:
+    if not has_data():
         return False, "Data not loaded"
     
     try:
-        import io
-        df = pd.read_csv(io.StringIO(current_csv_data))
+        metadata = _get_metadata()
         
-        if df.empty:
+        if metadata['rows'] == 0 or metadata['columns'] == 0:
             return False, "CSV data is empty"
         
-        if len(df.columns) == 0:
+        if metadata['columns'] == 0:
             return False, "No columns in data"
         
         return True, "Data is valid"
@@ -234,7 +374,7 @@ def backup_current_data(backup_name=None):
     Returns:
         str: Путь к файлу бэкапа или None в случае ошибки
     """
-    if current_csv_data is None:
+    if not has_data():
         print("[CSV ERROR] No data to backup")
         return None
     
@@ -254,7 +394,7 @@ def backup_current_data(backup_name=None):
         
         # Сохраняем бэкап
         with open(backup_path, 'w', encoding='utf-8') as f:
-            f.write(current_csv_data)
+            f.write(get_current_csv_data())
         
         print(f"[CSV] 💾 Backup created: {backup_path}")
         return str(backup_path)
@@ -269,15 +409,22 @@ def get_dataframe():
     """
     Получить текущие данные как pandas DataFrame.
     
+    Возвращается общая таблица текущей версии (CSV разбирается не больше
+    одного раза на версию). Её нельзя изменять на месте: для изменений
+    нужна копия и save_dataframe/set_dataframe.
+    
     Returns:
         pd.DataFrame: DataFrame с данными или None в случае ошибки
     """
-    if current_csv_data is None:
-        return None
+    global current_dataframe
     
     try:
-        import io
-        return pd.read_csv(io.StringIO(current_csv_data))
+        with _data_lock:
+            if current_dataframe is None and current_csv_data is not None:
+                current_dataframe = pd.read_csv(io.StringIO(current_csv_data))
+            elif current_dataframe is None and _csv_only_in_file:
+                current_dataframe = pd.read_csv(current_csv_file)
+            return current_dataframe
     except Exception as e:
         print(f"[CSV ERROR] Error creating DataFrame: {e}")
         return None
@@ -294,14 +441,14 @@ def save_dataframe(df, update_current=True):
         bool: True если сохранение успешно, False в случае ошибки
     """
     try:
-        csv_string = df.to_csv(index=False)
-        
         if update_current:
-            return set_current_csv_data(csv_string)
+            set_dataframe(df)
+            materialize_csv_file()
+            print(f"[CSV] 🔄 Data updated ({len(df):,} rows)")
+            return True
         else:
             # Только сохраняем в файл без обновления в памяти
-            with open(current_csv_file, 'w', encoding='utf-8') as f:
-                f.write(csv_string)
+            df.to_csv(current_csv_file, index=False)
             print(f"[CSV] 💾 DataFrame saved to {current_csv_file}")
             return True
             
@@ -0,0 +1,332 @@
+import json
+import selectors
+import struct
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+# ===================================== Настройки =====================================
+HANDSHAKE_TIMEOUT = 5          # секунд на отправку "name|level|mode[|capabilities]"
+HANDSHAKE_MAX_BYTES = 4096     # рукопожатие не может быть длиннее
+KEEPALIVE_IDLE = 30            # секунд тишины до первой TCP keepalive пробы
+KEEPALIVE_INTERVAL = 10        # интервал между пробами
+KEEPALIVE_COUNT = 3            # проб до признания пира мёртвым
+
+
+def _enable_keepalive(conn: socket.socket):
+    """Включение TCP keepalive, чтобы замечать 'исчезнувшие' хосты без трафика"""
+    try:
+        conn.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, KEEPALIVE_IDLE)
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, KEEPALIVE_INTERVAL)
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, KEEPALIVE_COUNT)
+        elif hasattr(socket, "SIO_KEEPALIVE_VALS"):
+            conn.ioctl(socket.SIO_KEEPALIVE_VALS,
+                       (1, KEEPALIVE_IDLE * 1000, KEEPALIVE_INTERVAL * 1000))
+    except OSError:
+        pass
+
+
+class _IncompleteHandshake(Exception):
+    """Рукопожатие пришло не целиком — ждём остаток"""
+
+
+def _parse_handshake(data: bytes):
+    """
+    Разбор строки "name|level|mode" или "name|level|mode|{json}".
+
+    Returns:
+        tuple: (name, level, mode, capabilities)
+    """
+    parts = data.decode('utf-8').split('|', 3)
+    if len(parts) < 3:
+        raise _IncompleteHandshake()
+
+    name, level, mode = parts[:3]
+    capabilities = {}
+    if len(parts) == 4:
+        try:
+            capabilities = json.loads(parts[3])
+        except json.JSONDecodeError:
+            raise _IncompleteHandshake()
+        if not isinstance(capabilities, dict):
+            raise ValueError("capabilities must be a JSON object")
+
+    return name, int(level), mode, capabilities
+
+
+class ConnectionManager:
+    """
+    Единый цикл событий (selectors) для всех клиентских сокетов.
+
+    Вместо отдельного потока на каждого клиента один поток принимает соединения,
+    обрабатывает рукопожатие "name|level|mode", сообщения DISCONNECT и обрыв
+    соединения. Словарь clients сохраняет прежний формат
+    addr -> (conn, name, level, mode), который использует WorkflowManager.
+
+    Новые клиенты добавляют к рукопожатию четвёртое поле — JSON с возможностями
+    (например, поддерживаемые форматы передачи). Оно хранится в capabilities[addr].
+
+    Пока WorkflowManager обменивается данными с клиентом, сокет нужно "взять"
+    через borrow(addr) — цикл событий перестаёт читать из него до возврата.
+    """
+
+    def __init__(self, clients_dict, names_set, on_change=None):
+        self.clients = clients_dict
+        self.names = names_set
+        self.on_change = on_change
+
+        self.selector = selectors.DefaultSelector()
+        self.lock = threading.RLock()
+        self.pending = {}       # conn -> (addr, deadline) — ждём рукопожатие
+        self.handshake_buffers = {}
+        self.capabilities = {}  # addr -> dict из рукопожатия
+        self.borrowed = set()   # conn, которые сейчас использует workflow
+        self.server = None
+        self.running = False
+
+        # Сокет-пара для пробуждения select() из других потоков
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+        self.selector.register(self._wakeup_r, selectors.EVENT_READ, "wakeup")
+
+    # ------------------------------------- Запуск / остановка -------------------------------------
+    def start(self, host, port):
+        """Открытие слушающего сокета и запуск цикла событий в фоновом потоке"""
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((host, port))
+        self.server.listen(socket.SOMAXCONN)
+        self.server.setblocking(False)
+        self.selector.register(self.server, selectors.EVENT_READ, "accept")
+
+        self.running = True
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self.server.getsockname()
+
+    def stop(self):
+        """Остановка цикла и закрытие всех соединений"""
+        self.running = False
+        self._wakeup()
+        for addr in list(self.clients.keys()):
+            self.disconnect(addr, silent=True)
+        with self.lock:
+            for conn in list(self.pending.keys()):
+                self._drop_pending(conn)
+            if self.server is not None:
+                try:
+                    self.selector.unregister(self.server)
+                except (KeyError, ValueError):
+                    pass
+                self.server.close()
+                self.server = None
+
+    def _wakeup(self):
+        try:
+            self._wakeup_w.send(b"\0")
+        except OSError:
+            pass
+
+    # ------------------------------------- Цикл событий -------------------------------------
+    def serve_forever(self):
+        while self.running:
+            try:
+                events = self.selector.select(timeout=self._next_timeout())
+            except OSError:
+                continue
+            for key, _ in events:
+                with self.lock:
+                    if key.data == "wakeup":
+                        self._drain_wakeup()
+                    elif key.data == "accept":
+                        self._accept()
+                    elif key.data == "handshake":
+                        self._read_handshake(key.fileobj)
+                    elif key.fileobj not in self.borrowed:
+                        self._read_idle(key.fileobj, key.data)
+            self._expire_handshakes()
+
+    def _next_timeout(self):
+        """Без ожидающих рукопожатий цикл спит до следующего события"""
+        with self.lock:
+            if not self.pending:
+                return None
+            nearest = min(deadline for _, deadline in self.pending.values())
+        return max(0.0, nearest - time.monotonic())
+
+    def _drain_wakeup(self):
+        try:
+            while self._wakeup_r.recv(1024):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _accept(self):
+        try:
+            conn, addr = self.server.accept()
+        except (BlockingIOError, OSError):
+            return
+        conn.setblocking(False)
+        _enable_keepalive(conn)
+        # Части конвейера — короткие сообщения подряд; без Nagle они не ждут ACK
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.pending[conn] = (addr, time.monotonic() + HANDSHAKE_TIMEOUT)
+        self.selector.register(conn, selectors.EVENT_READ, "handshake")
+
+    def _expire_handshakes(self):
+        now = time.monotonic()
+        with self.lock:
+            for conn, (addr, deadline) in list(self.pending.items()):
+                if deadline <= now:
+                    print(f"[!] Connection timeout {addr}")
+                    self._drop_pending(conn)
+
+    def _drop_pending(self, conn):
+        self.pending.pop(conn, None)
+        self.handshake_buffers.pop(conn, None)
+        try:
+            self.selector.unregister(conn)
+        except (KeyError, ValueError):
+            pass
+        try:
+            conn.close()
+        except OSError:
+            pass
+
+    # ------------------------------------- Рукопожатие -------------------------------------
+    def _read_handshake(self, conn):
+        if conn not in self.pending:
+            return
+        addr, _ = self.pending[conn]
+        try:
+            data = conn.recv(HANDSHAKE_MAX_BYTES)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            print(f"[!] Client error {addr}: {e}")
+            self._drop_pending(conn)
+            return
+
+        if not data:
+            self._drop_pending(conn)
+            return
+
+        buffer = self.handshake_buffers.get(conn, b"") + data
+        try:
+            name, level, mode, capabilities = _parse_handshake(buffer)
+        except _IncompleteHandshake:
+            if len(buffer) >= HANDSHAKE_MAX_BYTES:
+                print(f"[!] Client error {addr}: handshake too long")
+                self._drop_pending(conn)
+            else:
+                self.handshake_buffers[conn] = buffer
+            return
+        except (ValueError, UnicodeDecodeError) as e:
+            print(f"[!] Client error {addr}: invalid handshake ({e})")
+            self._drop_pending(conn)
+            return
+        self.handshake_buffers.pop(conn, None)
+
+        if name in self.names:
+            try:
+                conn.send("ERROR: Name already in use".encode('utf-8'))
+            except OSError:
+                pass
+            self._drop_pending(conn)
+            return
+
+        self.pending.pop(conn, None)
+        self.clients[addr] = (conn, name, level, mode)
+        self.capabilities[addr] = capabilities
+        self.names.add(name)
+        try:
+            conn.send("CONNECTED".encode('utf-8'))
+        except OSError:
+            self.disconnect(addr, silent=True)
+            return
+
+        self.selector.modify(conn, selectors.EVENT_READ, addr)
+        print(f"[+] Client connected: {name} (Lvl {level}, {mode}) — {addr}")
+        self._notify()
+
+    # ------------------------------------- Простаивающие клиенты -------------------------------------
+    def _read_idle(self, conn, addr):
+        """Данные от клиента вне рабочего цикла: DISCONNECT или обрыв соединения"""
+        try:
+            data = conn.recv(1024)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            print(f"[!] Client error {addr}: {e}")
+            data = b""
+
+        if not data or data.startswith(b"DISCONNECT"):
+            self.disconnect(addr, notify_client=False)
+
+    # ------------------------------------- Управление клиентами -------------------------------------
+    def disconnect(self, addr, silent=False, notify_client=True):
+        """Отключение клиента: уведомление, закрытие сокета, удаление из clients"""
+        with self.lock:
+            if addr not in self.clients:
+                return
+            conn, name, _, _ = self.clients.pop(addr)
+            self.capabilities.pop(addr, None)
+            self.borrowed.discard(conn)
+            try:
+                self.selector.unregister(conn)
+            except (KeyError, ValueError):
+                pass
+            if notify_client:
+                try:
+                    conn.setblocking(True)
+                    conn.settimeout(1)
+                    # После рукопожатия клиент читает только сообщения с заголовком
+                    header = json.dumps({"action": "disconnect"}).encode('utf-8')
+                    conn.sendall(struct.pack(">I", len(header)) + header)
+                except OSError:
+                    pass
+            try:
+                conn.close()
+            except OSError:
+                pass
+            self.names.discard(name)
+
+        if not silent:
+            print(f"[-] Client disconnected: {name}")
+        self._notify()
+
+    @contextmanager
+    def borrow(self, addr):
+        """
+        Временная передача сокета клиента вызывающему потоку.
+
+        Внутри блока сокет блокирующий и не читается циклом событий;
+        после выхода он снова отслеживается на DISCONNECT и обрыв.
+        """
+        with self.lock:
+            conn = self.clients[addr][0]
+            self.borrowed.add(conn)
+            try:
+                self.selector.unregister(conn)
+            except (KeyError, ValueError):
+                pass
+        conn.setblocking(True)
+        try:
+            yield conn
+        finally:
+            with self.lock:
+                self.borrowed.discard(conn)
+                if addr in self.clients and self.clients[addr][0] is conn:
+                    try:
+                        conn.setblocking(False)
+                        self.selector.register(conn, selectors.EVENT_READ, addr)
+                    except (OSError, ValueError, KeyError):
+                        self.disconnect(addr, silent=True, notify_client=False)
+            self._wakeup()
+
+    def _notify(self):
+        if self.on_change:
+            self.on_change()
@@ -1,60 +1,68 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTabWidget,
                              QTextEdit, QLabel, QPushButton, QLineEdit, QComboBox,
                              QMessageBox, QFrame, QScrollArea, QGridLayout, QGroupBox, QApplication)
-from PyQt5.QtCore import Qt, QTimer, QMetaObject, Q_ARG
+from PyQt5.QtCore import Qt, QTimer, QMetaObject, Q_ARG, QObject, pyqtSignal
 from PyQt5.QtGui import QFont, QTextCursor
 from datetime import datetime
-import io
-import pickle
+from pathlib import Path
 import os
-import json
+import sys
+import threading
 import pandas as pd
 import numpy as np
 
+# Общие модули (реестр моделей) лежат рядом с шаблоном клиента
+CLIENT_TEMPLATE_DIR = Path(__file__).resolve().parents[2] / "Client" / "Client_Template"
+if str(CLIENT_TEMPLATE_DIR) not in sys.path:
+    sys.path.append(str(CLIENT_TEMPLATE_DIR))
+
+import Model_Registry
+import Token_List
+import Cascade_Predictor
+import Prediction_History
+
 # Исправленный импорт - используем относительный импорт
-from .CSV_Manager import get_current_csv_data
+from .CSV_Manager import get_dataframe
 
 
-def show_results_window():
-    """Интерактивное окно с результатами и возможностью делать предсказания"""
-    # ВАЖНО: Проверяем, что мы в главном потоке Qt
-    if QApplication.instance() is None:
-        QMessageBox.critical(None, "Error", "QApplication not initialized")
-        return
+class _WindowSignals(QObject):
+    open_requested = pyqtSignal()
 
-    current_csv_data = get_current_csv_data()
 
-    if not current_csv_data:
-        QMessageBox.information(None, "Info", "No data to display")
-        return
+# Создан при импорте в главном потоке: сигнал из потока workflow
+# выполняется в главном потоке Qt
+_window_signals = _WindowSignals()
 
-    try:
-        df = pd.read_csv(io.StringIO(current_csv_data))
 
-        # Загружаем обученные модели
-        model1_data = None
-        model2_data = None
+def show_results_window():
+    """
+    Интерактивное окно с результатами и возможностью делать предсказания.
 
-        if os.path.exists('model1_trained.pkl'):
-            with open('model1_trained.pkl', 'rb') as f:
-                model1_data = pickle.load(f)
+    Можно вызывать из любого потока: окно создаётся в главном потоке Qt.
+    """
+    if QApplication.instance() is None:
+        QMessageBox.critical(None, "Error", "QApplication not initialized")
+        return
+    _window_signals.open_requested.emit()
 
-        if os.path.exists('model2_trained.pkl'):
-            with open('model2_trained.pkl', 'rb') as f:
-                model2_data = pickle.load(f)
 
-        # Создаём главное окно В ГЛАВНОМ ПОТОКЕ
-        def create_window():
-            results_window = ResultsWindow(df, model1_data, model2_data)
-            results_window.show()
+def _open_results_window():
+    """
+    Окно появляется сразу в состоянии загрузки; таблица и модели
+    загружаются в фоновом потоке (load_results).
+    """
+    try:
+        results_window = ResultsWindow()
+        results_window.show()
 
-            # ВАЖНО: Сохраняем ссылку на окно, чтобы оно не закрылось
-            if not hasattr(show_results_window, '_windows'):
-                show_results_window._windows = []
-            show_results_window._windows.append(results_window)
+        # ВАЖНО: Сохраняем ссылку на окно, чтобы оно не закрылось
+        if not hasattr(show_results_window, '_windows'):
+            show_results_window._windows = []
+        show_results_window._windows.append(results_window)
 
-        # Используем QTimer для создания окна в главном потоке
-        QTimer.singleShot(0, create_window)
+        # Загрузка начинается после первой отрисовки окна: фоновый поток
+        # (разбор CSV, распаковка моделей) не задерживает его появление
+        QTimer.singleShot(0, results_window.start_loading)
 
     except Exception as e:
         QMessageBox.critical(None, "Error", f"Failed to display results:\n{e}")
@@ -62,12 +70,146 @@ def show_results_window():
         traceback.print_exc()
 
 
+_window_signals.open_requested.connect(_open_results_window)
+
+
+def load_results():
+    """
+    Всё, что нужно окну: таблица, модели, текст статистики и значения
+    для списков формы предсказания. Выполняется вне потока GUI.
+
+    Returns:
+        dict или None, если данных нет
+    """
+    # Общая таблица текущей версии: без повторного разбора CSV
+    df = get_dataframe()
+    if df is None or df.empty:
+        return None
+
+    # Загружаем обученные модели (повторное открытие окна берёт их из кэша)
+    model1_data = Model_Registry.load_model('model1')
+    model2_data = Model_Registry.load_model('model2')
+
+    # Каскад для кнопки Predict компилируется один раз на окно
+    predictor = None
+    if model1_data and model2_data:
+        predictor = Cascade_Predictor.CompiledCascade(model1_data, model2_data)
+
+    return {
+        'df': df,
+        'model1_data': model1_data,
+        'model2_data': model2_data,
+        'predictor': predictor,
+        'stats': generate_stats_output(df, model1_data, model2_data),
+        'choices': {col: df[col].unique().tolist() if col in df.columns else []
+                    for col in ('shape', 'color', 'taste')},
+    }
+
+
+def generate_stats_output(df, model1_data, model2_data):
+    """Генерация текста статистики"""
+    output = ""
+    output += "=" * 80 + "\n"
+    output += " " * 25 + "🎉 TRAINING RESULTS 🎉\n"
+    output += "=" * 80 + "\n\n"
+
+    output += f"📂 Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+    output += f"📊 Total Records: {len(df):,}\n"
+    output += f"📋 Columns: {len(df.columns)}\n\n"
+
+    # Статистика предобработки
+    output += "─" * 80 + "\n"
+    output += "📝 DATA PREPROCESSING\n"
+    output += "─" * 80 + "\n"
+
+    if 'cleaned_text' in df.columns:
+        output += f"✅ Text Cleaning: {df['cleaned_text'].notna().sum():,} records\n"
+    # tokens/lemmas хранятся компактными строками Token_List
+    for column, title in (('tokens', 'Tokenization'), ('lemmas', 'Lemmatization')):
+        if column in df.columns:
+            lists = Token_List.decode_column(df[column])
+            filled = sum(1 for row in lists if row)
+            total = sum(map(len, lists))
+            output += f"✅ {title}: {filled:,} records, {total:,} tokens\n"
+
+    if 'model_target' in df.columns:
+        m1 = len(df[df['model_target'] == 'model1'])
+        m2 = len(df[df['model_target'] == 'model2'])
+        output += f"\n📊 Data Split:\n"
+        output += f"   • Model 1 (Binary): {m1:,} ({m1 / len(df) * 100:.1f}%)\n"
+        output += f"   • Model 2 (Multi-class): {m2:,} ({m2 / len(df) * 100:.1f}%)\n"
+
+    output += "\n" + "─" * 80 + "\n"
+    output += "🤖 MODEL 1: BINARY CLASSIFICATION (Decision Tree)\n"
+    output += "─" * 80 + "\n"
+
+    if model1_data:
+        output += f"📈 Training:\n"
+        output += f"   • Train Accuracy: {model1_data['train_acc']:.4f} ({model1_data['train_acc'] * 100:.2f}%)\n"
+        output += f"   • Test Accuracy:  {model1_data['test_acc']:.4f} ({model1_data['test_acc'] * 100:.2f}%)\n"
+        output += f"   • Train Size: {model1_data['train_size']:,} samples\n"
+        output += f"   • Test Size:  {model1_data['test_size']:,} samples\n"
+        output += f"   • Classes: {', '.join(model1_data['classes'])}\n"
+
+        if 'model1_val_accuracy' in df.columns:
+            val_acc = df['model1_val_accuracy'].iloc[0]
+            cv_mean = df.get('model1_cv_mean', pd.Series([0])).iloc[0]
+            output += f"\n📊 Validation:\n"
+            output += f"   • Validation Accuracy: {val_acc:.4f} ({val_acc * 100:.2f}%)\n"
+            output += f"   • Cross-Validation: {cv_mean:.4f} ({cv_mean * 100:.2f}%)\n"
+    else:
+        output += "❌ Model not trained\n"
+
+    output += "\n" + "─" * 80 + "\n"
+    output += "🤖 MODEL 2: MULTI-CLASS CLASSIFICATION (Random Forest)\n"
+    output += "─" * 80 + "\n"
+
+    if model2_data:
+        output += f"📈 Training:\n"
+        output += f"   • Train Accuracy: {model2_data['train_acc']:.4f} ({model2_data['train_acc'] * 100:.2f}%)\n"
+        output += f"   • Test Accuracy:  {model2_data['test_acc']:.4f} ({model2_data['test_acc'] * 100:.2f}%)\n"
+        output += f"   • Train Size: {model2_data['train_size']:,} samples\n"
+        output += f"   • Test Size:  {model2_data['test_size']:,} samples\n"
+        output += f"   • Number of Classes: {model2_data['n_classes']}\n"
+
+        if 'feature_importance' in model2_data:
+            top_features = sorted(model2_data['feature_importance'].items(),
+                                  key=lambda x: x[1], reverse=True)[:5]
+            output += f"\n📊 Top 5 Features:\n"
+            for feat, imp in top_features:
+                output += f"   • {feat}: {imp:.4f}\n"
+
+        if 'model2_val_accuracy' in df.columns:
+            val_acc = df['model2_val_accuracy'].iloc[0]
+            cv_mean = df.get('model2_cv_mean', pd.Series([0])).iloc[0]
+            output += f"\n📊 Validation:\n"
+            output += f"   • Validation Accuracy: {val_acc:.4f} ({val_acc * 100:.2f}%)\n"
+            output += f"   • Cross-Validation: {cv_mean:.4f} ({cv_mean * 100:.2f}%)\n"
+    else:
+        output += "❌ Model not trained\n"
+
+    output += "\n" + "=" * 80 + "\n"
+    output += " " * 20 + "✨ MODELS READY TO USE ✨\n"
+    output += "=" * 80 + "\n"
+
+    return output
+
+
 class ResultsWindow(QWidget):
-    def __init__(self, df, model1_data, model2_data):
+    # Результат load_results() из фонового потока (доставляется в главный поток)
+    results_loaded = pyqtSignal(object)
+    loading_failed = pyqtSignal(str)
+
+    def __init__(self):
         super().__init__()
-        self.df = df
-        self.model1_data = model1_data
-        self.model2_data = model2_data
+        self.df = None
+        self.model1_data = None
+        self.model2_data = None
+        self.predictor = None
+        self.stats_output = ""
+        self.choices = {}
+        self.loaded = False
+        self._lazy_tabs = {}      # вкладка-заглушка -> (функция построения, нужны ли данные)
 
         self.setWindowTitle("🤖 AI Models Dashboard")
         self.setGeometry(100, 100, 1100, 500)
@@ -127,14 +269,79 @@ class ResultsWindow(QWidget):
             }
         """)
 
-        # Создаём вкладки
-        self.create_stats_tab()
-        self.create_predictions_tab()
-        self.create_history_tab()
+        # Вкладки строятся при первом открытии (_build_current_tab)
+        self.add_lazy_tab("📊 Statistics", self.create_stats_tab)
+        self.add_lazy_tab("🔮 Predictions", self.create_predictions_tab)
+        if Prediction_History.exists():
+            self.add_lazy_tab("📜 History", self.create_history_tab, needs_data=False)
+        self.tab_widget.currentChanged.connect(self._build_current_tab)
 
         main_layout.addWidget(self.tab_widget)
         self.setLayout(main_layout)
 
+        self.results_loaded.connect(self._on_results_loaded)
+        self.loading_failed.connect(self._on_loading_failed)
+        self._build_current_tab()
+
+    def add_lazy_tab(self, title, builder, needs_data=True):
+        """Вкладка-заглушка с надписью загрузки; содержимое строит builder()"""
+        placeholder = QWidget()
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        loading_label = QLabel("⏳ Loading results...")
+        loading_label.setAlignment(Qt.AlignCenter)
+        loading_label.setStyleSheet("color: #aaaaaa; font-size: 20px;")
+        layout.addWidget(loading_label)
+        placeholder.setLayout(layout)
+        self._lazy_tabs[placeholder] = (builder, needs_data)
+        self.tab_widget.addTab(placeholder, title)
+
+    def _build_current_tab(self, index=None):
+        """Построение открытой вкладки, если она ещё не построена"""
+        placeholder = self.tab_widget.currentWidget()
+        if placeholder not in self._lazy_tabs:
+            return
+        builder, needs_data = self._lazy_tabs[placeholder]
+        if needs_data and not self.loaded:
+            return
+        del self._lazy_tabs[placeholder]
+
+        layout = placeholder.layout()
+        while layout.count():
+            layout.takeAt(0).widget().deleteLater()
+        layout.addWidget(builder())
+
+    def start_loading(self):
+        """Загрузка данных в фоновом потоке: окно не блокируется"""
+        def load():
+            try:
+                self.results_loaded.emit(load_results())
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                self.loading_failed.emit(str(e))
+
+        threading.Thread(target=load, daemon=True).start()
+
+    def _on_results_loaded(self, results):
+        if results is None:
+            self.close()
+            QMessageBox.information(None, "Info", "No data to display")
+            return
+
+        self.df = results['df']
+        self.model1_data = results['model1_data']
+        self.model2_data = results['model2_data']
+        self.predictor = results['predictor']
+        self.stats_output = results['stats']
+        self.choices = results['choices']
+        self.loaded = True
+        self._build_current_tab()
+
+    def _on_loading_failed(self, message):
+        self.close()
+        QMessageBox.critical(None, "Error", f"Failed to display results:\n{message}")
+
     def create_stats_tab(self):
         """Создание вкладки статистики"""
         stats_widget = QWidget()
@@ -154,99 +361,12 @@ class ResultsWindow(QWidget):
             }
         """)
 
-        # Генерируем статистику
-        output = self.generate_stats_output()
-        stats_text.setPlainText(output)
+        # Текст статистики подготовлен при загрузке (load_results)
+        stats_text.setPlainText(self.stats_output)
 
         stats_layout.addWidget(stats_text)
         stats_widget.setLayout(stats_layout)
-
-        self.tab_widget.addTab(stats_widget, "📊 Statistics")
-
-    def generate_stats_output(self):
-        """Генерация текста статистики"""
-        output = ""
-        output += "=" * 80 + "\n"
-        output += " " * 25 + "🎉 TRAINING RESULTS 🎉\n"
-        output += "=" * 80 + "\n\n"
-
-        output += f"📂 Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        output += f"📊 Total Records: {len(self.df):,}\n"
-        output += f"📋 Columns: {len(self.df.columns)}\n\n"
-
-        # Статистика предобработки
-        output += "─" * 80 + "\n"
-        output += "📝 DATA PREPROCESSING\n"
-        output += "─" * 80 + "\n"
-
-        if 'cleaned_text' in self.df.columns:
-            output += f"✅ Text Cleaning: {self.df['cleaned_text'].notna().sum():,} records\n"
-        if 'tokens' in self.df.columns:
-            output += f"✅ Tokenization: {self.df['tokens'].notna().sum():,} records\n"
-        if 'lemmas' in self.df.columns:
-            output += f"✅ Lemmatization: {self.df['lemmas'].notna().sum():,} records\n"
-
-        if 'model_target' in self.df.columns:
-            m1 = len(self.df[self.df['model_target'] == 'model1'])
-            m2 = len(self.df[self.df['model_target'] == 'model2'])
-            output += f"\n📊 Data Split:\n"
-            output += f"   • Model 1 (Binary): {m1:,} ({m1 / len(self.df) * 100:.1f}%)\n"
-            output += f"   • Model 2 (Multi-class): {m2:,} ({m2 / len(self.df) * 100:.1f}%)\n"
-
-        output += "\n" + "─" * 80 + "\n"
-        output += "🤖 MODEL 1: BINARY CLASSIFICATION (Decision Tree)\n"
-        output += "─" * 80 + "\n"
-
-        if self.model1_data:
-            output += f"📈 Training:\n"
-            output += f"   • Train Accuracy: {self.model1_data['train_acc']:.4f} ({self.model1_data['train_acc'] * 100:.2f}%)\n"
-            output += f"   • Test Accuracy:  {self.model1_data['test_acc']:.4f} ({self.model1_data['test_acc'] * 100:.2f}%)\n"
-            output += f"   • Train Size: {self.model1_data['train_size']:,} samples\n"
-            output += f"   • Test Size:  {self.model1_data['test_size']:,} samples\n"
-            output += f"   • Classes: {', '.join(self.model1_data['classes'])}\n"
-
-            if 'model1_val_accuracy' in self.df.columns:
-                val_acc = self.df['model1_val_accuracy'].iloc[0]
-                cv_mean = self.df.get('model1_cv_mean', pd.Series([0])).iloc[0]
-                output += f"\n📊 Validation:\n"
-                output += f"   • Validation Accuracy: {val_acc:.4f} ({val_acc * 100:.2f}%)\n"
-                output += f"   • Cross-Validation: {cv_mean:.4f} ({cv_mean * 100:.2f}%)\n"
-        else:
-            output += "❌ Model not trained\n"
-
-        output += "\n" + "─" * 80 + "\n"
-        output += "🤖 MODEL 2: MULTI-CLASS CLASSIFICATION (Random Forest)\n"
-        output += "─" * 80 + "\n"
-
-        if self.model2_data:
-            output += f"📈 Training:\n"
-            output += f"   • Train Accuracy: {self.model2_data['train_acc']:.4f} ({self.model2_data['train_acc'] * 100:.2f}%)\n"
-            output += f"   • Test Accuracy:  {self.model2_data['test_acc']:.4f} ({self.model2_data['test_acc'] * 100:.2f}%)\n"
-            output += f"   • Train Size: {self.model2_data['train_size']:,} samples\n"
-            output += f"   • Test Size:  {self.model2_data['test_size']:,} samples\n"
-            output += f"   • Number of Classes: {self.model2_data['n_classes']}\n"
-
-            if 'feature_importance' in self.model2_data:
-                top_features = sorted(self.model2_data['feature_importance'].items(),
-                                      key=lambda x: x[1], reverse=True)[:5]
-                output += f"\n📊 Top 5 Features:\n"
-                for feat, imp in top_features:
-                    output += f"   • {feat}: {imp:.4f}\n"
-
-            if 'model2_val_accuracy' in self.df.columns:
-                val_acc = self.df['model2_val_accuracy'].iloc[0]
-                cv_mean = self.df.get('model2_cv_mean', pd.Series([0])).iloc[0]
-                output += f"\n📊 Validation:\n"
-                output += f"   • Validation Accuracy: {val_acc:.4f} ({val_acc * 100:.2f}%)\n"
-                output += f"   • Cross-Validation: {cv_mean:.4f} ({cv_mean * 100:.2f}%)\n"
-        else:
-            output += "❌ Model not trained\n"
-
-        output += "\n" + "=" * 80 + "\n"
-        output += " " * 20 + "✨ MODELS READY TO USE ✨\n"
-        output += "=" * 80 + "\n"
-
-        return output
+        return stats_widget
 
     def create_predictions_tab(self):
         """Создание вкладки предсказаний"""
@@ -290,10 +410,10 @@ class ResultsWindow(QWidget):
         input_layout.setSpacing(15)
         input_layout.setContentsMargins(20, 25, 20, 20)
 
-        # Получаем уникальные значения
-        unique_shapes = self.df['shape'].unique().tolist() if 'shape' in self.df.columns else []
-        unique_colors = self.df['color'].unique().tolist() if 'color' in self.df.columns else []
-        unique_tastes = self.df['taste'].unique().tolist() if 'taste' in self.df.columns else []
+        # Уникальные значения (получены при загрузке)
+        unique_shapes = self.choices.get('shape', [])
+        unique_colors = self.choices.get('color', [])
+        unique_tastes = self.choices.get('taste', [])
 
         # Стиль для меток и полей
         label_style = """
@@ -456,11 +576,11 @@ class ResultsWindow(QWidget):
         predict_layout.addWidget(result_group)
 
         predict_widget.setLayout(predict_layout)
-        self.tab_widget.addTab(predict_widget, "🔮 Predictions")
+        return predict_widget
 
     def make_prediction(self):
         """Функция предсказания"""
-        if not self.model1_data or not self.model2_data:
+        if self.predictor is None:
             self.result_text.setPlainText("❌ Models not trained! Please run training first.")
             return
 
@@ -473,67 +593,21 @@ class ResultsWindow(QWidget):
             color = self.color_combo.currentText()
             taste = self.taste_combo.currentText()
 
-            # === ПРЕДСКАЗАНИЕ MODEL 1 (Binary) ===
-            X1_data = {
-                'size (cm)': [size],
-                'weight (g)': [weight],
-                'avg_price (MDL)': [price]
-            }
-
-            # Кодируем категориальные признаки для Model1
-            for col in ['shape', 'color', 'taste']:
-                le = self.model1_data['le_dict'][col]
-                val = {'shape': shape, 'color': color, 'taste': taste}[col]
-                if val in le.classes_:
-                    encoded = le.transform([val])[0]
-                else:
-                    encoded = 0
-                X1_data[f'{col}_encoded'] = [encoded]
-
-            X1_sample = pd.DataFrame(X1_data)
-            X1_sample = X1_sample[self.model1_data['feature_cols']]
-
-            pred1_encoded = self.model1_data['model'].predict(X1_sample)[0]
-            pred1_label = self.model1_data['le_target'].inverse_transform([pred1_encoded])[0]
-            pred1_proba = self.model1_data['model'].predict_proba(X1_sample)[0]
-
-            # === ПРЕДСКАЗАНИЕ MODEL 2 (Multi-class) ===
-            X2_data = {
-                'size (cm)': [size],
-                'weight (g)': [weight],
-                'avg_price (MDL)': [price]
-            }
-
-            for col in ['shape', 'color', 'taste', 'type']:
-                le = self.model2_data['le_dict'][col]
-                if col == 'type':
-                    val = pred1_label
-                else:
-                    val = {'shape': shape, 'color': color, 'taste': taste}[col]
-
-                if val in le.classes_:
-                    encoded = le.transform([val])[0]
-                else:
-                    encoded = 0
-                X2_data[f'{col}_encoded'] = [encoded]
-
-            X2_sample = pd.DataFrame(X2_data)
-            X2_sample = X2_sample[self.model2_data['feature_cols']]
-
-            pred2_encoded = self.model2_data['model'].predict(X2_sample)[0]
-            pred2_label = self.model2_data['le_target'].inverse_transform([pred2_encoded])[0]
-            pred2_proba = self.model2_data['model'].predict_proba(X2_sample)[0]
-
-            # Топ-3 предсказания для Model2
-            top3_indices = np.argsort(pred2_proba)[-3:][::-1]
-            top3_labels = self.model2_data['le_target'].inverse_transform(top3_indices)
-            top3_probas = pred2_proba[top3_indices]
+            # Каскад Model1 → Model2 одним вызовом вероятностей на модель
+            pred = self.predictor.predict({
+                'size (cm)': size,
+                'weight (g)': weight,
+                'avg_price (MDL)': price,
+                'shape': shape,
+                'color': color,
+                'taste': taste,
+            })
 
             # Формируем результат
             result = self.generate_prediction_output(
                 size, weight, price, shape, color, taste,
-                pred1_label, pred1_proba,
-                pred2_label, top3_labels, top3_probas
+                pred['type'], pred['type_labels'], pred['type_proba'],
+                pred['name'], pred['top_names'], pred['top_confidences']
             )
 
             self.result_text.setPlainText(result)
@@ -544,7 +618,7 @@ class ResultsWindow(QWidget):
             traceback.print_exc()
 
     def generate_prediction_output(self, size, weight, price, shape, color, taste,
-                                   pred1_label, pred1_proba,
+                                   pred1_label, pred1_labels, pred1_proba,
                                    pred2_label, top3_labels, top3_probas):
         """Генерация текста результата предсказания"""
         result = ""
@@ -566,7 +640,7 @@ class ResultsWindow(QWidget):
         result += f"   Type: {pred1_label.upper()}\n"
         result += f"   Confidence: {max(pred1_proba) * 100:.2f}%\n"
         result += f"\n   Probability Distribution:\n"
-        for i, cls in enumerate(self.model1_data['le_target'].classes_):
+        for i, cls in enumerate(pred1_labels):
             bar_len = int(pred1_proba[i] * 40)
             bar = "█" * bar_len + "░" * (40 - bar_len)
             result += f"   {cls:12s} [{bar}] {pred1_proba[i] * 100:5.2f}%\n"
@@ -589,16 +663,13 @@ class ResultsWindow(QWidget):
         return result
 
     def create_history_tab(self):
-        """Создание вкладки истории предсказаний"""
-        if not os.path.exists('predictions_results.json'):
-            return
-
+        """Создание вкладки истории предсказаний (страницы Prediction_History)"""
         history_widget = QWidget()
         history_layout = QVBoxLayout()
 
-        history_text = QTextEdit()
-        history_text.setReadOnly(True)
-        history_text.setStyleSheet("""
+        self.history_text = QTextEdit()
+        self.history_text.setReadOnly(True)
+        self.history_text.setStyleSheet("""
             QTextEdit {
                 background-color: #1a1a1a;
                 color: #00ff00;
@@ -609,19 +680,76 @@ class ResultsWindow(QWidget):
                 padding: 12px;
             }
         """)
+        history_layout.addWidget(self.history_text)
 
+        # Листание: курсоры начала показанных страниц (первая — None)
+        button_style = """
+            QPushButton {
+                background-color: #3d3d3d;
+                color: white;
+                font-size: 20px;
+                font-weight: bold;
+                padding: 10px;
+                border-radius: 8px;
+                border: none;
+            }
+            QPushButton:hover {
+                background-color: #505050;
+            }
+            QPushButton:disabled {
+                color: #777777;
+            }
+        """
+        nav_layout = QHBoxLayout()
+        self.history_newer_btn = QPushButton("◀ Newer")
+        self.history_older_btn = QPushButton("Older ▶")
+        self.history_page_label = QLabel()
+        self.history_page_label.setAlignment(Qt.AlignCenter)
+        for btn in (self.history_newer_btn, self.history_older_btn):
+            btn.setStyleSheet(button_style)
+        self.history_newer_btn.clicked.connect(self.show_newer_history)
+        self.history_older_btn.clicked.connect(self.show_older_history)
+        nav_layout.addWidget(self.history_newer_btn)
+        nav_layout.addWidget(self.history_page_label)
+        nav_layout.addWidget(self.history_older_btn)
+        history_layout.addLayout(nav_layout)
+
+        self.history_cursors = [None]
+        self.history_next = None
+        self.show_history_page()
+
+        history_widget.setLayout(history_layout)
+        return history_widget
+
+    def show_older_history(self):
+        if self.history_next is not None:
+            self.history_cursors.append(self.history_next)
+            self.show_history_page()
+
+    def show_newer_history(self):
+        if len(self.history_cursors) > 1:
+            self.history_cursors.pop()
+            self.show_history_page()
+
+    def show_history_page(self):
+        """Вывод одной страницы истории (время не зависит от размера истории)"""
+        page = len(self.history_cursors)
         try:
-            with open('predictions_results.json', 'r', encoding='utf-8') as f:
-                predictions = json.load(f)
+            info = Prediction_History.summary()
+            predictions, self.history_next = Prediction_History.read_page(self.history_cursors[-1])
 
             history_output = ""
             history_output += "=" * 80 + "\n"
             history_output += " " * 25 + "📜 PREDICTION HISTORY\n"
             history_output += "=" * 80 + "\n\n"
-            history_output += f"Total predictions: {len(predictions)}\n\n"
-
-            for i, pred in enumerate(predictions[:20], 1):
-                history_output += f"─── Prediction #{i} {'─' * 60}\n"
+            history_output += f"Total predictions: {info['predictions']:,} in {info['runs']} run(s)"
+            if info['last_run']:
+                history_output += f", last: {info['last_run']}"
+            history_output += "\n\n"
+
+            first = (page - 1) * Prediction_History.PAGE_SIZE
+            for i, pred in enumerate(predictions, first + 1):
+                history_output += f"─── Prediction #{i} (run {pred['run_id']}, sample {pred['sample_id']}) {'─' * 30}\n"
                 inp = pred['input']
                 history_output += f"Input: {inp['color']} {inp['shape']}, {inp['size']} cm, {inp['weight']} g\n"
 
@@ -640,12 +768,12 @@ class ResultsWindow(QWidget):
 
                 history_output += "\n"
 
-            history_text.setPlainText(history_output)
+            self.history_text.setPlainText(history_output)
 
         except Exception as e:
-            history_text.setPlainText(f"❌ History loading error:\n{str(e)}")
-
-        history_layout.addWidget(history_text)
-        history_widget.setLayout(history_layout)
+            self.history_next = None
+            self.history_text.setPlainText(f"❌ History loading error:\n{str(e)}")
 
-        self.tab_widget.addTab(history_widget, "📜 History")
\ No newline at end of file
+        self.history_page_label.setText(f"Page {page}")
+        self.history_newer_btn.setEnabled(page > 1)
+        self.history_older_btn.setEnabled(self.history_next is not None)
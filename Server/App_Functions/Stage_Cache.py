@@ -0,0 +1,102 @@
+"""
+Кэш результатов этапов рабочего процесса.
+
+Ключ узла графа — sha256 от версий кода его клиентов (capabilities["version"]),
+хэша исходного набора данных и ключей узлов, от которых он зависит. Поэтому
+ключ меняется, если изменился код этапа, исходные данные или любой
+предшествующий этап, и остаётся прежним, если ничего из этого не менялось.
+
+Запись кэша — то, что узел изменил в основной таблице (его колонки или, если
+этап пишет "rows", всю таблицу), и хэши моделей, которые он сохранил
+(Model_Registry). Записи хранятся файлами pickle в CACHE_DIR, старые
+удаляются сверх MAX_ENTRIES.
+"""
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+
+import pandas as pd
+
+CACHE_DIR = Path("stage_cache")
+MAX_ENTRIES = 64
+
+
+def dataset_hash(df):
+    """Хэш содержимого таблицы: колонки, типы и значения по строкам (с индексом)"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode("utf-8"))
+    try:
+        rows = pd.util.hash_pandas_object(df, index=True).to_numpy()
+        digest.update(rows.tobytes())
+    except TypeError:
+        # Нехэшируемые значения (списки в ячейках) — хэш сериализованной таблицы
+        digest.update(pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL))
+    return digest.hexdigest()
+
+
+def node_key(versions, data_hash, dep_keys):
+    """
+    Ключ узла.
+
+    versions: [(имя клиента, уровень, версия кода)] в порядке выполнения
+    dep_keys: ключи узлов-зависимостей
+    """
+    payload = json.dumps({"stages": versions, "dataset": data_hash, "deps": sorted(dep_keys)})
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _entry_path(key):
+    return CACHE_DIR / f"{key}.pkl"
+
+
+def load(key):
+    """
+    Запись кэша по ключу.
+
+    Returns:
+        dict: {"table" или "columns": DataFrame, "artifacts": {name: hash}} или None
+    """
+    try:
+        with open(_entry_path(key), "rb") as f:
+            entry = pickle.load(f)
+        # Отметка использования для _prune; запись могли удалить одновременно — это промах
+        os.utime(_entry_path(key))
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    return entry
+
+
+def store(key, entry):
+    """Сохранение записи (атомарно: временный файл + os.replace)"""
+    CACHE_DIR.mkdir(exist_ok=True)
+    path = _entry_path(key)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    _prune()
+
+
+def _prune():
+    """Удаление давно не использованных записей сверх MAX_ENTRIES"""
+    # Узлы графа сохраняют записи одновременно: файл может исчезнуть между glob и stat
+    entries = []
+    for path in CACHE_DIR.glob("*.pkl"):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue
+    entries.sort(key=lambda item: item[0], reverse=True)
+    for _, path in entries[MAX_ENTRIES:]:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def clear():
+    """Удаление всех записей кэша"""
+    for path in CACHE_DIR.glob("*.pkl"):
+        path.unlink()
@@ -0,0 +1,196 @@
+"""
+Граф зависимостей этапов рабочего процесса.
+
+Плагин объявляет ресурсы, которые его do_work() читает (inputs) и пишет
+(outputs), — они приходят в рукопожатии:
+    "column:<колонка>" — колонка набора данных;
+    "model:<модель>"   — файл модели (Model_Registry);
+    "rows"             — состав и порядок строк (этап перемешивает или
+                         разбивает весь набор).
+Этап, который читает или пишет колонки, неявно читает "rows".
+
+Узел графа — последовательный уровень (все его клиенты) или один
+параллельный клиент. Узел зависит от узла меньшего уровня, если читает
+то, что тот пишет, пишет то, что тот читает, или пишет то же самое.
+Узел без объявлений зависит от всех узлов меньшего уровня, кроме случая,
+когда оба параллельные, — это прежний порядок «последовательные →
+параллельные → уровень 8».
+"""
+
+ROWS = "rows"
+COLUMN_PREFIX = "column:"
+
+
+class WorkflowNode:
+    """Узел графа: клиенты (addr, conn, name, level) одного режима и их ресурсы"""
+
+    def __init__(self, stages, mode, inputs=None, outputs=None):
+        self.stages = list(stages)
+        self.mode = mode
+        self.inputs = inputs      # set ресурсов или None — не объявлено
+        self.outputs = outputs
+        self.deps = set()
+        self.dependents = set()
+
+    @property
+    def level(self):
+        return self.stages[0][3]
+
+    @property
+    def declared(self):
+        return self.inputs is not None
+
+    @property
+    def name(self):
+        """Имена клиентов: уровни через стрелку, клиенты одного уровня через плюс"""
+        levels = []
+        for stage in self.stages:
+            if levels and levels[-1][0][3] == stage[3]:
+                levels[-1].append(stage)
+            else:
+                levels.append([stage])
+        return " → ".join("+".join(s[2] for s in workers) for workers in levels)
+
+    def add_resources(self, inputs, outputs):
+        """Объединение объявлений (узел без объявлений остаётся необъявленным)"""
+        if not self.declared or inputs is None:
+            self.inputs = self.outputs = None
+        else:
+            self.inputs |= inputs
+            self.outputs |= outputs
+
+    def reads(self):
+        if any(r.startswith(COLUMN_PREFIX) for r in self.inputs | self.outputs):
+            return self.inputs | {ROWS}
+        return set(self.inputs)
+
+    def __repr__(self):
+        return f"WorkflowNode({self.name!r}, {self.mode})"
+
+
+def declared_resources(capabilities):
+    """(inputs, outputs) из рукопожатия клиента или (None, None)"""
+    if "inputs" not in capabilities and "outputs" not in capabilities:
+        return None, None
+    return set(capabilities.get("inputs") or []), set(capabilities.get("outputs") or [])
+
+
+def build_nodes(clients):
+    """
+    Узлы графа из клиентов.
+
+    clients: список (addr, conn, name, level, mode, capabilities), отсортированный по уровню
+    """
+    nodes, sequential = [], {}
+    for addr, conn, name, level, mode, capabilities in clients:
+        stage = (addr, conn, name, level)
+        inputs, outputs = declared_resources(capabilities)
+        if mode == "Sequential" and level in sequential:
+            sequential[level].stages.append(stage)
+            sequential[level].add_resources(inputs, outputs)
+            continue
+        node = WorkflowNode([stage], mode, inputs, outputs)
+        if mode == "Sequential":
+            sequential[level] = node
+        nodes.append(node)
+    return nodes
+
+
+def _conflicts(node, earlier):
+    """Должен ли node ждать узел earlier меньшего уровня"""
+    if not node.declared or not earlier.declared:
+        return not (node.mode == earlier.mode == "Parallel")
+    return bool(node.reads() & earlier.outputs
+                or node.outputs & earlier.reads()
+                or node.outputs & earlier.outputs)
+
+
+def _ancestors(node, cache):
+    if node not in cache:
+        result = set()
+        for dep in node.deps:
+            result.add(dep)
+            result |= _ancestors(dep, cache)
+        cache[node] = result
+    return cache[node]
+
+
+def build_graph(nodes):
+    """
+    Рёбра графа по объявленным ресурсам.
+
+    Лишние рёбра (A → C при пути A → B → C) удаляются, чтобы в графе
+    оставались только непосредственные зависимости.
+    """
+    for node in nodes:
+        node.deps = {other for other in nodes if other.level < node.level and _conflicts(node, other)}
+
+    cache = {}
+    reduced = {}
+    for node in nodes:
+        indirect = set()
+        for dep in node.deps:
+            indirect |= _ancestors(dep, cache)
+        reduced[node] = node.deps - indirect
+    for node in nodes:
+        node.deps = reduced[node]
+        node.dependents = set()
+    for node in nodes:
+        for dep in node.deps:
+            dep.dependents.add(node)
+    return nodes
+
+
+def merge_chains(nodes):
+    """
+    Слияние цепочек последовательных узлов в один узел.
+
+    Если у последовательного узла B единственная зависимость — последовательный
+    узел A, а у A единственный зависимый — B, они выполняются одним узлом
+    (и к ним применяются слияние в процесс и конвейер).
+    """
+    nodes = sorted(nodes, key=lambda n: n.level)
+    merged = True
+    while merged:
+        merged = False
+        for node in nodes:
+            if node.mode != "Sequential" or len(node.deps) != 1:
+                continue
+            (dep,) = node.deps
+            if dep.mode != "Sequential" or len(dep.dependents) != 1:
+                continue
+            dep.stages.extend(node.stages)
+            dep.add_resources(node.inputs, node.outputs)
+            dep.dependents = node.dependents
+            for child in node.dependents:
+                child.deps.discard(node)
+                child.deps.add(dep)
+            nodes.remove(node)
+            merged = True
+            break
+    return nodes
+
+
+def critical_path(nodes, timings):
+    """
+    Критический путь выполнения по времени.
+
+    timings: {узел: (начало, конец)} для выполненных узлов.
+    Путь строится от узла, закончившегося последним, назад через
+    зависимость, которая завершилась позже остальных.
+
+    Returns:
+        list: узлы пути в порядке выполнения
+    """
+    finished = [n for n in nodes if n in timings]
+    if not finished:
+        return []
+    node = max(finished, key=lambda n: timings[n][1])
+    path = [node]
+    while True:
+        deps = [d for d in node.deps if d in timings]
+        if not deps:
+            break
+        node = max(deps, key=lambda d: timings[d][1])
+        path.append(node)
+    return path[::-1]
@@ -1,169 +1,758 @@
+import os
+import sys
+import queue
 import threading
 import time
 import socket
+from contextlib import nullcontext
 import pandas as pd
-import io
 from datetime import datetime
 from pathlib import Path
 
-# Глобальные переменные для работы с данными
-current_csv_data = None
-current_csv_file = None
+# Общие модули протокола лежат рядом с шаблоном клиента
+CLIENT_TEMPLATE_DIR = Path(__file__).resolve().parents[2] / "Client" / "Client_Template"
+if str(CLIENT_TEMPLATE_DIR) not in sys.path:
+    sys.path.append(str(CLIENT_TEMPLATE_DIR))
+
+import Transfer_Format
+import Receive_Buffer
+import Compression
+import Core_Budget
+
+# Основная таблица (с версией и кэшем сериализованных форм) общая с CSV_Manager
+from . import CSV_Manager
+from . import Workflow_Graph
+from . import Stage_Cache
+
+# Типы ответов, которые сервер принимает от клиентов
+ACCEPTED_RESULTS = ["return_file", "return_columns"]
+
+# Потоковый режим: размер части набора данных, передаваемой по конвейеру
+STREAM_CHUNK_ROWS = 2000
+
+# Подряд идущие последовательные уровни на одном хосте выполняются в процессе
+# первого клиента (Client_Template.run_fused): одна передача вместо нескольких
+FUSE_LOCAL_STAGES = True
+
+# Узлы, у которых не изменились код, исходные данные и предшествующие узлы,
+# берут результат из кэша этапов (Stage_Cache) и не выполняются
+STAGE_CACHE_ENABLED = True
+
+# Ядра хоста делятся между одновременно запущенными на нём узлами:
+# клиент получает свою долю в work_request ("cores") и не занимает больше
+CORE_BUDGET_ENABLED = True
 
 RECEIVED_DIR = Path("received_from_clients")
 RECEIVED_DIR.mkdir(exist_ok=True)
 
 
+class _PipelineStage:
+    """Общее состояние клиентов одного уровня в конвейере"""
+    
+    def __init__(self, workers, total):
+        self.workers = workers
+        self.total = total
+        self.alive = len(workers)
+        self.done = 0
+        self.processed = {}
+        self.updated = False
+        self.failed = False     # не осталось живых клиентов: часть строк не обработана
+        self.lock = threading.Lock()
+    
+    def chunk_processed(self, addr):
+        with self.lock:
+            self.processed[addr] = self.processed.get(addr, 0) + 1
+            self.updated = True
+    
+    def chunk_done(self):
+        """True для последней части этапа"""
+        with self.lock:
+            self.done += 1
+            return self.done == self.total
+    
+    def worker_failed(self):
+        """True, если другие клиенты уровня ещё работают и возьмут части на себя"""
+        with self.lock:
+            self.alive -= 1
+            if self.alive == 0:
+                self.failed = True
+            return self.alive > 0
+
+
 class WorkflowManager:
     """Управление рабочим процессом обработки данных клиентами"""
     
     def __init__(self, clients_dict, send_file_func, receive_file_func, 
-                 send_message_func, update_callback=None, results_callback=None):
+                 send_message_func, borrow_func=None, capabilities_dict=None,
+                 update_callback=None, results_callback=None):
         self.clients = clients_dict
+        self.capabilities = capabilities_dict if capabilities_dict is not None else {}
         self.send_file = send_file_func
         self.receive_file = receive_file_func
         self.send_message = send_message_func
+        self.borrow = borrow_func
         self.update_callback = update_callback
         self.results_callback = results_callback
+        self._artifacts = {}      # addr -> {модель: хэш} из последнего ответа клиента
+        self._cached = set()      # узлы последнего запуска, взятые из кэша
+        self._budgets = {}        # addr -> ядра, выделенные клиенту на текущий этап
+    
+    def _borrow(self, addr, conn):
+        """Захват сокета клиента у цикла событий сервера на время обмена"""
+        if self.borrow is None:
+            return nullcontext(conn)
+        return self.borrow(addr)
+    
+    def _choose_codec(self, addr, size):
+        """Кодек сжатия для передачи size байт клиенту addr (None — без сжатия)"""
+        host = addr[0] if isinstance(addr, tuple) else None
+        return Compression.choose_codec(self.capabilities.get(addr, {}).get("codecs"), size, host)
+    
+    def _send_work_request(self, conn, addr, extra_header=None):
+        """
+        Запрос work_request: текущие данные в лучшем формате, который
+        поддерживает клиент, в теле сообщения (сжатом, если оно большое
+        и у клиента есть общий с сервером кодек)
+        """
+        fmt = Transfer_Format.choose_format(self.capabilities.get(addr, {}).get("formats"))
+        request = {"action": "work_request", "accepts": ACCEPTED_RESULTS,
+                   "codecs": Compression.available_codecs()}
+        if self._budgets.get(addr):
+            request["cores"] = self._budgets[addr]
+        request.update(extra_header or {})
+        
+        if fmt == Transfer_Format.FORMAT_CSV:
+            path = CSV_Manager.materialize_csv_file()
+            codec = self._choose_codec(addr, os.path.getsize(path))
+            return self.send_file(conn, path, request, codec=codec)
         
-        global current_csv_data, current_csv_file
-        self.csv_data = current_csv_data
-        self.csv_file = current_csv_file
+        data, fmt = CSV_Manager.get_encoded(fmt)
+        filename = Path(CSV_Manager.get_current_csv_file()).stem + Transfer_Format.FILE_EXTENSIONS[fmt]
+        header = dict(request, filename=filename, format=fmt, size=len(data))
+        codec = self._choose_codec(addr, len(data))
+        self.send_message(conn, header, data, codec=codec)
+        print(f"[-->] Sent {fmt} dataset {filename} ({len(data)} bytes{', ' + codec if codec else ''})")
+        return True
+    
+    def _exchange_work(self, conn, addr, name, extra_header=None):
+        """
+        Один обмен work_request → work_result.
+        
+        Returns:
+            tuple: (header, data) ответа; текст результата — в header["status"]
+        """
+        self._send_work_request(conn, addr, extra_header)
+        
+        header, data = self.receive_file(conn)
+        if not header or header.get("action") != "work_result":
+            raise ConnectionError(f"Unexpected reply from {name}: {header}")
+        if header.get("artifacts"):
+            self._artifacts[addr] = header["artifacts"]
+        
+        print(f"[✓] {name}: {header.get('status')}")
+        return header, data
     
     def start_workflow(self):
         """Запуск полного рабочего процесса в отдельном потоке"""
         threading.Thread(target=self._run_workflow, daemon=True).start()
     
     def _run_workflow(self):
-        """Основной рабочий процесс"""
-        global current_csv_data, current_csv_file
+        """
+        Основной рабочий процесс: граф этапов по объявленным ресурсам плагинов.
+        
+        Каждый узел запускается, как только завершились его зависимости
+        (например, валидация — сразу после своего обучения).
+        """
+        if not _has_data():
+            print("[!] ERROR: CSV data not loaded!")
+            return
         
         sorted_clients = sorted(self.clients.items(), key=lambda item: item[1][2])
-        modes = set(client[3] for client in self.clients.values())
-        
-        has_sequential = "Sequential" in modes
-        has_parallel = "Parallel" in modes
-        
-        # Шаг 1: Последовательные клиенты (БЕЗ Prediction_Client - уровень 8)
-        if has_sequential:
-            print("\n" + "="*70)
-            print("[STAGE 1] Starting sequential clients...")
-            print("="*70)
-            self._run_sequential(sorted_clients, exclude_level=8)
-            print("\n" + "="*70)
-            print("[STAGE 1] ✅ Sequential clients completed!")
-            print("="*70 + "\n")
-        
-        # Шаг 2: Параллельные клиенты
-        if has_parallel:
-            print("\n" + "="*70)
-            print("[STAGE 2] Starting parallel clients...")
-            print("="*70)
-            self._run_parallel(sorted_clients)
-            print("\n" + "="*70)
-            print("[STAGE 2] ✅ Parallel clients completed!")
-            print("="*70 + "\n")
-        
-        # Шаг 3: Prediction_Client (ПОСЛЕ обучения моделей - только уровень 8)
-        if has_sequential:
-            print("\n" + "="*70)
-            print("[STAGE 3] Starting Prediction Client...")
-            print("="*70)
-            self._run_sequential(sorted_clients, only_level=8)
-            print("\n" + "="*70)
-            print("[STAGE 3] ✅ Prediction Client completed!")
-            print("="*70 + "\n")
-        
-        # Шаг 4: Сохранение финального результата
+        nodes = self._build_graph(sorted_clients)
+        
+        print("\n" + "="*70)
+        print(f"[DAG] Running {len(nodes)} nodes...")
+        print("="*70)
+        for node in nodes:
+            deps = ", ".join(dep.name for dep in node.deps) or "-"
+            print(f"[DAG] {node.name} ({node.mode}) <- {deps}")
+        
+        keys = None
+        if STAGE_CACHE_ENABLED:
+            keys = self._stage_keys(nodes, Stage_Cache.dataset_hash(get_current_dataframe()))
+        self._run_graph(nodes, keys)
+        
+        # Сохранение финального результата
         self._save_final_results()
     
-    def _run_sequential(self, sorted_clients, exclude_level=None, only_level=None):
-        """Последовательная обработка клиентами"""
-        global current_csv_data, current_csv_file
+    def _build_graph(self, sorted_clients):
+        """Граф узлов рабочего процесса из подключённых клиентов (Workflow_Graph)"""
+        clients = [(addr, conn, name, level, mode, self.capabilities.get(addr, {}))
+                   for addr, (conn, name, level, mode) in sorted_clients]
+        nodes = Workflow_Graph.build_nodes(clients)
+        return Workflow_Graph.merge_chains(Workflow_Graph.build_graph(nodes))
+    
+    def _stage_keys(self, nodes, data_hash):
+        """
+        Ключи кэша узлов (Stage_Cache.node_key).
         
-        print("[MODE] Sequential")
+        Узел без объявленных ресурсов, с клиентом без версии кода или без
+        кэша (capabilities["cacheable"], например запись истории предсказаний),
+        а также зависящий от такого узла ключа не получает (None) и всегда выполняется.
+        """
+        keys = {}
+        for node in sorted(nodes, key=lambda n: n.level):
+            caps = [self.capabilities.get(addr, {}) for addr, _, _, _ in node.stages]
+            versions = [[name, level, c.get("version")] for (_, _, name, level), c in zip(node.stages, caps)]
+            uncacheable = any(not c.get("cacheable", True) for c in caps)
+            dep_keys = [keys.get(dep) for dep in node.deps]
+            if not node.declared or uncacheable or any(v[2] is None for v in versions) or None in dep_keys:
+                keys[node] = None
+            else:
+                keys[node] = Stage_Cache.node_key(versions, data_hash, dep_keys)
+        return keys
+    
+    def _run_graph(self, nodes, keys=None):
+        """
+        Выполнение графа: готовые узлы работают одновременно в своих потоках.
         
-        if current_csv_data is None:
-            print("[!] ERROR: CSV data not loaded!")
-            return
+        Если узел не выполнился, зависящие от него узлы пропускаются
+        (валидация не читает устаревшую модель). Узлы, стартующие вместе,
+        делят свободные ядра своего хоста (_grant_cores).
         
-        last_client_name = None
+        Returns:
+            dict: {узел: (начало, конец)} в секундах от старта графа
+        """
+        started = time.perf_counter()
+        done = queue.Queue()
+        waiting = {node: set(node.deps) for node in nodes}
+        failed, timings = set(), {}
+        keys = keys or {}
+        self._cached = set()
+        ledger = Core_Budget.CoreLedger(self._host_cores()) if CORE_BUDGET_ENABLED else None
+        grants = {}
         
-        for addr, (conn, name, level, mode) in sorted_clients:
-            if mode != "Sequential":
-                continue
+        def run(node):
+            t0 = time.perf_counter() - started
+            try:
+                ok = self._run_node_cached(node, keys.get(node))
+            except Exception as e:
+                print(f"[!] Error in {node.name}: {e}")
+                ok = False
+            done.put((node, ok, t0, time.perf_counter() - started))
+        
+        def launch(ready):
+            if ledger is not None:
+                grants.update(self._grant_cores(ledger, ready))
+            for node in ready:
+                threading.Thread(target=run, args=(node,), daemon=True).start()
+            return len(ready)
+        
+        running = launch([node for node in nodes if not node.deps])
+        
+        while running:
+            node, ok, t0, t1 = done.get()
+            running -= 1
+            timings[node] = (t0, t1)
+            for host, cores in grants.pop(node, {}).items():
+                ledger.release(host, cores)
+            for addr, _, _, _ in node.stages:
+                self._budgets.pop(addr, None)
             
-            # Фильтрация по уровню
-            if exclude_level is not None and level == exclude_level:
+            ready, finished = [], [(node, ok)]
+            while finished:
+                node, ok = finished.pop()
+                if not ok:
+                    failed.add(node)
+                for child in node.dependents:
+                    waiting[child].discard(node)
+                    if waiting[child]:
+                        continue
+                    if failed & child.deps:
+                        print(f"[DAG] Skipping {child.name}: dependency failed")
+                        finished.append((child, False))
+                    else:
+                        ready.append(child)
+            running += launch(ready)
+        
+        self._log_timings(nodes, timings, failed)
+        return timings
+    
+    def _host_cores(self):
+        """{хост: ядра} по рукопожатиям клиентов (capabilities["host"], ["cores"])"""
+        cores = {}
+        for caps in self.capabilities.values():
+            host = caps.get("host")
+            if host and caps.get("cores"):
+                cores[host] = max(cores.get(host, 0), int(caps["cores"]))
+        return cores
+    
+    def _grant_cores(self, ledger, ready):
+        """
+        Доли ядер для узлов, стартующих одновременно.
+        
+        Свободные ядра каждого хоста делятся поровну между узлами из ready,
+        у которых есть клиенты на этом хосте. Доля записывается для клиентов
+        узла (self._budgets) и уходит им в work_request.
+        
+        Returns:
+            dict: {узел: {хост: ядра}} — вернуть в ledger по завершении узла
+        """
+        hosts = {node: {self.capabilities.get(addr, {}).get("host") for addr, _, _, _ in node.stages}
+                 for node in ready}
+        sharing = {}
+        for node_hosts in hosts.values():
+            for host in node_hosts:
+                sharing[host] = sharing.get(host, 0) + 1
+        
+        grants = {}
+        for node in ready:
+            granted = {}
+            for host in hosts[node]:
+                cores = ledger.acquire(host, sharing[host])
+                sharing[host] -= 1
+                if cores is not None:
+                    granted[host] = cores
+            for addr, _, _, _ in node.stages:
+                host = self.capabilities.get(addr, {}).get("host")
+                if host in granted:
+                    self._budgets[addr] = granted[host]
+            if granted:
+                print(f"[CORES] {node.name}: " + ", ".join(f"{c} core(s) on {h}" for h, c in granted.items()))
+            grants[node] = granted
+        return grants
+    
+    def _run_node_cached(self, node, key):
+        """
+        Узел графа через кэш этапов: если запись с ключом key есть и модели
+        этой записи удалось вернуть клиенту, результат узла применяется из
+        кэша; иначе узел выполняется, и его результат сохраняется.
+        """
+        if key is None:
+            return self._run_node(node)
+        
+        entry = Stage_Cache.load(key)
+        if entry is not None and self._restore_artifacts(node, entry["artifacts"]):
+            if "table" in entry:
+                CSV_Manager.set_dataframe(entry["table"])
+            elif len(entry["columns"].columns):
+                CSV_Manager.apply_columns(entry["columns"])
+            self._cached.add(node)
+            print(f"[CACHE] {node.name}: unchanged, result taken from cache")
+            return True
+        
+        for addr, _, _, _ in node.stages:
+            self._artifacts.pop(addr, None)
+        if not self._run_node(node):
+            return False
+        
+        artifacts = {}
+        for addr, _, name, _ in node.stages:
+            if addr in self._artifacts:
+                artifacts[name] = self._artifacts.pop(addr)
+        try:
+            Stage_Cache.store(key, dict(_node_outputs(node), artifacts=artifacts))
+        except Exception as e:
+            # Узел уже выполнен: без записи в кэше он просто выполнится в следующий раз
+            print(f"[!] Could not cache {node.name}: {e}")
+        return True
+    
+    def _restore_artifacts(self, node, artifacts):
+        """
+        Возврат клиентам моделей из записи кэша (Model_Registry.restore_model).
+        
+        artifacts: {имя клиента: {модель: хэш}}
+        
+        Returns:
+            bool: True, если все модели восстановлены
+        """
+        stages = {name: (addr, conn) for addr, conn, name, _ in node.stages}
+        for name, models in artifacts.items():
+            if name not in stages or not self.capabilities.get(stages[name][0], {}).get("restore"):
+                return False
+            addr, conn = stages[name]
+            try:
+                with self._borrow(addr, conn) as conn:
+                    conn.settimeout(60)
+                    self.send_message(conn, {"action": "restore_artifacts", "artifacts": models,
+                                             "size": 0}, b"")
+                    header, _ = self.receive_file(conn)
+                    conn.settimeout(None)
+            except (OSError, ConnectionError) as e:
+                print(f"[!] Could not restore models of {name}: {e}")
+                return False
+            if not header or not header.get("restored"):
+                return False
+        return True
+    
+    def _run_node(self, node):
+        """
+        Один узел графа.
+        
+        Returns:
+            bool: True, если узел выполнен успешно
+        """
+        if node.mode == "Parallel":
+            addr, conn, name, level = node.stages[0]
+            if addr not in self.clients:
+                print(f"[!] Client {name} disconnected, skipping")
+                return False
+            return self._process_parallel_client(conn, name, level, addr)
+        
+        last_client_name, ok = self._run_stage_groups(node.stages)
+        if ok and any(child.mode == "Parallel" for child in node.dependents):
+            self._verify_sequential_results(last_client_name, None)
+        return ok
+    
+    def _log_timings(self, nodes, timings, failed):
+        """Время узлов и критический путь выполнения"""
+        path = Workflow_Graph.critical_path(nodes, timings)
+        print("\n" + "="*70)
+        print("[DAG] Timeline (s):")
+        for node in sorted(timings, key=lambda n: timings[n]):
+            t0, t1 = timings[node]
+            mark = "*" if node in path else " "
+            status = " FAILED" if node in failed else " CACHED" if node in self._cached else ""
+            print(f"  {mark} {t0:7.2f} → {t1:7.2f} ({t1 - t0:6.2f}) {node.name}{status}")
+        if path:
+            wall = max(t1 for _, t1 in timings.values())
+            print(f"[DAG] Critical path: {' ⇒ '.join(n.name for n in path)} "
+                  f"({timings[path[-1]][1] - timings[path[0]][0]:.2f}s of {wall:.2f}s)")
+        print("="*70 + "\n")
+    
+    def _run_stage_groups(self, stages):
+        """
+        Последовательные этапы по порядку уровней.
+        
+        Уровни на одном хосте сливаются в один процесс, потоковые уровни работают
+        конвейером и делят строки между клиентами уровня, остальные клиенты — барьеры.
+        
+        Returns:
+            tuple: (имя последнего клиента, обновившего данные; True, если все этапы выполнены)
+        """
+        last_client_name = None
+        ok = True
+        for kind, group in self._group_stages(stages):
+            if kind == "fused":
+                if self._run_fused(group):
+                    last_client_name = group[-1][2]
+                else:
+                    ok = False
                 continue
-            if only_level is not None and level != only_level:
+            if kind == "pipeline":
+                if self._run_pipeline(group):
+                    last_client_name = group[-1][-1][2]
+                else:
+                    ok = False
                 continue
             
+            addr, conn, name, level = group
             if addr not in self.clients:
                 print(f"[!] Client {name} disconnected, skipping")
+                ok = False
                 continue
             
-            try:
-                print(f"\n[→] Sending file to client {name} (Lvl {level})")
-                
+            if self._run_sequential_client(addr, conn, name, level):
+                last_client_name = name
+            else:
+                ok = False
+        return last_client_name, ok
+    
+    def _run_sequential_client(self, addr, conn, name, level, extra_header=None):
+        """
+        Полная обработка набора данных одним последовательным клиентом.
+        
+        Returns:
+            bool: True, если клиент обновил данные
+        """
+        try:
+            print(f"\n[→] Sending file to client {name} (Lvl {level})")
+            
+            with self._borrow(addr, conn) as conn:
                 conn.settimeout(180)
+                header, data = self._exchange_work(conn, addr, name, extra_header)
+                conn.settimeout(None)
+            
+            result = header.get("result")
+            if result == "return_file":
+                fmt = header.get("format", Transfer_Format.FORMAT_CSV)
+                if fmt == Transfer_Format.FORMAT_CSV:
+                    # Сохраняем обновленный CSV
+                    _replace_data(csv_bytes=data)
+                else:
+                    # Бинарный результат: CSV создаётся только при необходимости
+                    df = Transfer_Format.decode_dataframe(Receive_Buffer.payload_source(data), fmt)
+                    Receive_Buffer.release_payload(data)
+                    _replace_data(df=df)
                 
-                # Отправляем файл
-                self.send_file(conn, current_csv_file)
-                time.sleep(0.5)
-                
-                # Команда на работу
-                conn.send("WORK".encode('utf-8'))
-                
-                # Получаем результат
-                result = conn.recv(4096).decode('utf-8')
-                print(f"[✓] {name}: {result}")
-                
-                # Получаем обработанный файл обратно
-                header, data = self.receive_file(conn)
+                print(f"[✓] Updated file received from {name}")
+                return True
+            
+            elif result == "no_update":
+                print(f"[!] {name} did not update data (NO_UPDATE)")
+            
+            elif result == "return_columns":
+                # Клиент вернул только новые/изменённые колонки
+                _apply_column_patch(header, data)
+                print(f"[✓] Columns {header.get('columns')} merged from {name} ({len(data)} bytes)")
+                return True
+            
+        except socket.timeout:
+            print(f"[!] Timeout while working with client {name}")
+        except Exception as e:
+            print(f"[!] Error while working with client {name}: {e}")
+            import traceback
+            traceback.print_exc()
+        return False
+    
+    def _group_stages(self, stages):
+        """
+        Группы выполнения: сначала слияние уровней на одном хосте
+        (_group_fused_stages), остальные этапы — по _group_streaming_stages.
+        """
+        groups = []
+        for kind, group in self._group_fused_stages(stages):
+            if kind == "fused":
+                groups.append((kind, group))
+            else:
+                groups.extend(self._group_streaming_stages(group))
+        return groups
+    
+    def _group_fused_stages(self, stages):
+        """
+        Поиск подряд идущих уровней, которые можно выполнить в одном процессе.
+        
+        Уровень сливается, если на нём ровно один клиент, клиент сообщил путь
+        к файлу плагина и находится на том же хосте (IP), что и предыдущий.
+        
+        Returns:
+            list: группы ("fused", [этапы]) и ("rest", [этапы]) в порядке уровней
+        """
+        levels = []
+        for stage in stages:
+            if levels and levels[-1][0][3] == stage[3]:
+                levels[-1].append(stage)
+            else:
+                levels.append([stage])
+        
+        def fusable(workers):
+            return (FUSE_LOCAL_STAGES and len(workers) == 1
+                    and bool(self.capabilities.get(workers[0][0], {}).get("plugin")))
+        
+        runs = []
+        for workers in levels:
+            if (fusable(workers) and runs and runs[-1][0] == "fused"
+                    and runs[-1][1][-1][0][0] == workers[0][0][0]):
+                runs[-1][1].append(workers[0])
+            elif fusable(workers):
+                runs.append(("fused", [workers[0]]))
+            else:
+                runs.append(("rest", workers))
+        
+        # Один уровень сливать не с чем; соседние "rest" объединяются
+        groups = []
+        for kind, group in runs:
+            if kind == "fused" and len(group) < 2:
+                kind = "rest"
+            if kind == "rest" and groups and groups[-1][0] == "rest":
+                groups[-1][1].extend(group)
+            else:
+                groups.append((kind, list(group)))
+        return groups
+    
+    def _run_fused(self, stages):
+        """
+        Слитые этапы: первый клиент получает набор один раз и выполняет
+        do_work() остальных плагинов в своём процессе.
+        
+        Returns:
+            bool: True, если данные обновлены
+        """
+        addr, conn, name, level = stages[0]
+        rest = stages[1:]
+        if addr not in self.clients:
+            print(f"[!] Client {name} disconnected, skipping")
+            return False
+        
+        print(f"\n[FUSED] {' → '.join(s[2] for s in stages)} in the process of {name}")
+        plugins = [self.capabilities[s[0]]["plugin"] for s in rest]
+        if not self._run_sequential_client(addr, conn, name, level, {"fuse": plugins}):
+            return False
+        for _, _, fused_name, fused_level in rest:
+            print(f"[✓] {fused_name} (Lvl {fused_level}): fused into {name}")
+        return True
+    
+    def _group_streaming_stages(self, stages):
+        """
+        Разбиение этапов на группы для выполнения.
+        
+        Клиенты одного уровня — это один этап: если все они потоковые, они делят
+        строки между собой (шарды). Подряд идущие потоковые уровни объединяются
+        в один конвейер; непотоковые клиенты остаются барьерами и получают
+        весь набор по очереди.
+        
+        Returns:
+            list: группы вида ("pipeline", [[клиенты уровня], ...]) или ("single", клиент)
+        """
+        levels = []
+        for stage in stages:
+            if levels and levels[-1][0][3] == stage[3]:
+                levels[-1].append(stage)
+            else:
+                levels.append([stage])
+        
+        groups = []
+        for workers in levels:
+            streaming = all(self.capabilities.get(w[0], {}).get("streaming", False) for w in workers)
+            if not streaming:
+                groups.extend(("single", worker) for worker in workers)
+            elif groups and groups[-1][0] == "pipeline":
+                groups[-1][1].append(workers)
+            else:
+                groups.append(("pipeline", [workers]))
+        
+        # Один потоковый клиент без соседей быстрее обработает весь набор сразу
+        return [("single", group[1][0][0])
+                if group[0] == "pipeline" and len(group[1]) == 1 and len(group[1][0]) == 1
+                else group for group in groups]
+    
+    def _run_pipeline(self, stages):
+        """
+        Конвейер потоковых этапов: набор делится на части по STREAM_CHUNK_ROWS
+        строк, и каждая обработанная часть сразу передаётся следующему этапу.
+        Клиенты одного уровня берут части из общей очереди, поэтому этап
+        масштабируется числом клиентов, а общее время приближается ко времени
+        самого медленного этапа. Порядок строк восстанавливается по номеру части.
+        
+        Returns:
+            bool: True, если данные были обновлены; False также, если на каком-то
+            уровне не осталось живых клиентов — тогда набор не заменяется
+        """
+        df = get_current_dataframe()
+        if df is None or len(df) == 0:
+            return False
+        chunks = [df.iloc[i:i + STREAM_CHUNK_ROWS] for i in range(0, len(df), STREAM_CHUNK_ROWS)]
+        names = " → ".join("+".join(w[2] for w in workers) for workers in stages)
+        print(f"\n[→] Pipeline {names}: {len(df)} rows in {len(chunks)} chunks")
+        
+        queues = [queue.Queue() for _ in range(len(stages) + 1)]
+        states = [_PipelineStage(workers, len(chunks)) for workers in stages]
+        started = time.perf_counter()
+        
+        threads = []
+        for i, state in enumerate(states):
+            for worker in state.workers:
+                t = threading.Thread(
+                    target=self._pipeline_worker,
+                    args=(worker, state, queues[i], queues[i + 1]),
+                    daemon=True
+                )
+                threads.append(t)
+                t.start()
+        
+        for seq, chunk in enumerate(chunks):
+            queues[0].put((seq, chunk))
+        
+        results = [queues[-1].get() for _ in chunks]
+        
+        for t in threads:
+            t.join()
+        
+        lost = [state for state in states if state.failed]
+        if lost:
+            # Часть строк прошла уровень без обработки — такой набор не сохраняется
+            print(f"[!] Pipeline {names} failed: no clients left on Lvl "
+                  f"{', '.join(str(state.workers[0][3]) for state in lost)}")
+            return False
+        if not any(state.updated for state in states):
+            return False
+        
+        results.sort(key=lambda item: item[0])
+        _replace_data(df=pd.concat([chunk for _, chunk in results]))
+        
+        for state in states:
+            counts = ", ".join(f"{w[2]}={state.processed.get(w[0], 0)}" for w in state.workers)
+            print(f"[✓] Lvl {state.workers[0][3]} chunks: {counts}")
+        print(f"[✓] Pipeline {names} completed in {time.perf_counter() - started:.2f}s")
+        return True
+    
+    def _pipeline_worker(self, worker, state, in_queue, out_queue):
+        """
+        Один клиент этапа конвейера: части берутся из in_queue, обрабатываются
+        и передаются в out_queue. Часть, на которой клиент упал, возвращается
+        в очередь для остальных клиентов уровня; если живых клиентов не осталось,
+        части проходят дальше без изменений, а этап отмечается как failed.
+        """
+        addr, conn, name, level = worker
+        fmt = Transfer_Format.choose_format(self.capabilities.get(addr, {}).get("formats"))
+        failed = addr not in self.clients
+        if failed:
+            print(f"[!] Client {name} disconnected, skipping")
+            if state.worker_failed():
+                return
+        
+        with (nullcontext(conn) if failed else self._borrow(addr, conn)) as conn:
+            if not failed:
+                conn.settimeout(180)
+            
+            while True:
+                item = in_queue.get()
+                if item is None:
+                    break
+                seq, chunk = item
                 
-                if header and header.get("action") == "return_file":
-                    filename = header.get("filename", "")
-                    
-                    # Проверяем, что это не NO_UPDATE
-                    if filename != "no_update.txt" and len(data) > 100:
-                        # Сохраняем обновленный CSV
-                        with open(current_csv_file, 'wb') as f:
-                            f.write(data)
-                        
-                        current_csv_data = data.decode('utf-8')
-                        self.csv_data = current_csv_data
-                        self.csv_file = current_csv_file
-                        last_client_name = name
-                        print(f"[✓] Updated file received from {name}")
-                    else:
-                        print(f"[!] {name} did not update data (NO_UPDATE)")
+                if not failed:
+                    try:
+                        chunk = self._process_chunk(conn, addr, fmt, seq, chunk)
+                        state.chunk_processed(addr)
+                    except Exception as e:
+                        print(f"[!] Error while streaming to client {name}: {e}")
+                        failed = True
+                        if state.worker_failed():
+                            in_queue.put(item)
+                            break
                 
+                out_queue.put((seq, chunk))
+                if state.chunk_done():
+                    # Все части этапа готовы — будим остальных клиентов уровня
+                    for _ in state.workers:
+                        in_queue.put(None)
+            
+            if addr in self.clients:
                 conn.settimeout(None)
-                
-            except socket.timeout:
-                print(f"[!] Timeout while working with client {name}")
-                try:
-                    conn.settimeout(None)
-                except:
-                    pass
-            except Exception as e:
-                print(f"[!] Error while working with client {name}: {e}")
-                import traceback
-                traceback.print_exc()
-                try:
-                    conn.settimeout(None)
-                except:
-                    pass
         
-        # Проверяем результат
-        if current_csv_data and last_client_name:
-            self._verify_sequential_results(current_csv_data, last_client_name, only_level)
+        if not failed:
+            print(f"[✓] {name} (Lvl {level}) processed {state.processed.get(addr, 0)} chunks")
+    
+    def _process_chunk(self, conn, addr, fmt, seq, chunk):
+        """Отправка одной части клиенту и слияние ответа с этой частью"""
+        data, fmt = Transfer_Format.encode_column_patch(chunk, fmt)
+        header = {
+            "action": "work_request",
+            "seq": seq,
+            "format": fmt,
+            "accepts": ACCEPTED_RESULTS,
+            "codecs": Compression.available_codecs(),
+            "size": len(data)
+        }
+        if self._budgets.get(addr):
+            header["cores"] = self._budgets[addr]
+        self.send_message(conn, header, data, codec=self._choose_codec(addr, len(data)))
+        
+        header, data = self.receive_file(conn)
+        if not header or header.get("action") != "work_result" or header.get("seq") != seq:
+            raise ConnectionError(f"Unexpected reply for chunk {seq}: {header}")
+        if not data:
+            raise RuntimeError(header.get("status", "empty chunk result"))
+        
+        patch = Transfer_Format.decode_column_patch(Receive_Buffer.payload_source(data), header["format"])
+        Receive_Buffer.release_payload(data)
+        return _merge_columns(chunk.copy(deep=False), patch)
     
-    def _verify_sequential_results(self, csv_data, last_client_name, only_level):
+    def _verify_sequential_results(self, last_client_name, only_level):
         """Проверка результатов последовательной обработки"""
         try:
-            df = pd.read_csv(io.StringIO(csv_data))
+            df = get_current_dataframe()
             print(f"\n[✓✓✓] Sequential processing completed!")
             print(f"[INFO] Rows processed: {len(df)}, Columns: {len(df.columns)}")
             print(f"[INFO] Last processor: {last_client_name}")
@@ -180,98 +769,64 @@ class WorkflowManager:
         except Exception as e:
             print(f"[!] Error verifying data: {e}")
     
-    def _run_parallel(self, sorted_clients):
-        """Параллельная обработка клиентами"""
-        global current_csv_data, current_csv_file
-        
-        print("[MODE] Parallel")
-        
-        if current_csv_data is None:
-            print("[!] ERROR: CSV data not loaded!")
-            return
-        
-        threads = []
-        for addr, (conn, name, level, mode) in sorted_clients:
-            if mode != "Parallel":
-                continue
-            if addr not in self.clients:
-                print(f"[!] Client {name} disconnected, skipping")
-                continue
-            
-            t = threading.Thread(
-                target=self._process_parallel_client,
-                args=(conn, name, level, addr),
-                daemon=True
-            )
-            threads.append(t)
-            t.start()
-        
-        for t in threads:
-            t.join()
-    
     def _process_parallel_client(self, conn, name, level, addr):
-        """Обработка одного параллельного клиента"""
-        global current_csv_file
+        """
+        Обработка одного параллельного клиента.
         
+        Returns:
+            bool: True, если клиент вернул результат
+        """
         try:
             print(f"\n[→] Sending file to client {name} (Lvl {level})")
             
-            conn.settimeout(180)
-            
-            # Отправляем файл
-            self.send_file(conn, current_csv_file)
-            time.sleep(0.5)
-            
-            # Команда на работу
-            conn.send("WORK".encode('utf-8'))
-            
-            # Получаем результат
-            result = conn.recv(4096).decode('utf-8')
-            print(f"[✓] {name}: {result}")
-            
-            # Получаем обработанный файл
-            header, data = self.receive_file(conn)
+            with self._borrow(addr, conn) as conn:
+                conn.settimeout(180)
+                header, data = self._exchange_work(conn, addr, name)
+                conn.settimeout(None)
             
-            if header and header.get("action") == "return_file":
+            result = header.get("result")
+            if result == "return_file":
                 filename = header.get("filename", "processed.csv")
+                extension = Transfer_Format.FILE_EXTENSIONS.get(header.get("format"), ".csv")
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                save_path = RECEIVED_DIR / f"parallel_{name}_{timestamp}.csv"
+                save_path = RECEIVED_DIR / f"parallel_{name}_{timestamp}{extension}"
                 
-                with open(save_path, 'wb') as f:
-                    f.write(data)
+                # Тело, принятое на диск, просто переименовывается
+                Receive_Buffer.save_payload(data, save_path)
                 
                 print(f"[✓] Data from {name} saved: {save_path}")
+                return True
             
-            conn.settimeout(None)
+            elif result == "return_columns":
+                # Параллельные результаты-колонки сразу попадают в основную таблицу
+                _apply_column_patch(header, data)
+                print(f"[✓] Columns {header.get('columns')} merged from {name} ({len(data)} bytes)")
+                return True
+            
+            print(f"[!] {name} returned no result")
             
         except socket.timeout:
             print(f"[!] Timeout while working with {name}")
-            try:
-                conn.settimeout(None)
-            except:
-                pass
         except Exception as e:
             print(f"[!] Error while working with {name}: {e}")
             import traceback
             traceback.print_exc()
-            try:
-                conn.settimeout(None)
-            except:
-                pass
+        return False
     
     def _save_final_results(self):
         """Сохранение финальных результатов обработки"""
-        global current_csv_data, current_csv_file
-        
-        if not current_csv_data:
+        if not _has_data():
             print("[!] No data to save")
             return
         
         try:
-            df = pd.read_csv(current_csv_file)
+            df = get_current_dataframe()
+            CSV_Manager.materialize_csv_file()
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_path = f"final_processed_data_{timestamp}.csv"
-            df.to_csv(output_path, index=False)
+            # CSV текущей версии уже создан для временного файла
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(CSV_Manager.get_current_csv_data())
             
             print("\n" + "🎉" * 35)
             print("=" * 70)
@@ -296,14 +851,63 @@ class WorkflowManager:
             traceback.print_exc()
 
 
+def _has_data():
+    return CSV_Manager.has_data()
+
+
+def get_current_dataframe():
+    """Текущие данные как DataFrame (CSV разбирается не больше одного раза на версию)"""
+    return CSV_Manager.get_dataframe()
+
+
+def _replace_data(csv_bytes=None, df=None):
+    """Новая версия данных: либо CSV от клиента, либо уже разобранный DataFrame"""
+    if Receive_Buffer.is_spilled(csv_bytes):
+        # CSV принят прямо в файл: он и становится временным файлом
+        csv_bytes.close()
+        CSV_Manager.set_csv_file_data(csv_bytes.path)
+    elif csv_bytes is not None:
+        CSV_Manager.set_current_csv_data(csv_bytes)
+    else:
+        CSV_Manager.set_dataframe(df)
+
+
+def _apply_column_patch(header, data):
+    """
+    Слияние ответа return_columns с основной таблицей по row id.
+
+    Новые колонки для строк, которых нет в патче, остаются пустыми.
+    CSV и временный файл не перезаписываются до тех пор, пока не понадобятся.
+    """
+    patch = Transfer_Format.decode_column_patch(
+        Receive_Buffer.payload_source(data), header.get("format", Transfer_Format.FORMAT_CSV))
+    Receive_Buffer.release_payload(data)
+    CSV_Manager.apply_columns(patch)
+
+
+def _node_outputs(node):
+    """
+    Результат узла в основной таблице для кэша этапов: вся таблица, если узел
+    пишет "rows", иначе только его колонки (их не пишет никакой другой узел).
+    """
+    df = get_current_dataframe()
+    if Workflow_Graph.ROWS in node.outputs:
+        return {"table": df}
+    prefix = Workflow_Graph.COLUMN_PREFIX
+    columns = [r[len(prefix):] for r in sorted(node.outputs) if r.startswith(prefix)]
+    return {"columns": df[[c for c in columns if c in df.columns]]}
+
+
+def _merge_columns(df, patch):
+    """Запись колонок патча в df по row id (новые колонки для остальных строк пустые)"""
+    return Transfer_Format.merge_columns(df, patch)
+
+
 def set_csv_data(data, filepath):
     """Установка глобальных данных CSV для использования в workflow"""
-    global current_csv_data, current_csv_file
-    current_csv_data = data
-    current_csv_file = filepath
+    CSV_Manager.set_current_csv_data(data, filepath)
 
 
 def get_csv_data():
     """Получение текущих данных CSV"""
-    global current_csv_data, current_csv_file
-    return current_csv_data, current_csv_file
\ No newline at end of file
+    return CSV_Manager.get_current_csv_data(), CSV_Manager.get_current_csv_file()
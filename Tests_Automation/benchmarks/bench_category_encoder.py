@@ -0,0 +1,58 @@
+"""
+Microbenchmark: codificarea coloanelor categoriale (shape, color, taste, type)
+cu lambda + le.transform per element faţă de Category_Encoder.encode.
+
+La 1M rânduri varianta veche este măsurată pe un eşantion şi extrapolată liniar
+(altfel durează minute).
+
+Rulare (din Tests_Automation):
+    python -m benchmarks.bench_category_encoder [n_rows...]
+"""
+import sys
+import time
+
+from sklearn.preprocessing import LabelEncoder
+
+from utils.data_builder import build_synthetic_dataset
+from config.paths import add_client_template_to_syspath
+
+add_client_template_to_syspath()
+
+import Category_Encoder  # type: ignore
+
+COLUMNS = ['shape', 'color', 'taste', 'type']
+OLD_MAX_ROWS = 50_000
+
+
+def _old_encode(le, column):
+    return column.astype(str).map(lambda x: le.transform([x])[0] if x in le.classes_ else -1)
+
+
+def _time(func):
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def run(row_counts):
+    encoders = {}
+    print(f"{'rows':>10} {'lambda s':>10} {'encoder s':>10} {'speedup':>9}")
+    print("-" * 43)
+    for n_rows in row_counts:
+        df = build_synthetic_dataset(n_rows)
+        if not encoders:
+            encoders = {col: LabelEncoder().fit(df[col].astype(str)) for col in COLUMNS}
+
+        sample = df.head(min(n_rows, OLD_MAX_ROWS))
+        old = sum(_time(lambda: _old_encode(encoders[c], sample[c])) for c in COLUMNS)
+        old *= n_rows / len(sample)
+        new = min(sum(_time(lambda: Category_Encoder.encode(encoders[c], df[c])) for c in COLUMNS)
+                  for _ in range(3))
+
+        note = "" if len(sample) == n_rows else "  (lambda extrapolated)"
+        print(f"{n_rows:>10,} {old:>10.3f} {new:>10.4f} {old / new:>8.0f}x{note}")
+
+
+if __name__ == "__main__":
+    counts = [int(x) for x in sys.argv[1:]] or [20_000, 1_000_000]
+    run(counts)
@@ -0,0 +1,90 @@
+"""
+Benchmark: comprimarea corpului mesajului pentru fiecare codec disponibil.
+
+Pentru setul de date real (şi o variantă sintetică mai mare), în format CSV
+şi pickle, se măsoară:
+  - raportul de comprimare;
+  - timpul end-to-end al unui transfer prin loopback
+    (send_message -> recv_message, comprimare şi decomprimare în flux);
+  - timpul estimat pe o reţea de LINK_MBIT Mbit/s: comprimare + transfer
+    + decomprimare (limită superioară — în flux ele se suprapun).
+
+Rulare (din Tests_Automation):
+    python -m benchmarks.bench_compression [n_rows_sintetic]
+"""
+import socket
+import sys
+import threading
+import time
+
+from utils.data_builder import load_base_dataset, build_synthetic_dataset
+from config.paths import add_project_to_syspath, add_client_template_to_syspath
+
+add_project_to_syspath()
+add_client_template_to_syspath()
+
+import Client_Template as base  # type: ignore
+import Compression  # type: ignore
+import Transfer_Format  # type: ignore
+
+LINK_MBIT = [100, 1000]
+
+
+def _transfer(payload, codec):
+    """Un transfer prin loopback; întoarce durata în secunde"""
+    left, right = socket.socketpair()
+    header = {"action": "work_result", "size": len(payload)}
+    sender = threading.Thread(target=base.send_message, args=(left, header, payload, codec))
+    t0 = time.perf_counter()
+    sender.start()
+    _, data = base.recv_message(right)
+    elapsed = time.perf_counter() - t0
+    sender.join()
+    left.close()
+    right.close()
+    assert len(data) == len(payload)
+    return elapsed
+
+
+def _codec_costs(payload, codec):
+    """(octeţi comprimaţi, timp comprimare, timp decomprimare) pe blocuri, ca în send_compressed"""
+    comp = Compression.compressor(codec)
+    t0 = time.perf_counter()
+    frames = [comp.compress(block) for block in Compression._blocks(payload)]
+    frames.append(comp.flush())
+    t1 = time.perf_counter()
+    decomp = Compression.decompressor(codec)
+    for frame in frames:
+        decomp.decompress(frame)
+    t2 = time.perf_counter()
+    return sum(len(f) for f in frames), t1 - t0, t2 - t1
+
+
+def run(datasets, repeat=3):
+    links = " ".join(f"{f'{mbit}Mbit s':>11}" for mbit in LINK_MBIT)
+    print(f"{'dataset':<14} {'format':<7} {'codec':<6} {'MB':>8} {'ratio':>7} {'loopback s':>11} {links}")
+    print("-" * (58 + 12 * len(LINK_MBIT)))
+    for label, df in datasets:
+        for fmt in (Transfer_Format.FORMAT_CSV, Transfer_Format.FORMAT_PICKLE):
+            payload, used_fmt = Transfer_Format.encode_dataframe(df, fmt)
+            if isinstance(payload, str):
+                payload = payload.encode("utf-8")
+            for codec in [None] + Compression.available_codecs():
+                if codec is None:
+                    size, enc, dec = len(payload), 0.0, 0.0
+                else:
+                    size, enc, dec = _codec_costs(payload, codec)
+                loopback = min(_transfer(payload, codec) for _ in range(repeat))
+                estimates = " ".join(f"{enc + dec + size * 8 / (mbit * 1e6):>11.3f}" for mbit in LINK_MBIT)
+                print(f"{label:<14} {used_fmt:<7} {codec or 'none':<6} {size / 1e6:>8.2f} "
+                      f"{len(payload) / size:>7.2f} {loopback:>11.3f} {estimates}")
+            print()
+
+
+if __name__ == "__main__":
+    n_synthetic = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    real = load_base_dataset()
+    run([
+        ("real 20k", real.assign(cleaned_text=real["name"].str.lower())),
+        (f"synth {n_synthetic // 1000}k", build_synthetic_dataset(n_synthetic)),
+    ])
@@ -0,0 +1,84 @@
+"""
+Benchmark: etapa modelelor (Model1/Model2 Training + Validation, clienţi
+paraleli pe acelaşi host) cu şi fără bugetul de nuclee (Core_Budget).
+
+Fără buget fiecare client foloseşte toate nucleele hostului (RandomForest
+cu n_jobs = nuclee, validarea cu câte un proces pe fold), deci pe un host
+cu N nuclee rulează până la ~4N fire/procese. Cu buget serverul împarte
+nucleele între nodurile pornite împreună.
+
+Hostul cu 4 sau 8 nuclee este simulat prin afinitatea procesului
+(os.sched_setaffinity, moştenită de clienţi); o configuraţie cu mai multe
+nuclee decât are maşina este sărită.
+
+Rulare (din Tests_Automation):
+    python -m benchmarks.bench_core_budget [n_rows] [cores...]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from utils.data_builder import build_synthetic_dataset
+from benchmarks.local_cluster import LocalCluster, Workflow_Manager
+
+PLUGINS = [
+    ("Client.Plugins.Model_Antrenare.Plugin_Antrenare_Model1", "Model1_Training"),
+    ("Client.Plugins.Model_Antrenare.Plugin_Validare_Model1", "Model1_Validation"),
+    ("Client.Plugins.Model_Antrenare.Plugin_Antrenare_Model2", "Model2_Training"),
+    ("Client.Plugins.Model_Antrenare.Plugin_Validare_Model2", "Model2_Validation"),
+]
+
+
+def _models_dataset(n_rows):
+    df = build_synthetic_dataset(n_rows)
+    df["model_target"] = "model1"
+    df.loc[n_rows // 2:, "model_target"] = "model2"
+    return df
+
+
+def _stage_time(csv_text, workdir, budget):
+    """Timpul etapei modelelor (de la primul nod pornit la ultimul terminat)"""
+    Workflow_Manager.set_csv_data(csv_text, os.path.join(workdir, "temp_processing.csv"))
+    Workflow_Manager.CORE_BUDGET_ENABLED = budget
+    Workflow_Manager.STAGE_CACHE_ENABLED = False
+
+    with LocalCluster(PLUGINS) as cluster:
+        workflow = cluster.workflow()
+        nodes = workflow._build_graph(cluster.sorted_clients())
+        # jurnalul WorkflowManager nu intră în tabel
+        with contextlib.redirect_stdout(io.StringIO()):
+            timings = workflow._run_graph(nodes)
+
+    assert len(timings) == len(PLUGINS), "not all model nodes finished"
+    return max(end for _, end in timings.values()) - min(start for start, _ in timings.values())
+
+
+def run(n_rows, core_counts):
+    machine = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None
+    csv_text = _models_dataset(n_rows).to_csv(index=False)
+    tmp = tempfile.TemporaryDirectory()
+
+    print(f"rows={n_rows:,}  machine cores={len(machine) if machine else os.cpu_count()}")
+    print(f"{'cores':>6} {'no budget s':>12} {'budget s':>10} {'speedup':>9}")
+    print("-" * 41)
+    for cores in core_counts:
+        if machine is None or cores > len(machine):
+            print(f"{cores:>6} {'skipped: not enough cores on this machine':>32}")
+            continue
+        os.sched_setaffinity(0, machine[:cores])
+        try:
+            plain = _stage_time(csv_text, tmp.name, budget=False)
+            budgeted = _stage_time(csv_text, tmp.name, budget=True)
+        finally:
+            os.sched_setaffinity(0, machine)
+        print(f"{cores:>6} {plain:>12.2f} {budgeted:>10.2f} {plain / budgeted:>8.2f}x")
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    counts = [int(x) for x in sys.argv[2:]] or [4, 8]
+    run(n, counts)
@@ -0,0 +1,71 @@
+"""
+Benchmark: costul clienţilor conectaţi şi inactivi în ConnectionManager.
+
+Pentru fiecare număr de clienţi măsoară, după handshake:
+  * 'threads'  — fire de execuţie noi faţă de pornirea serverului;
+  * 'cpu ms'   — timpul CPU al procesului într-o pauză de idle_s secunde;
+  * 'mem KB'   — memoria alocată în Python în aceeaşi pauză (tracemalloc).
+
+Rulare (din Tests_Automation):
+    python -m benchmarks.bench_idle_clients [idle_s] [n_clients ...]
+"""
+import contextlib
+import io
+import socket
+import sys
+import threading
+import time
+import tracemalloc
+
+from config.paths import add_project_to_syspath
+
+add_project_to_syspath()
+
+from Server.App_Functions.Connection_Manager import ConnectionManager  # type: ignore
+
+
+def _measure(n_clients, idle_s):
+    clients, names = {}, set()
+    manager = ConnectionManager(clients, names)
+    address = manager.start("127.0.0.1", 0)
+    threads_before = threading.active_count()
+    sockets = []
+    try:
+        for i in range(n_clients):
+            s = socket.create_connection(address, timeout=3.0)
+            s.send(f"Idle{i}|1|Parallel".encode("utf-8"))
+            assert s.recv(1024) == b"CONNECTED"
+            sockets.append(s)
+        deadline = time.monotonic() + 10
+        while len(clients) < n_clients and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        threads = threading.active_count() - threads_before
+        tracemalloc.start()
+        mem_start, _ = tracemalloc.get_traced_memory()
+        cpu_start = time.process_time()
+        time.sleep(idle_s)
+        cpu = time.process_time() - cpu_start
+        mem_end, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return threads, cpu, mem_end - mem_start
+    finally:
+        for s in sockets:
+            s.close()
+        manager.stop()
+
+
+def run(idle_s, sizes):
+    print(f"idle={idle_s:.1f}s")
+    print(f"{'clients':>8} {'threads':>8} {'cpu ms':>8} {'mem KB':>8}")
+    print("-" * 35)
+    for n_clients in sizes:
+        # jurnalul ConnectionManager nu intră în tabel
+        with contextlib.redirect_stdout(io.StringIO()):
+            threads, cpu, mem = _measure(n_clients, idle_s)
+        print(f"{n_clients:>8,} {threads:>8} {cpu * 1000:>8.1f} {mem / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    idle = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    run(idle, [int(a) for a in sys.argv[2:]] or [10, 100, 1000])
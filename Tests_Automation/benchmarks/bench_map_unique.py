@@ -0,0 +1,54 @@
+"""
+Benchmark: transformarea per rând (Series.map) vs. base.map_unique
+(o dată pe valoare distinctă) pentru cardinalităţi diferite ale coloanei.
+
+Funcţia măsurată este cea din Plugin_Tokenizer (split + Token_List).
+
+Rulare (din Tests_Automation):
+    python -m benchmarks.bench_map_unique [n_rows]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from config.paths import add_client_template_to_syspath
+
+add_client_template_to_syspath()
+
+import Client_Template as base  # type: ignore
+import Token_List  # type: ignore
+
+CARDINALITIES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+
+
+def _tokenize(value):
+    return Token_List.encode_tokens([t for t in str(value).split() if len(t) > 1])
+
+
+def _timed(func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - t0
+
+
+def run(n_rows):
+    rng = np.random.default_rng(42)
+    print(f"rows: {n_rows:,}")
+    print(f"{'distinct':>10} {'per row s':>10} {'map_unique s':>13} {'speedup':>9}")
+    print("-" * 46)
+    for cardinality in CARDINALITIES:
+        if cardinality > n_rows:
+            break
+        values = np.array([f"fresh fruit {i} sort {i % 7} x" for i in range(cardinality)], dtype=object)
+        series = pd.Series(values[rng.integers(0, cardinality, n_rows)])
+
+        expected, per_row = _timed(series.map, _tokenize)
+        result, unique = _timed(base.map_unique, series, _tokenize)
+        assert result.tolist() == expected.tolist()
+        print(f"{cardinality:>10,} {per_row:>10.3f} {unique:>13.3f} {per_row / unique:>8.1f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,109 @@
+"""
+Benchmark: istoria predicţiilor — Prediction_History (SQLite, append-only)
+vs. predictions_results.json rescris complet (indent=2) la fiecare run.
+
+După fiecare run se măsoară:
+  * 'append s'  — scrierea run-ului (JSON: rescrierea întregului fişier);
+  * 'open ms'   — deschiderea tab-ului History: sumarul şi primele 20 de
+                  înregistrări (JSON: încărcarea întregului fişier).
+
+Rulare (din Tests_Automation):
+    python -m benchmarks.bench_prediction_history [rows_per_run] [runs]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from config.paths import add_client_template_to_syspath
+
+add_client_template_to_syspath()
+
+import Prediction_History  # type: ignore
+
+
+def _columns(n_rows, rng):
+    names = np.array(["apple", "pear", "plum", "tomato", "carrot"], dtype=object)
+    return {
+        "sample_id": np.arange(n_rows),
+        "size": rng.uniform(1, 30, n_rows).round(1),
+        "shape": rng.choice(["round", "long", "oval"], n_rows),
+        "weight": rng.uniform(5, 2000, n_rows).round(1),
+        "price": rng.uniform(1, 100, n_rows).round(1),
+        "color": rng.choice(["red", "green", "yellow"], n_rows),
+        "taste": rng.choice(["sweet", "sour", "bitter"], n_rows),
+        "type": rng.choice(["fruit", "vegetable"], n_rows),
+        "type_confidence": rng.random(n_rows),
+        "name": rng.choice(names, n_rows),
+        "name_confidence": rng.random(n_rows),
+        "top_names": rng.choice(names, (n_rows, 3)),
+        "top_confidences": np.sort(rng.random((n_rows, 3)), axis=1)[:, ::-1],
+        "actual_type": rng.choice(["fruit", "vegetable"], n_rows),
+        "actual_name": rng.choice(names, n_rows),
+    }
+
+
+def _json_records(columns):
+    """Înregistrările în formatul vechi al predictions_results.json"""
+    return [{
+        'sample_id': int(columns['sample_id'][i]),
+        'input': {key: (columns[key][i].item() if hasattr(columns[key][i], 'item') else columns[key][i])
+                  for key in ('size', 'shape', 'weight', 'price', 'color', 'taste')},
+        'predictions': {
+            'model1': {'type': str(columns['type'][i]), 'confidence': float(columns['type_confidence'][i])},
+            'model2': {'name': str(columns['name'][i]), 'confidence': float(columns['name_confidence'][i]),
+                       'top3': [{'name': str(n), 'confidence': float(p)}
+                                for n, p in zip(columns['top_names'][i], columns['top_confidences'][i])]},
+        },
+        'actual': {'type': str(columns['actual_type'][i]), 'name': str(columns['actual_name'][i])},
+    } for i in range(len(columns['sample_id']))]
+
+
+def _timed(func, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+def run(rows_per_run, runs):
+    rng = np.random.default_rng(0)
+    tmp = tempfile.TemporaryDirectory()
+    json_path = os.path.join(tmp.name, "predictions_results.json")
+    history = []
+
+    print(f"rows per run={rows_per_run:,}")
+    print(f"{'run':>4} {'total rows':>11} {'json append s':>14} {'json open ms':>13} "
+          f"{'store append s':>15} {'store open ms':>14} {'store MB':>9}")
+    print("-" * 88)
+    for run_no in range(1, runs + 1):
+        columns = _columns(rows_per_run, rng)
+
+        history += _json_records(columns)
+        def write_json():
+            with open(json_path, "w") as f:
+                json.dump(history, f, indent=2)
+        def open_json():
+            with open(json_path, "r", encoding="utf-8") as f:
+                predictions = json.load(f)
+            return len(predictions), predictions[:20]
+        _, json_append = _timed(write_json)
+        _, json_open = _timed(open_json)
+
+        _, store_append = _timed(Prediction_History.append_run, columns, directory=tmp.name)
+        def open_store():
+            return Prediction_History.summary(tmp.name), Prediction_History.read_page(directory=tmp.name)
+        _, store_open = _timed(open_store)
+        size_mb = os.path.getsize(Prediction_History.history_path(tmp.name)) / 1e6
+
+        print(f"{run_no:>4} {len(history):>11,} {json_append:>14.2f} {json_open * 1000:>13.1f} "
+              f"{store_append:>15.2f} {store_open * 1000:>14.1f} {size_mb:>9.1f}")
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    r = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    run(n, r)
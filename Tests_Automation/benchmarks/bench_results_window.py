@@ -0,0 +1,80 @@
+"""
+Benchmark: deschiderea ResultsWindow pentru seturi de date de mărimi diferite.
+
+Măsoară:
+  * 'window ms'  — de la show_results_window() până când fereastra este
+                   vizibilă (GUI nu aşteaptă datele);
+  * 'data s'     — până când încărcarea din fundal a terminat şi tab-ul
+                   Statistics este construit;
+  * 'blocking s' — cât ar fi blocat GUI încărcarea sincronă (load_results()
+                   în firul principal, cum se făcea înainte).
+
+Tabelul este dat ca text CSV, deci prima încărcare îl parsează (ca după
+un workflow). Rulează fără afişaj (QT_QPA_PLATFORM=offscreen).
+
+Rulare (din Tests_Automation):
+    python -m benchmarks.bench_results_window [n_rows ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from utils.data_builder import build_synthetic_dataset
+from config.paths import add_project_to_syspath
+
+add_project_to_syspath()
+
+from Server.App_Functions import Workflow_Manager  # type: ignore
+from Server.App_Functions import Results_Window  # type: ignore
+
+
+def _wait(app, condition, timeout=600.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("results window did not finish loading")
+        app.processEvents()
+        time.sleep(0.001)
+
+
+def run(sizes):
+    app = QApplication.instance() or QApplication([])
+    tmp = tempfile.TemporaryDirectory()
+    os.chdir(tmp.name)
+
+    print(f"{'rows':>10} {'window ms':>10} {'data s':>8} {'blocking s':>11}")
+    print("-" * 43)
+    for n_rows in sizes:
+        csv_text = build_synthetic_dataset(n_rows).to_csv(index=False)
+
+        Workflow_Manager.set_csv_data(csv_text, os.path.join(tmp.name, "temp_processing.csv"))
+        windows = getattr(Results_Window.show_results_window, "_windows", [])
+        opened = len(windows)
+        started = time.perf_counter()
+        Results_Window.show_results_window()
+        windows = Results_Window.show_results_window._windows
+        _wait(app, lambda: len(windows) > opened and windows[-1].isVisible())
+        shown = time.perf_counter() - started
+        _wait(app, lambda: windows[-1].loaded)
+        ready = time.perf_counter() - started
+        windows[-1].close()
+
+        # Varianta veche: aceeaşi încărcare în firul GUI
+        Workflow_Manager.set_csv_data(csv_text, os.path.join(tmp.name, "temp_processing.csv"))
+        t0 = time.perf_counter()
+        Results_Window.load_results()
+        blocking = time.perf_counter() - t0
+
+        print(f"{n_rows:>10,} {shown * 1000:>10.1f} {ready:>8.2f} {blocking:>11.2f}")
+
+    os.chdir(os.path.dirname(tmp.name))
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    run([int(a) for a in sys.argv[1:]] or [20_000, 1_000_000, 5_000_000])
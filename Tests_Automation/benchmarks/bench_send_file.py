@@ -0,0 +1,113 @@
+"""
+Benchmark: trimiterea fişierului temporar către client —
+varianta veche (f.read() + sendall) vs. send_file_to_client (sendfile).
+
+Expeditorul rulează într-un proces separat pentru fiecare măsurătoare,
+ca vârful de memorie (ru_maxrss) să fie doar al lui; receptorul citeşte
+într-un buffer fix şi aruncă datele.
+
+Rulare (din Tests_Automation):
+    python -m benchmarks.bench_send_file [MB ...]
+"""
+import json
+import os
+import resource
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+
+from config.paths import SERVER_ROOT
+
+if str(SERVER_ROOT) not in sys.path:
+    sys.path.insert(0, str(SERVER_ROOT))
+
+SIZES_MB = [10, 100, 1000]
+
+
+def _old_send_file(conn, filepath):
+    """Varianta dinaintea optimizării: tot fişierul în memorie"""
+    from App.Server import send_message  # type: ignore
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    send_message(conn, {"action": "send_file", "filename": os.path.basename(filepath),
+                        "size": len(data)}, data)
+
+
+def _child(impl, path, port):
+    from App.Server import send_file_to_client  # type: ignore
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    conn = socket.create_connection(("127.0.0.1", port))
+    if impl == "old":
+        _old_send_file(conn, path)
+    else:
+        send_file_to_client(conn, path)
+    conn.close()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"rss_before_kb": rss_before, "peak_kb": peak}))
+
+
+def _receive(server):
+    conn, _ = server.accept()
+    buf = memoryview(bytearray(1024 * 1024))
+    raw = b""
+    while len(raw) < 4:
+        raw += conn.recv(4 - len(raw))
+    header_len = struct.unpack(">I", raw)[0]
+    header = b""
+    while len(header) < header_len:
+        header += conn.recv(header_len - len(header))
+    size = json.loads(header)["size"]
+    t0 = time.perf_counter()
+    received = 0
+    while received < size:
+        n = conn.recv_into(buf)
+        if not n:
+            break
+        received += n
+    elapsed = time.perf_counter() - t0
+    conn.close()
+    assert received == size, (received, size)
+    return elapsed
+
+
+def _make_file(path, size):
+    line = b"5.1,round,120.5,14.2,red,sweet,fruit,apple,apple,apple,apple,model1\n"
+    block = line * (1024 * 1024 // len(line))
+    with open(path, "wb") as f:
+        written = 0
+        while written < size:
+            chunk = block[:size - written]
+            f.write(chunk)
+            written += len(chunk)
+
+
+def run(sizes_mb):
+    print(f"{'size':>8} {'impl':<9} {'MB/s':>9} {'peak RSS MB':>12} {'RSS growth MB':>14}")
+    print("-" * 56)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_mb in sizes_mb:
+            path = os.path.join(tmp, f"payload_{size_mb}.csv")
+            _make_file(path, size_mb * 1024 * 1024)
+            for impl in ("old", "sendfile"):
+                server = socket.create_server(("127.0.0.1", 0))
+                port = server.getsockname()[1]
+                child = subprocess.Popen(
+                    [sys.executable, "-m", "benchmarks.bench_send_file", "--child", impl, path, str(port)],
+                    stdout=subprocess.PIPE, text=True)
+                elapsed = _receive(server)
+                out, _ = child.communicate(timeout=600)
+                server.close()
+                mem = json.loads(out.strip().splitlines()[-1])
+                print(f"{size_mb:>6}MB {impl:<9} {size_mb / elapsed:>9.0f} {mem['peak_kb'] / 1024:>12.1f} "
+                      f"{(mem['peak_kb'] - mem['rss_before_kb']) / 1024:>14.1f}")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        _child(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+    else:
+        run([int(a) for a in sys.argv[1:]] or SIZES_MB)
@@ -0,0 +1,56 @@
+"""
+Benchmark: o singură etapă secvenţială (Text_Cleaner) împărţită pe 1, 2, 4, 8 clienţi
+de acelaşi nivel.
+
+Accelerarea aproape liniară apare doar dacă există cel puţin atâtea nuclee
+(sau maşini) câţi clienţi; pe mai puţine nuclee procesele concurează între ele.
+
+Rulare (din Tests_Automation):
+    python -m benchmarks.bench_sharded_stage [n_rows] [workers...]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from utils.data_builder import build_synthetic_dataset
+from benchmarks.local_cluster import LocalCluster, Workflow_Manager
+
+CLEANER = "Client.Plugins.Text_Preprocesare.Plugin_Text_Cleaner"
+
+
+def run(n_rows, worker_counts):
+    df = build_synthetic_dataset(n_rows)
+    csv_text = df.to_csv(index=False)
+    tmp = tempfile.TemporaryDirectory()
+
+    print(f"rows={n_rows:,}  cpu_count={os.cpu_count()}  chunk={Workflow_Manager.STREAM_CHUNK_ROWS}")
+    print(f"{'workers':>8} {'stage s':>10} {'speedup':>9} {'rows/s':>12}")
+    print("-" * 42)
+    baseline = None
+    for n_workers in worker_counts:
+        specs = [(CLEANER, f"Text_Cleaner_{i}") for i in range(n_workers)]
+        Workflow_Manager.set_csv_data(csv_text, os.path.join(tmp.name, "temp_processing.csv"))
+
+        with LocalCluster(specs) as cluster:
+            workflow = cluster.workflow()
+            started = time.perf_counter()
+            # jurnalul WorkflowManager nu intră în tabel
+            with contextlib.redirect_stdout(io.StringIO()):
+                workflow._run_graph(workflow._build_graph(cluster.sorted_clients()))
+            elapsed = time.perf_counter() - started
+
+        result = Workflow_Manager.get_current_dataframe()
+        assert len(result) == n_rows and result["cleaned_text"].notna().all()
+
+        baseline = baseline or elapsed
+        print(f"{n_workers:>8} {elapsed:>10.2f} {baseline / elapsed:>8.2f}x {n_rows / elapsed:>12,.0f}")
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    counts = [int(x) for x in sys.argv[2:]] or [1, 2, 4, 8]
+    run(n, counts)
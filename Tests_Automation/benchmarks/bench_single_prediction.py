@@ -0,0 +1,115 @@
+"""
+Benchmark: latenţa unei singure predicţii din ResultsWindow (butonul Predict).
+
+  * 'old'      — varianta anterioară: două DataFrame de un rând, Category_Encoder
+                 pe fiecare categorie, predict + predict_proba pentru fiecare model;
+  * 'compiled' — Cascade_Predictor.CompiledCascade, construit o singură dată.
+
+Modelele sunt antrenate cu parametrii plugin-urilor (DecisionTree pentru
+Model1, RandomForest cu 100 de arbori pentru Model2) pe dataset-ul de bază.
+
+Rulare (din Tests_Automation):
+    python -m benchmarks.bench_single_prediction [repetări]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import LabelEncoder
+from sklearn.tree import DecisionTreeClassifier
+
+from utils.data_builder import build_dataset_for_models
+from config.paths import add_client_template_to_syspath
+
+add_client_template_to_syspath()
+
+import Category_Encoder  # type: ignore
+import Cascade_Predictor  # type: ignore
+
+NUMERIC = ['size (cm)', 'weight (g)', 'avg_price (MDL)']
+
+
+def _train(df, categorical_cols, target, model):
+    feature_cols = list(NUMERIC)
+    X = df[feature_cols].copy()
+    le_dict = {}
+    for col in categorical_cols:
+        le = LabelEncoder()
+        X[f'{col}_encoded'] = le.fit_transform(df[col].astype(str))
+        le_dict[col] = le
+        feature_cols.append(f'{col}_encoded')
+    le_target = LabelEncoder()
+    model.fit(X[feature_cols], le_target.fit_transform(df[target]))
+    return {'model': model, 'feature_cols': feature_cols, 'le_dict': le_dict, 'le_target': le_target}
+
+
+def _old_prediction(model1_data, model2_data, values):
+    """make_prediction înainte de CompiledCascade"""
+    X1_data = {col: [values[col]] for col in NUMERIC}
+    for col in ['shape', 'color', 'taste']:
+        X1_data[f'{col}_encoded'] = Category_Encoder.encode(model1_data['le_dict'][col], [values[col]], unknown=0)
+    X1_sample = pd.DataFrame(X1_data)[model1_data['feature_cols']]
+    pred1_encoded = model1_data['model'].predict(X1_sample)[0]
+    pred1_label = model1_data['le_target'].inverse_transform([pred1_encoded])[0]
+    model1_data['model'].predict_proba(X1_sample)
+
+    X2_data = {col: [values[col]] for col in NUMERIC}
+    for col in ['shape', 'color', 'taste', 'type']:
+        val = pred1_label if col == 'type' else values[col]
+        X2_data[f'{col}_encoded'] = Category_Encoder.encode(model2_data['le_dict'][col], [val], unknown=0)
+    X2_sample = pd.DataFrame(X2_data)[model2_data['feature_cols']]
+    pred2_encoded = model2_data['model'].predict(X2_sample)[0]
+    pred2_label = model2_data['le_target'].inverse_transform([pred2_encoded])[0]
+    pred2_proba = model2_data['model'].predict_proba(X2_sample)[0]
+    top3 = np.argsort(pred2_proba)[-3:][::-1]
+    return pred1_label, pred2_label, model2_data['le_target'].inverse_transform(top3)
+
+
+def _latency(func, rows, repeats):
+    for values in rows[:5]:
+        func(values)
+    times = []
+    for i in range(repeats):
+        values = rows[i % len(rows)]
+        t0 = time.perf_counter()
+        func(values)
+        times.append(time.perf_counter() - t0)
+    times = np.array(times) * 1000
+    return np.median(times), np.percentile(times, 95)
+
+
+def run(repeats):
+    df = build_dataset_for_models()
+    half = df[df['model_target'] == 'model1'], df[df['model_target'] == 'model2']
+    model1_data = _train(half[0], ['shape', 'color', 'taste'], 'type', DecisionTreeClassifier(
+        max_depth=10, min_samples_split=5, min_samples_leaf=2, random_state=42))
+    model2_data = _train(half[1], ['shape', 'color', 'taste', 'type'], 'name', RandomForestClassifier(
+        n_estimators=100, max_depth=15, min_samples_split=5, min_samples_leaf=2,
+        random_state=42, n_jobs=os.cpu_count()))
+
+    t0 = time.perf_counter()
+    predictor = Cascade_Predictor.CompiledCascade(model1_data, model2_data)
+    compile_ms = (time.perf_counter() - t0) * 1000
+
+    rows = df.sample(n=50, random_state=1)[NUMERIC + ['shape', 'color', 'taste']].to_dict('records')
+    for values in rows:
+        old = _old_prediction(model1_data, model2_data, values)
+        new = predictor.predict(values)
+        assert (old[0], old[1]) == (new['type'], new['name'])
+
+    print(f"cores={os.cpu_count()}  trees={len(model2_data['model'].estimators_)}  "
+          f"compile={compile_ms:.1f} ms  repeats={repeats}")
+    print(f"{'variant':>10} {'median ms':>10} {'p95 ms':>8}")
+    print("-" * 31)
+    old_median, old_p95 = _latency(lambda v: _old_prediction(model1_data, model2_data, v), rows, repeats)
+    print(f"{'old':>10} {old_median:>10.2f} {old_p95:>8.2f}")
+    new_median, new_p95 = _latency(predictor.predict, rows, repeats)
+    print(f"{'compiled':>10} {new_median:>10.2f} {new_p95:>8.2f}")
+    print(f"speedup (median): {old_median / new_median:.1f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
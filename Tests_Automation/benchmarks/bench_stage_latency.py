@@ -0,0 +1,54 @@
+"""
+Benchmark: latenţa unei etape (work_request → work_result) pe un set mic de date,
+unde timpul e dominat de protocol, nu de calcul.
+
+Înainte de schimbul într-un singur mesaj, fiecare etapă avea ~0.8s de pauze
+fixe (0.5s pe server + 0.3s pe client).
+
+Rulare (din Tests_Automation):
+    python -m benchmarks.bench_stage_latency [n_rows] [repeat]
+"""
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from utils.data_builder import load_base_dataset
+from benchmarks.local_cluster import LocalCluster, Workflow_Manager
+
+CLEANER = "Client.Plugins.Text_Preprocesare.Plugin_Text_Cleaner"
+
+
+def run(n_rows, repeat):
+    csv_text = load_base_dataset(limit=n_rows).to_csv(index=False)
+    tmp = tempfile.TemporaryDirectory()
+
+    with LocalCluster([(CLEANER, "Text_Cleaner")]) as cluster:
+        workflow = cluster.workflow()
+        addr, (conn, name, level, _) = next(iter(cluster.clients.items()))
+
+        timings = []
+        for _ in range(repeat):
+            Workflow_Manager.set_csv_data(csv_text, os.path.join(tmp.name, "temp_processing.csv"))
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                updated = workflow._run_sequential_client(addr, conn, name, level)
+            timings.append(time.perf_counter() - started)
+            assert updated
+
+    tmp.cleanup()
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(0.95 * len(timings)))]
+    print(f"rows={n_rows}  repeat={repeat}")
+    print(f"stage latency: median {statistics.median(timings) * 1000:.1f} ms, "
+          f"p95 {p95 * 1000:.1f} ms, min {timings[0] * 1000:.1f} ms")
+    print("fixed sleeps before the change: 800.0 ms per stage")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    r = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    run(n, r)
@@ -0,0 +1,126 @@
+"""
+Benchmark: conveiorul etapelor în flux (Workflow_Manager._run_pipeline)
+cu clienţi falşi care petrec un timp fix pe fiecare parte.
+
+Scenarii:
+  * 'pipeline' — N etape de câte un client: etapa următoare începe cu
+                 partea 0 cât timp cea anterioară lucrează la restul;
+  * 'shards'   — o etapă cu N clienţi de acelaşi nivel care împart părţile.
+
+'serial s' este timpul aceloraşi părţi procesate una după alta de un
+singur client: părţi x etape x întârziere.
+
+Rulare (din Tests_Automation):
+    python -m benchmarks.bench_stream_pipeline [chunks] [delay_ms]
+"""
+import contextlib
+import io
+import json
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+from utils.data_builder import build_synthetic_dataset
+from config.paths import add_project_to_syspath, add_client_template_to_syspath
+
+add_project_to_syspath()
+add_client_template_to_syspath()
+
+from Client.Plugins.Text_Preprocesare import Plugin_Text_Cleaner as cleaner  # type: ignore
+from Server.App_Functions.Connection_Manager import ConnectionManager  # type: ignore
+from Server.App_Functions import Workflow_Manager  # type: ignore
+import Transfer_Format  # type: ignore
+
+send_message = cleaner.base.send_message
+recv_message = cleaner.base.recv_message
+
+CHUNK_ROWS = 100
+
+
+def _delay_client(address, name, level, delay):
+    """Client în flux care adaugă o coloană şi aşteaptă delay secunde pe parte"""
+    s = socket.create_connection(address)
+    s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    caps = {"formats": ["pickle"], "streaming": True}
+    s.send(f"{name}|{level}|Sequential|{json.dumps(caps)}".encode("utf-8"))
+    assert s.recv(1024) == b"CONNECTED"
+
+    def serve():
+        while True:
+            try:
+                header, data = recv_message(s)
+            except OSError:
+                return
+            if header is None:
+                return
+            chunk = Transfer_Format.decode_column_patch(data, header["format"])
+            time.sleep(delay)
+            patch = pd.DataFrame({f"out_{level}": chunk["name"]}, index=chunk.index)
+            payload, fmt = Transfer_Format.encode_column_patch(patch, header["format"])
+            send_message(s, {"action": "work_result", "seq": header["seq"], "status": "ok",
+                             "format": fmt, "size": len(payload)}, payload)
+
+    threading.Thread(target=serve, daemon=True).start()
+    return s
+
+
+def _measure(levels, delay):
+    """Timpul etapelor secvenţiale pentru clienţii (nume, nivel) din levels"""
+    clients, names = {}, set()
+    manager = ConnectionManager(clients, names)
+    address = manager.start("127.0.0.1", 0)
+    sockets = [_delay_client(address, name, level, delay) for name, level in levels]
+    try:
+        deadline = time.monotonic() + 5
+        while len(clients) < len(levels) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        workflow = Workflow_Manager.WorkflowManager(
+            clients_dict=clients,
+            send_file_func=None,
+            receive_file_func=recv_message,
+            send_message_func=send_message,
+            borrow_func=manager.borrow,
+            capabilities_dict=manager.capabilities,
+        )
+        stages = [(addr, conn, name, level)
+                  for addr, (conn, name, level, _) in sorted(clients.items(), key=lambda item: item[1][2])]
+        started = time.perf_counter()
+        _, ok = workflow._run_stage_groups(stages)
+        assert ok
+        return time.perf_counter() - started
+    finally:
+        for s in sockets:
+            s.close()
+        manager.stop()
+
+
+def run(n_chunks, delay):
+    Workflow_Manager.STREAM_CHUNK_ROWS = CHUNK_ROWS
+    csv_text = build_synthetic_dataset(n_chunks * CHUNK_ROWS).to_csv(index=False)
+    tmp = tempfile.TemporaryDirectory()
+
+    print(f"chunks={n_chunks}  delay={delay * 1000:.0f} ms/chunk")
+    print(f"{'scenario':>10} {'clients':>8} {'serial s':>9} {'measured s':>11} {'speedup':>8}")
+    print("-" * 50)
+    for scenario, n_clients in [("pipeline", 2), ("pipeline", 4), ("shards", 2), ("shards", 4)]:
+        if scenario == "pipeline":
+            levels = [(f"Stage_{i}", i + 1) for i in range(n_clients)]
+        else:
+            levels = [(f"Shard_{i}", 1) for i in range(n_clients)]
+        Workflow_Manager.set_csv_data(csv_text, f"{tmp.name}/temp_processing.csv")
+        # jurnalul serverului nu intră în tabel
+        with contextlib.redirect_stdout(io.StringIO()):
+            elapsed = _measure(levels, delay)
+        serial = n_chunks * delay * (n_clients if scenario == "pipeline" else 1)
+        print(f"{scenario:>10} {n_clients:>8} {serial:>9.2f} {elapsed:>11.2f} {serial / elapsed:>7.2f}x")
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    chunks = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    delay_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 20
+    run(chunks, delay_ms / 1000)
@@ -0,0 +1,70 @@
+"""
+Benchmark: curăţarea coloanei 'name' — varianta veche (apply per rând)
+vs. Text_Engine (un singur proces şi multiproces).
+
+Pentru seturile mari varianta veche este măsurată pe un eşantion de
+OLD_SAMPLE_ROWS rânduri şi extrapolată liniar (marcat cu '*').
+
+Rulare (din Tests_Automation):
+    python -m benchmarks.bench_text_cleaner [n_rows ...]
+"""
+import os
+import re
+import sys
+import time
+
+from utils.data_builder import load_base_dataset
+from config.paths import add_client_template_to_syspath
+
+add_client_template_to_syspath()
+
+import Text_Engine  # type: ignore
+
+OLD_SAMPLE_ROWS = 1_000_000
+
+
+def _old_clean_text(text):
+    cleaned = str(text).lower()
+    cleaned = re.sub(r'[^a-zA-Z\s]', '', cleaned)
+    return ' '.join(cleaned.split())
+
+
+def _timed(func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - t0
+
+
+def run(sizes):
+    names = load_base_dataset()["name"]
+    cores = os.cpu_count() or 1
+    print(f"cores: {cores}")
+    print(f"{'rows':>10} {'old apply s':>12} {'engine s':>10} {f'engine x{cores} s':>14} {'speedup':>9}")
+    print("-" * 60)
+    for n_rows in sizes:
+        series = names.sample(n=n_rows, replace=True, random_state=42).reset_index(drop=True)
+
+        sample = series if n_rows <= OLD_SAMPLE_ROWS else series.iloc[:OLD_SAMPLE_ROWS]
+        expected, old_time = _timed(sample.apply, _old_clean_text)
+        mark = " "
+        if n_rows > OLD_SAMPLE_ROWS:
+            old_time *= n_rows / OLD_SAMPLE_ROWS
+            mark = "*"
+
+        cleaned, engine_time = _timed(Text_Engine.clean_column, series, 1)
+        assert cleaned.iloc[:len(expected)].equals(expected)
+        del cleaned
+
+        if cores > 1:
+            _, parallel_time = _timed(Text_Engine.clean_column, series, cores)
+            parallel = f"{parallel_time:>14.3f}"
+        else:
+            parallel_time, parallel = engine_time, f"{'n/a':>14}"
+
+        best = min(engine_time, parallel_time)
+        print(f"{n_rows:>10} {old_time:>11.3f}{mark} {engine_time:>10.3f} {parallel} {old_time / best:>8.1f}x")
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [20_000, 1_000_000, 10_000_000]
+    run(sizes)
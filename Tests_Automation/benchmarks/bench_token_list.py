@@ -0,0 +1,63 @@
+"""
+Benchmark: parsarea coloanei 'tokens' după transferul CSV —
+repr + ast.literal_eval (varianta veche) vs. Token_List.
+
+Timpii sunt raportaţi pe un milion de rânduri.
+
+Rulare (din Tests_Automation):
+    python -m benchmarks.bench_token_list [n_rows]
+"""
+import ast
+import io
+import sys
+import time
+
+import pandas as pd
+
+from utils.data_builder import load_base_dataset
+from config.paths import add_client_template_to_syspath
+
+add_client_template_to_syspath()
+
+import Text_Engine  # type: ignore
+import Token_List  # type: ignore
+
+
+def _old_parse(column):
+    return column.apply(lambda x: ast.literal_eval(x) if isinstance(x, str) and x.startswith('[') else [])
+
+
+def _timed(func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - t0
+
+
+def _csv_roundtrip(column):
+    return pd.read_csv(io.StringIO(column.to_frame("tokens").to_csv(index=False)))["tokens"]
+
+
+def run(n_rows):
+    names = load_base_dataset()["name"].sample(n=n_rows, replace=True, random_state=42)
+    tokens = Text_Engine.clean_column(names).map(lambda x: [t for t in x.split() if len(t) > 1])
+    per_million = 1_000_000 / n_rows
+
+    legacy = _csv_roundtrip(tokens)  # to_csv scrie repr(list)
+    old_lists, old_parse = _timed(_old_parse, legacy)
+
+    encoded, encode_time = _timed(Token_List.encode_column, tokens)
+    compact = _csv_roundtrip(encoded)
+    new_lists, new_parse = _timed(Token_List.decode_column, compact)
+    assert new_lists == old_lists.tolist()
+
+    print(f"rows: {n_rows:,}")
+    print(f"{'path':<22} {'parse s/1M rows':>16} {'CSV MB':>8}")
+    print("-" * 48)
+    print(f"{'repr + literal_eval':<22} {old_parse * per_million:>16.3f} {legacy.str.len().sum() / 1e6:>8.1f}")
+    print(f"{'Token_List':<22} {new_parse * per_million:>16.3f} {compact.fillna('').str.len().sum() / 1e6:>8.1f}")
+    print(f"Token_List encode: {encode_time * per_million:.3f} s/1M rows, "
+          f"parse speedup {old_parse / new_parse:.1f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,51 @@
+"""
+Benchmark: costul unei etape (serializare + parsare) pentru fiecare format de transfer.
+
+Rulare (din Tests_Automation):
+    python -m benchmarks.bench_transfer_formats [n_rows_sintetic]
+"""
+import sys
+import time
+
+from utils.data_builder import load_base_dataset, build_synthetic_dataset
+from config.paths import add_client_template_to_syspath
+
+add_client_template_to_syspath()
+
+import Transfer_Format  # type: ignore
+
+
+def _measure(df, fmt, repeat=3):
+    best_encode, best_decode, size = float("inf"), float("inf"), 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        data, used_fmt = Transfer_Format.encode_dataframe(df, fmt)
+        t1 = time.perf_counter()
+        Transfer_Format.decode_dataframe(data, used_fmt)
+        t2 = time.perf_counter()
+        best_encode = min(best_encode, t1 - t0)
+        best_decode = min(best_decode, t2 - t1)
+        size = len(data)
+    return used_fmt, best_encode, best_decode, size
+
+
+def run(datasets):
+    print(f"{'dataset':<14} {'format':<8} {'serialize s':>12} {'parse s':>10} {'stage s':>10} {'MB':>9}")
+    print("-" * 68)
+    for label, df in datasets:
+        # cleaned_text imită coloanele adăugate de etapele de preprocesare
+        df = df.assign(cleaned_text=df["name"].str.lower())
+        for fmt in Transfer_Format.available_formats():
+            used_fmt, enc, dec, size = _measure(df, fmt, repeat=1 if len(df) > 1_000_000 else 3)
+            # o etapă = server -> client şi client -> server
+            stage = 2 * (enc + dec)
+            print(f"{label:<14} {used_fmt:<8} {enc:>12.3f} {dec:>10.3f} {stage:>10.3f} {size / 1e6:>9.1f}")
+        print()
+
+
+if __name__ == "__main__":
+    n_synthetic = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    run([
+        ("real 20k", load_base_dataset()),
+        (f"synth {n_synthetic // 1000}k", build_synthetic_dataset(n_synthetic)),
+    ])
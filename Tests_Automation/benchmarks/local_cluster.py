@@ -0,0 +1,86 @@
+"""
+Server + clienţi-plugin locali pentru benchmark-uri end-to-end.
+
+Serverul (ConnectionManager + WorkflowManager) rulează în procesul curent,
+fiecare client este un proces separat care importă plugin-ul real, exact
+cum îl porneşte utilizatorul, doar fără GUI.
+"""
+import subprocess
+import sys
+import tempfile
+import time
+
+from config.paths import SERVER_ROOT, PROJECT_ROOT
+
+if str(SERVER_ROOT) not in sys.path:
+    sys.path.insert(0, str(SERVER_ROOT))
+
+from App_Functions.Connection_Manager import ConnectionManager  # type: ignore
+from App_Functions import Workflow_Manager  # type: ignore
+from App.Server import send_file_to_client, receive_file_from_client, send_message  # type: ignore
+
+_CLIENT_CODE = """
+import sys, time, importlib
+sys.path.insert(0, {root!r})
+import pandas  # clientul rulează mult timp: importul nu intră în măsurători
+base = importlib.import_module({module!r}).base
+base.CLIENT_NAME = {name!r}
+base.SERVER_IP, base.PORT = "127.0.0.1", {port}
+base.connect()
+while base.connected:
+    time.sleep(0.2)
+"""
+
+
+class LocalCluster:
+    """
+    Context manager: porneşte serverul şi clienţii.
+
+    clients: listă de (modul plugin, nume client), de ex.
+             ("Client.Plugins.Text_Preprocesare.Plugin_Text_Cleaner", "Text_Cleaner_2")
+    """
+
+    def __init__(self, clients, connect_timeout=30.0):
+        self.specs = clients
+        self.connect_timeout = connect_timeout
+        self.clients, self.names = {}, set()
+        self.manager = ConnectionManager(self.clients, self.names)
+        self.processes = []
+        self.workdir = tempfile.TemporaryDirectory()
+
+    def __enter__(self):
+        _, port = self.manager.start("127.0.0.1", 0)
+        for module, name in self.specs:
+            code = _CLIENT_CODE.format(root=str(PROJECT_ROOT), module=module, name=name, port=port)
+            self.processes.append(subprocess.Popen(
+                [sys.executable, "-c", code], cwd=self.workdir.name,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+
+        deadline = time.monotonic() + self.connect_timeout
+        while len(self.clients) < len(self.specs):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Only {len(self.clients)}/{len(self.specs)} clients connected")
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc):
+        self.manager.stop()
+        for p in self.processes:
+            try:
+                p.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                p.kill()
+        self.workdir.cleanup()
+
+    def workflow(self):
+        return Workflow_Manager.WorkflowManager(
+            clients_dict=self.clients,
+            send_file_func=send_file_to_client,
+            receive_file_func=receive_file_from_client,
+            send_message_func=send_message,
+            borrow_func=self.manager.borrow,
+            capabilities_dict=self.manager.capabilities,
+        )
+
+    def sorted_clients(self):
+        return sorted(self.clients.items(), key=lambda item: item[1][2])
@@ -19,3 +19,14 @@ def add_project_to_syspath():
     import sys
     if str(PROJECT_ROOT) not in sys.path:
         sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def add_client_template_to_syspath():
+    """
+    Adaugă Client/Client_Template în sys.path, la fel ca plugin-urile,
+    pentru modulele comune: Transfer_Format etc.
+    """
+    import sys
+    template_dir = str(CLIENT_ROOT / "Client_Template")
+    if template_dir not in sys.path:
+        sys.path.append(template_dir)
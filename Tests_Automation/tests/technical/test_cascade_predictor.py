@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.naive_bayes import GaussianNB
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.preprocessing import LabelEncoder
+
+from utils.data_builder import load_base_dataset
+from config.paths import add_client_template_to_syspath
+
+add_client_template_to_syspath()
+
+import Cascade_Predictor  # type: ignore
+
+
+def _train(df, categorical_cols, target, model=None):
+    """Acelaşi format de artefact ca plugin-urile de antrenare"""
+    feature_cols = ['size (cm)', 'weight (g)', 'avg_price (MDL)']
+    X = df[feature_cols].copy()
+    le_dict = {}
+    for col in categorical_cols:
+        le = LabelEncoder()
+        X[f'{col}_encoded'] = le.fit_transform(df[col].astype(str))
+        le_dict[col] = le
+        feature_cols.append(f'{col}_encoded')
+    le_target = LabelEncoder()
+    y = le_target.fit_transform(df[target])
+    if model is None:
+        model = RandomForestClassifier(n_estimators=10, max_depth=6, random_state=0)
+    model.fit(X[feature_cols], y)
+    return {'model': model, 'feature_cols': feature_cols, 'le_dict': le_dict, 'le_target': le_target}
+
+
+def _predict_row(row, model_data, overrides):
+    """Versiunea rând-cu-rând (cum era în Plugin_Prediction_Client)"""
+    sample = {}
+    for col in model_data['feature_cols']:
+        if col.endswith('_encoded'):
+            source = col[:-len('_encoded')]
+            le = model_data['le_dict'][source]
+            val = str(overrides.get(source, row[source]))
+            sample[col] = [le.transform([val])[0] if val in le.classes_ else 0]
+        else:
+            sample[col] = [row[col]]
+    X = pd.DataFrame(sample)[model_data['feature_cols']]
+    label = model_data['le_target'].inverse_transform(model_data['model'].predict(X))[0]
+    return label, model_data['model'].predict_proba(X)[0]
+
+
+def test_batch_cascade_matches_row_by_row_predictions():
+    df = load_base_dataset(limit=400)
+    model1_data = _train(df, ['shape', 'color', 'taste'], 'type')
+    model2_data = _train(df, ['shape', 'color', 'taste', 'type'], 'name')
+
+    sample = df.head(25).copy()
+    sample.loc[sample.index[0], 'color'] = 'ultraviolet'   # categorie necunoscută -> 0
+
+    pred = Cascade_Predictor.predict_cascade(sample, model1_data, model2_data, top_k=3)
+
+    for pos, (_, row) in enumerate(sample.iterrows()):
+        type_label, type_proba = _predict_row(row, model1_data, {})
+        name_label, name_proba = _predict_row(row, model2_data, {'type': type_label})
+
+        assert pred['type'][pos] == type_label
+        assert pred['name'][pos] == name_label
+        assert np.isclose(pred['type_confidence'][pos], type_proba.max())
+        assert np.isclose(pred['name_confidence'][pos], name_proba.max())
+        assert np.allclose(pred['top_confidences'][pos], np.sort(name_proba)[::-1][:3])
+
+
+@pytest.mark.parametrize("model2", [None, GaussianNB()],
+                         ids=["forest", "predict_proba"])
+def test_compiled_single_prediction_matches_batch_cascade(model2):
+    df = load_base_dataset(limit=400)
+    model1_data = _train(df, ['shape', 'color', 'taste'], 'type',
+                         DecisionTreeClassifier(max_depth=5, random_state=0))
+    model2_data = _train(df, ['shape', 'color', 'taste', 'type'], 'name', model2)
+
+    sample = df.head(25).copy()
+    sample.loc[sample.index[0], 'color'] = 'ultraviolet'   # categorie necunoscută -> 0
+    batch = Cascade_Predictor.predict_cascade(sample, model1_data, model2_data, top_k=3)
+    predictor = Cascade_Predictor.CompiledCascade(model1_data, model2_data)
+
+    for pos, row in enumerate(sample.to_dict('records')):
+        pred = predictor.predict(row, top_k=3)
+        assert pred['type'] == batch['type'][pos]
+        assert pred['name'] == batch['name'][pos]
+        assert np.isclose(pred['type_confidence'], batch['type_confidence'][pos])
+        assert np.allclose(pred['top_confidences'], batch['top_confidences'][pos])
+
+
+@pytest.mark.parametrize("model", [DecisionTreeClassifier(max_depth=5, random_state=0),
+                                   RandomForestClassifier(n_estimators=10, max_depth=6, random_state=0)],
+                         ids=["tree", "forest"])
+def test_compiled_model_proba_matches_sklearn(model):
+    df = load_base_dataset(limit=400)
+    model_data = _train(df, ['shape', 'color', 'taste'], 'name', model)
+    compiled = Cascade_Predictor.CompiledModel(model_data)
+
+    for row in df.head(25).to_dict('records'):
+        x = compiled.vector(row)
+        expected = model.predict_proba(pd.DataFrame(x, columns=model_data['feature_cols']))[0]
+        assert np.allclose(compiled.predict_proba(x), expected)
+
+
+def test_compiled_model_normalizes_leaf_counts():
+    """Frunzele din sklearn < 1.4 păstrează numărul ponderat de exemple, nu fracţii"""
+    df = load_base_dataset(limit=400)
+    model_data = _train(df, ['shape', 'color', 'taste'], 'type',
+                        DecisionTreeClassifier(max_depth=5, random_state=0))
+    compiled = Cascade_Predictor.CompiledModel(model_data)
+    x = compiled.vector(df.iloc[0].to_dict())
+    expected = compiled.predict_proba(x)
+
+    class _CountTree:
+        def __init__(self, tree):
+            self.tree = tree
+
+        def predict(self, x):
+            return self.tree.predict(x) * 37.0
+
+    compiled.trees = [_CountTree(tree) for tree in compiled.trees]
+    assert np.allclose(compiled.predict_proba(x), expected)
+    assert np.isclose(compiled.predict_proba(x).sum(), 1.0)
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+from config.paths import add_client_template_to_syspath
+
+add_client_template_to_syspath()
+
+import Category_Encoder  # type: ignore
+
+
+def _reference(le, values):
+    """Varianta veche din plugin-urile de validare"""
+    return pd.Series(values).astype(str).map(
+        lambda x: le.transform([x])[0] if x in le.classes_ else -1
+    ).to_numpy()
+
+
+def test_encode_matches_label_encoder_with_unknowns():
+    le = LabelEncoder().fit(["red", "green", "yellow", "nan"])
+    values = ["green", "purple", "red", None, "yellow", "green", np.nan]
+
+    assert list(Category_Encoder.encode(le, values)) == list(_reference(le, values))
+    assert list(Category_Encoder.encode(le, ["purple"], unknown=0)) == [0]
+
+
+def test_encode_categorical_column_and_refit():
+    le = LabelEncoder().fit(["a", "b", "c"])
+    values = pd.Series(pd.Categorical(["c", "a", "x", None, "c"]))
+    assert list(Category_Encoder.encode(le, values)) == [2, 0, -1, -1, 2]
+
+    # encoderul reantrenat nu foloseşte indexul vechi din cache
+    le.fit(["c", "z"])
+    assert list(Category_Encoder.encode(le, ["c", "z", "a"])) == [0, 1, -1]
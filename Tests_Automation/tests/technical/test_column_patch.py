@@ -0,0 +1,68 @@
+import pandas as pd
+
+from utils.data_builder import load_base_dataset
+from config.paths import add_project_to_syspath, add_client_template_to_syspath
+
+add_project_to_syspath()
+add_client_template_to_syspath()
+
+from Client.Plugins.Text_Preprocesare import Plugin_Text_Cleaner as cleaner  # type: ignore
+from Server.App_Functions import Workflow_Manager  # type: ignore
+import Transfer_Format  # type: ignore
+
+
+def _run_cleaner(df, accept_patch):
+    base = cleaner.base
+    base.csv_data = None
+    base.dataframe = df
+    base.dataset_format = Transfer_Format.FORMAT_PICKLE
+    base.accept_column_patch = accept_patch
+    try:
+        return cleaner.do_work()
+    finally:
+        base.dataframe = None
+        base.dataset_format = Transfer_Format.FORMAT_CSV
+        base.accept_column_patch = False
+
+
+def test_cleaner_returns_only_new_column():
+    df = load_base_dataset(limit=50)
+
+    msg, result = _run_cleaner(df.copy(), accept_patch=True)
+
+    assert "Error" not in msg
+    assert isinstance(result, Transfer_Format.ColumnPatch)
+    assert result.columns == ["cleaned_text"]
+
+    # fără suport pe server se întoarce setul complet
+    _, full = _run_cleaner(df.copy(), accept_patch=False)
+    assert isinstance(full, pd.DataFrame)
+    assert len(full.columns) == len(df.columns) + 1
+
+
+def test_patch_round_trip_keeps_row_ids():
+    patch = pd.DataFrame({"score": [0.5, 0.9]}, index=[7, 3])
+
+    for fmt in Transfer_Format.available_formats():
+        data, used_fmt = Transfer_Format.encode_column_patch(patch, fmt)
+        restored = Transfer_Format.decode_column_patch(data, used_fmt)
+        assert list(restored.index) == [7, 3]
+        assert list(restored["score"]) == [0.5, 0.9]
+
+
+def test_server_merges_patch_by_row_id(tmp_path):
+    df = load_base_dataset(limit=10)
+    Workflow_Manager.set_csv_data(df.to_csv(index=False), str(tmp_path / "temp_patch.csv"))
+
+    patch = pd.DataFrame({"predicted_category": ["A", "B"]}, index=[2, 5])
+    data, fmt = Transfer_Format.encode_column_patch(patch, Transfer_Format.FORMAT_PICKLE)
+    Workflow_Manager._apply_column_patch({"format": fmt}, data)
+
+    merged = Workflow_Manager.get_current_dataframe()
+    assert len(merged) == len(df)
+    assert merged.loc[2, "predicted_category"] == "A"
+    assert merged.loc[5, "predicted_category"] == "B"
+    assert merged["predicted_category"].isna().sum() == len(df) - 2
+    # CSV este regenerat la cerere, cu noua coloană
+    csv_text, _ = Workflow_Manager.get_csv_data()
+    assert "predicted_category" in csv_text.splitlines()[0]
@@ -0,0 +1,87 @@
+import socket
+import threading
+
+import pytest
+
+from utils.data_builder import load_base_dataset
+from config.paths import add_project_to_syspath, add_client_template_to_syspath
+
+add_project_to_syspath()
+add_client_template_to_syspath()
+
+from Server.App import Server  # type: ignore
+import Client_Template as base  # type: ignore
+import Compression  # type: ignore
+import Receive_Buffer  # type: ignore
+
+
+def _csv_bytes(limit=2000):
+    return load_base_dataset(limit=limit).to_csv(index=False).encode("utf-8")
+
+
+def _exchange(send, spill_dir=None):
+    """send(sock) rulează într-un fir separat; întoarce (header, data) primite de base.recv_message"""
+    left, right = socket.socketpair()
+    sender = threading.Thread(target=send, args=(left,))
+    sender.start()
+    try:
+        return base.recv_message(right, spill_dir=spill_dir)
+    finally:
+        sender.join()
+        left.close()
+        right.close()
+
+
+def test_codec_is_chosen_from_size_and_common_codecs(monkeypatch):
+    monkeypatch.setattr(Compression, "COMPRESS_MIN_BYTES", 100)
+    assert Compression.available_codecs()[-1] == "zlib"
+    assert Compression.choose_codec(["zlib"], 99) is None
+    assert Compression.choose_codec(["zlib"], 100) == "zlib"
+    assert Compression.choose_codec(["brotli"], 1000) is None
+    assert Compression.choose_codec(None, 1000) is None
+    # acelaşi host: loopback este mai rapid decât orice codec
+    assert Compression.choose_codec(["zlib"], 1000, "127.0.0.1") is None
+    assert Compression.choose_codec(["zlib"], 1000, "192.168.1.20") == "zlib"
+
+
+@pytest.mark.parametrize("codec", Compression.available_codecs())
+def test_compressed_message_roundtrip_in_small_blocks(codec, monkeypatch):
+    monkeypatch.setattr(Compression, "BLOCK_SIZE", 4096)
+    payload = _csv_bytes()
+    header = {"action": "work_result", "size": len(payload)}
+
+    received, data = _exchange(lambda s: base.send_message(s, header, payload, codec))
+    assert received["codec"] == codec
+    assert received["size"] == len(payload)
+    assert data == payload
+
+
+def test_compressed_file_is_spilled_to_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(Compression, "BLOCK_SIZE", 4096)
+    monkeypatch.setattr(Receive_Buffer, "SPILL_THRESHOLD", 1024)
+    payload = _csv_bytes()
+    source = tmp_path / "dataset.csv"
+    source.write_bytes(payload)
+    spill_dir = tmp_path / "recv"
+    spill_dir.mkdir()
+
+    header, data = _exchange(lambda s: Server.send_file_to_client(s, str(source), codec="zlib"),
+                             spill_dir=spill_dir)
+    assert header["codec"] == "zlib"
+    assert Receive_Buffer.is_spilled(data)
+    assert data[:] == payload
+    Receive_Buffer.release_payload(data)
+    assert list(spill_dir.iterdir()) == []
+
+
+def test_truncated_stream_releases_spill_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(Receive_Buffer, "SPILL_THRESHOLD", 1024)
+    payload = _csv_bytes(limit=200)
+
+    def send_short(sock):
+        # "size" anunţă mai mult decât conţine fluxul comprimat
+        base.send_message(sock, {"action": "work_result", "size": len(payload) + 10}, payload, "zlib")
+
+    with pytest.raises(ValueError):
+        _exchange(send_short, spill_dir=tmp_path)
+    assert list(tmp_path.iterdir()) == []
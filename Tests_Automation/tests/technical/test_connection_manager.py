@@ -0,0 +1,125 @@
+import socket
+import threading
+import time
+
+from config.paths import add_project_to_syspath
+
+add_project_to_syspath()
+
+from Server.App_Functions.Connection_Manager import ConnectionManager  # type: ignore
+
+
+def _start_manager():
+    clients, names = {}, set()
+    manager = ConnectionManager(clients, names)
+    host, port = manager.start("127.0.0.1", 0)
+    return manager, clients, names, (host, port)
+
+
+def _handshake(address, name, level=1, mode="Parallel"):
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    s.settimeout(3.0)
+    s.connect(address)
+    s.send(f"{name}|{level}|{mode}".encode("utf-8"))
+    return s, s.recv(1024).decode("utf-8")
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_handshake_disconnect_and_dead_peer():
+    manager, clients, names, address = _start_manager()
+    try:
+        s1, resp1 = _handshake(address, "Cleaner", 1, "Sequential")
+        s2, resp2 = _handshake(address, "Cleaner", 2, "Sequential")
+        s3, resp3 = _handshake(address, "Tokenizer", 2, "Sequential")
+
+        assert resp1 == "CONNECTED"
+        assert resp2.startswith("ERROR")
+        assert resp3 == "CONNECTED"
+        assert _wait_for(lambda: len(clients) == 2)
+
+        # formatul folosit de WorkflowManager: addr -> (conn, name, level, mode)
+        _, name, level, mode = next(v for v in clients.values() if v[1] == "Tokenizer")
+        assert (name, level, mode) == ("Tokenizer", 2, "Sequential")
+
+        # DISCONNECT explicit
+        s1.send(b"DISCONNECT")
+        assert _wait_for(lambda: "Cleaner" not in names)
+
+        # peer mort: socket închis fără mesaj
+        s3.close()
+        assert _wait_for(lambda: len(clients) == 0)
+        s1.close()
+        s2.close()
+    finally:
+        manager.stop()
+
+
+def test_borrowed_socket_is_not_read_by_event_loop():
+    manager, clients, _, address = _start_manager()
+    try:
+        s, resp = _handshake(address, "Worker")
+        assert resp == "CONNECTED"
+        assert _wait_for(lambda: len(clients) == 1)
+        addr = next(iter(clients))
+
+        with manager.borrow(addr) as conn:
+            conn.settimeout(2.0)
+            s.send(b"RESULT")
+            assert conn.recv(1024) == b"RESULT"
+
+        # după returnare, bucla de evenimente vede din nou DISCONNECT
+        s.send(b"DISCONNECT")
+        assert _wait_for(lambda: len(clients) == 0)
+        s.close()
+    finally:
+        manager.stop()
+
+
+def test_idle_clients_do_not_wake_the_event_loop():
+    """
+    1000 de clienţi conectaţi şi inactivi nu creează fire de execuţie,
+    iar bucla de evenimente stă blocată în select() fără timeout.
+    (CPU şi memoria în repaus: benchmarks/bench_idle_clients.py)
+    """
+    n_clients = 1000
+    manager, clients, _, address = _start_manager()
+    sockets = []
+    threads_before = threading.active_count()
+    select_calls = []
+    select = manager.selector.select
+
+    def counting_select(timeout=None):
+        select_calls.append(timeout)
+        return select(timeout)
+
+    manager.selector.select = counting_select
+    try:
+        for i in range(n_clients):
+            s, resp = _handshake(address, f"Idle{i}")
+            assert resp == "CONNECTED"
+            sockets.append(s)
+        assert _wait_for(lambda: len(clients) == n_clients, timeout=10.0)
+
+        # niciun fir de execuţie nou per client
+        assert threading.active_count() <= threads_before
+        # fără handshake-uri în aşteptare bucla nu are de ce să se trezească singură
+        assert manager._next_timeout() is None
+
+        calls = len(select_calls)
+        time.sleep(0.5)
+        # cel mult reintrarea după ultimul handshake, apoi blocare fără timeout
+        assert len(select_calls) - calls <= 1
+        assert select_calls[-1] is None
+        assert len(clients) == n_clients
+    finally:
+        for s in sockets:
+            s.close()
+        manager.stop()
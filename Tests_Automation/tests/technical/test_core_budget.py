@@ -0,0 +1,76 @@
+import os
+import threading
+
+from config.paths import add_project_to_syspath, add_client_template_to_syspath
+
+add_project_to_syspath()
+add_client_template_to_syspath()
+
+from Server.App_Functions import Workflow_Manager  # type: ignore
+from Server.App_Functions import Workflow_Graph  # type: ignore
+import Core_Budget  # type: ignore
+import Parallel_CV  # type: ignore
+
+
+def test_limit_sets_stage_budget_and_restores_it():
+    before = os.environ.get("OMP_NUM_THREADS")
+    assert Core_Budget.n_jobs() == Core_Budget.host_cores()
+
+    with Core_Budget.limit(3):
+        assert Core_Budget.n_jobs() == 3
+        assert os.environ["OMP_NUM_THREADS"] == "3"
+        # fold-urile validării nu depăşesc bugetul etapei
+        assert Parallel_CV.worker_count(5) == 3
+
+    assert Core_Budget.n_jobs() == Core_Budget.host_cores()
+    assert os.environ.get("OMP_NUM_THREADS") == before
+    with Core_Budget.limit(None):
+        assert Core_Budget.n_jobs() == Core_Budget.host_cores()
+
+
+def test_ledger_shares_free_cores_and_takes_them_back():
+    ledger = Core_Budget.CoreLedger({"hostA": 8})
+    assert [ledger.acquire("hostA", 4 - i) for i in range(4)] == [2, 2, 2, 2]
+    # gazda este ocupată: etapa primeşte totuşi un nucleu
+    assert ledger.acquire("hostA") == 1
+    ledger.release("hostA", 1)
+    ledger.release("hostA", 2)
+    assert ledger.acquire("hostA") == 2
+    assert ledger.acquire("unknown") is None
+
+
+def test_parallel_nodes_on_one_host_split_its_cores():
+    resources = {
+        "Train1": (["column:model_target"], ["model:model1", "column:m1"]),
+        "Val1": (["model:model1", "column:model_target"], ["column:v1"]),
+        "Train2": (["column:model_target"], ["model:model2", "column:m2"]),
+        "Val2": (["model:model2", "column:model_target"], ["column:v2"]),
+        "Remote": (["column:model_target"], ["column:r"]),
+    }
+    clients, capabilities = [], {}
+    for level, name in enumerate(resources, start=4):
+        addr = ("10.0.0.1", level)
+        capabilities[addr] = {"inputs": resources[name][0], "outputs": resources[name][1],
+                              "host": "hostA", "cores": 8}
+        clients.append((addr, None, name, level, "Parallel", capabilities[addr]))
+    # client vechi, fără host/cores în handshake: nu primeşte buget
+    del capabilities[("10.0.0.1", 8)]["host"]
+
+    nodes = Workflow_Graph.merge_chains(Workflow_Graph.build_graph(Workflow_Graph.build_nodes(clients)))
+    workflow = Workflow_Manager.WorkflowManager({}, None, None, None, capabilities_dict=capabilities)
+    budgets, lock = {}, threading.Lock()
+
+    def fake_run_node(node):
+        addr = node.stages[0][0]
+        with lock:
+            budgets[node.name] = workflow._budgets.get(addr)
+        return True
+
+    workflow._run_node = fake_run_node
+    workflow._run_graph(nodes)
+
+    assert budgets["Train1"] == budgets["Train2"] == 4
+    assert budgets["Remote"] is None
+    # validarea porneşte după antrenarea sa şi primeşte nucleele eliberate
+    assert budgets["Val1"] >= 1 and budgets["Val2"] >= 1
+    assert workflow._budgets == {}
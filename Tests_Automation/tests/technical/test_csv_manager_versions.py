@@ -0,0 +1,36 @@
+from utils.data_builder import load_base_dataset
+from config.paths import add_project_to_syspath
+
+add_project_to_syspath()
+
+from Server.App_Functions import CSV_Manager as csvm  # type: ignore
+from Server.App_Functions import Workflow_Manager  # type: ignore
+
+
+def test_parsed_table_is_shared_and_inspections_do_not_reparse(tmp_path, monkeypatch):
+    df = load_base_dataset(limit=100)
+    Workflow_Manager.set_csv_data(df.to_csv(index=False), str(tmp_path / "temp_versions.csv"))
+    version = csvm.get_version()
+
+    parses = []
+    read_csv = csvm.pd.read_csv
+    monkeypatch.setattr(csvm.pd, "read_csv", lambda *a, **k: parses.append(1) or read_csv(*a, **k))
+
+    for _ in range(5):
+        assert csvm.get_csv_info()["rows"] == 100
+        assert csvm.validate_csv_data() == (True, "Data is valid")
+        # WorkflowManager şi CSV_Manager văd aceeaşi copie
+        assert Workflow_Manager.get_current_dataframe() is csvm.get_dataframe()
+    assert len(parses) == 1
+
+    # o actualizare creează o versiune nouă şi invalidează formele serializate
+    encoded, _ = csvm.get_encoded("pickle")
+    csvm.set_dataframe(df.assign(extra=1))
+    assert csvm.get_version() == version + 1
+    assert csvm.get_encoded("pickle")[0] != encoded
+    assert csvm.get_csv_info()["columns"] == len(df.columns) + 1
+    assert len(parses) == 1
+
+    # fişierul temporar se scrie doar când este cerut
+    path = csvm.materialize_csv_file()
+    assert open(path, encoding="utf-8").read() == csvm.get_current_csv_data()
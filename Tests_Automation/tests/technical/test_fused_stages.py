@@ -0,0 +1,64 @@
+from utils.data_builder import load_base_dataset
+from config.paths import add_project_to_syspath, add_client_template_to_syspath
+
+add_project_to_syspath()
+add_client_template_to_syspath()
+
+from Client.Plugins.Text_Preprocesare import (  # type: ignore
+    Plugin_Text_Cleaner as cleaner,
+    Plugin_Tokenizer as tokenizer,
+    Plugin_Lemmatizer as lemmatizer,
+)
+from Server.App_Functions import Workflow_Manager  # type: ignore
+import Transfer_Format  # type: ignore
+
+base = cleaner.base
+
+
+def test_fused_request_runs_three_levels_in_one_process(tmp_path, monkeypatch):
+    monkeypatch.setattr(base, "do_work", cleaner.do_work)
+    monkeypatch.setattr(base, "RECV_DIR", tmp_path)
+    monkeypatch.setattr(base, "PROCESSED_DIR", tmp_path)
+    # handle_work_request schimbă starea globală a clientului
+    for attr in ("csv_data", "dataframe", "dataset_format", "accept_column_patch", "csv_file_path"):
+        monkeypatch.setattr(base, attr, getattr(base, attr))
+    name_before = base.CLIENT_NAME
+
+    df = load_base_dataset(limit=200)
+    data, fmt = Transfer_Format.encode_dataframe(df, Transfer_Format.FORMAT_PICKLE)
+    header = {"action": "work_request", "filename": "data.pkl", "format": fmt,
+              "accepts": ["return_file", "return_columns"],
+              "fuse": [tokenizer.__file__, lemmatizer.__file__], "size": len(data)}
+
+    reply, payload = base.handle_work_request(header, data)
+
+    # un singur răspuns cu tot setul după ultimul nivel
+    assert reply["result"] == "return_file"
+    assert reply["status"].splitlines()[-1].startswith("Lemmatizer")
+    result = Transfer_Format.decode_dataframe(payload, reply["format"])
+    assert len(result) == len(df)
+    assert {"cleaned_text", "tokens", "lemmas", "model_target"} <= set(result.columns)
+    # încărcarea celorlalte plugin-uri nu schimbă identitatea clientului
+    assert base.CLIENT_NAME == name_before
+    assert base.do_work is cleaner.do_work
+
+
+def test_only_single_client_levels_on_one_host_are_fused():
+    capabilities = {
+        ("10.0.0.1", 1): {"plugin": "/p/cleaner.py"},
+        ("10.0.0.1", 2): {"plugin": "/p/tokenizer.py"},
+        ("10.0.0.1", 3): {"plugin": "/p/lemmatizer.py"},
+        ("10.0.0.2", 4): {"plugin": "/p/other.py"},
+        ("10.0.0.2", 5): {"plugin": "/p/shard.py"},
+        ("10.0.0.2", 6): {"plugin": "/p/shard.py"},
+    }
+    stages = [(addr, None, f"C{addr[1]}", level)
+              for addr, level in zip(capabilities, [1, 2, 3, 4, 5, 5])]
+    workflow = Workflow_Manager.WorkflowManager({}, None, None, None, capabilities_dict=capabilities)
+
+    groups = workflow._group_fused_stages(stages)
+
+    assert [(kind, [s[2] for s in group]) for kind, group in groups] == [
+        ("fused", ["C1", "C2", "C3"]),
+        ("rest", ["C4", "C5", "C6"]),
+    ]
@@ -0,0 +1,38 @@
+import pandas as pd
+
+from config.paths import add_project_to_syspath, add_client_template_to_syspath
+
+add_project_to_syspath()
+add_client_template_to_syspath()
+
+from Client.Plugins.Text_Preprocesare import Plugin_Lemmatizer as lemmatizer  # type: ignore
+import Lemma_Dictionary  # type: ignore
+import Token_List  # type: ignore
+
+
+def test_mapped_dictionary_lookups(tmp_path):
+    mapping = {f"word{i}s": f"word{i}" for i in range(100_000)}
+    mapping.update({"ţelină": "ţelina", "a": "a-lemma", "zzz": "z"})
+    path = tmp_path / "lemmas.tsv"
+    Lemma_Dictionary.write_dictionary(mapping, path)
+
+    dictionary = Lemma_Dictionary.open_dictionary(str(path))
+    assert Lemma_Dictionary.open_dictionary(str(path)) is dictionary  # deschis o singură dată
+
+    for token in ["word0s", "word99999s", "word5000s", "ţelină", "a", "zzz"]:
+        assert dictionary.get(token) == mapping[token]
+    for token in ["", "word", "word100000s", "zzzz", "0"]:
+        assert dictionary.get(token) is None
+
+
+def test_vocabulary_lemmatization_matches_per_token_lookup(tmp_path, monkeypatch):
+    path = tmp_path / "lemmas.tsv"
+    Lemma_Dictionary.write_dictionary({"pears": "pear", "apples": "EXTERNAL"}, path)
+    monkeypatch.setattr(lemmatizer, "LEMMA_DICT_FILE", str(path))
+
+    rows = [["red", "apples"], [], ["pears", "a|b"], ["apples", "apples", "pears"]]
+    values = pd.Series([Token_List.encode_tokens(r) for r in rows])
+
+    lemmas = [Token_List.decode_tokens(v) for v in lemmatizer.lemmatize_column(values)]
+    # LEMMA_DICT are prioritate faţă de dicţionarul extern
+    assert lemmas == [["red", "apple"], [], ["pear", "a|b"], ["apple", "apple", "pear"]]
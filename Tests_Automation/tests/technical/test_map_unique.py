@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from config.paths import add_client_template_to_syspath
+
+add_client_template_to_syspath()
+
+import Client_Template as base  # type: ignore
+import Text_Engine  # type: ignore
+
+
+def test_func_runs_once_per_distinct_value_and_keeps_index():
+    series = pd.Series(["Red Apple", "Red Apple", np.nan, "Kiwi", "Kiwi"], index=[7, 3, 9, 1, 5], name="name")
+    calls = []
+
+    def tokenize(value):
+        calls.append(value)
+        return str(value).lower().split()
+
+    result = base.map_unique(series, tokenize)
+
+    assert len(calls) == 3
+    assert list(result.index) == [7, 3, 9, 1, 5]
+    assert result.name == "name"
+    assert result.tolist() == [["red", "apple"], ["red", "apple"], ["nan"], ["kiwi"], ["kiwi"]]
+
+
+def test_batch_mode_matches_whole_column_engine():
+    series = pd.Series(["Măr 1!", "Pear", "Măr 1!", None] * 10)
+    result = base.map_unique(series, Text_Engine.clean_column, batch=True)
+    assert result.tolist() == Text_Engine.clean_column(series).tolist()
+
+
+def test_unhashable_values_fall_back_to_row_by_row():
+    series = pd.Series([["a", "b"], ["a", "b"], []])
+    assert base.map_unique(series, len).tolist() == [2, 2, 0]
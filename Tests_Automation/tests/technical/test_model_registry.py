@@ -0,0 +1,63 @@
+import json
+
+from config.paths import add_client_template_to_syspath
+
+add_client_template_to_syspath()
+
+import Model_Registry  # type: ignore
+
+
+def test_load_returns_cached_object_until_artifact_changes(tmp_path):
+    Model_Registry.clear_cache()
+    assert Model_Registry.load_model("model1", tmp_path) is None
+
+    version, digest = Model_Registry.save_model("model1", {"model": [1, 2, 3]}, tmp_path)
+    assert version == 1
+
+    # un alt proces (cache gol) încarcă o singură dată, apoi primeşte acelaşi obiect
+    Model_Registry.clear_cache()
+    first = Model_Registry.load_model("model1", tmp_path)
+    second = Model_Registry.load_model("model1", tmp_path)
+    assert first == {"model": [1, 2, 3]}
+    assert first is second
+    assert Model_Registry.model_hash("model1", tmp_path) == digest
+
+    # artefact nou pe disc -> obiect nou, versiune nouă în manifest
+    version, new_digest = Model_Registry.save_model("model1", {"model": [4]}, tmp_path)
+    Model_Registry.clear_cache()
+    assert Model_Registry.load_model("model1", tmp_path) == {"model": [4]}
+    assert version == 2 and new_digest != digest
+
+    manifest = json.loads((tmp_path / Model_Registry.MANIFEST_FILE).read_text())
+    assert [h["hash"] for h in manifest["model1"]["history"]] == [digest, new_digest]
+
+
+def test_same_content_is_not_a_new_version(tmp_path):
+    v1, h1 = Model_Registry.save_model("model2", {"model": "tree"}, tmp_path)
+    v2, h2 = Model_Registry.save_model("model2", {"model": "tree"}, tmp_path)
+    assert (v1, h1) == (v2, h2)
+
+
+def test_lru_keeps_only_recent_models(tmp_path, monkeypatch):
+    Model_Registry.clear_cache()
+    monkeypatch.setattr(Model_Registry, "MAX_CACHED_MODELS", 2)
+    for i in range(3):
+        Model_Registry.save_model(f"m{i}", {"id": i}, tmp_path)
+
+    assert len(Model_Registry._cache) == 2
+    # modelul evacuat se reîncarcă de pe disc
+    assert Model_Registry.load_model("m0", tmp_path) == {"id": 0}
+
+
+def test_earlier_version_is_restored_from_store(tmp_path):
+    Model_Registry.clear_cache()
+    _, old = Model_Registry.save_model("model1", {"model": "old"}, tmp_path)
+    _, new = Model_Registry.save_model("model1", {"model": "new"}, tmp_path)
+    # modelele salvate de o etapă sunt raportate serverului o singură dată
+    assert Model_Registry.take_saved_models() == {"model1": new}
+    assert Model_Registry.take_saved_models() == {}
+
+    assert Model_Registry.restore_model("model1", old, tmp_path)
+    Model_Registry.clear_cache()
+    assert Model_Registry.load_model("model1", tmp_path) == {"model": "old"}
+    assert not Model_Registry.restore_model("model1", "0" * 64, tmp_path)
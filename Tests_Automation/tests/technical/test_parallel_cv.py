@@ -0,0 +1,29 @@
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import cross_val_score
+
+from utils.data_builder import load_base_dataset
+from config.paths import add_client_template_to_syspath
+
+add_client_template_to_syspath()
+
+import Parallel_CV  # type: ignore
+
+
+def test_parallel_cv_matches_cross_val_score_and_reuses_splits():
+    df = load_base_dataset(limit=300)
+    X = df[['size (cm)', 'weight (g)', 'avg_price (MDL)']]
+    y = (df['type'] == 'fruit').astype(int).to_numpy()
+    model = RandomForestClassifier(n_estimators=10, random_state=0, n_jobs=-1)
+
+    scores, timing = Parallel_CV.cross_validate_folds(model, X, y, n_splits=5)
+
+    assert np.allclose(scores, cross_val_score(model, X, y, cv=5))
+    assert timing['split_cache_hit'] is False
+    assert 1 <= timing['n_jobs'] <= 5
+    assert [f['fold'] for f in timing['folds']] == [1, 2, 3, 4, 5]
+    assert all(f['fit_time'] > 0 for f in timing['folds'])
+
+    # aceleaşi date -> împărţirea vine din cache
+    _, timing = Parallel_CV.cross_validate_folds(model, X, y, n_splits=5)
+    assert timing['split_cache_hit'] is True
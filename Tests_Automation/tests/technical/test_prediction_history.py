@@ -0,0 +1,60 @@
+import numpy as np
+
+from config.paths import add_client_template_to_syspath
+
+add_client_template_to_syspath()
+
+import Prediction_History  # type: ignore
+
+
+def _run(n_rows, name, actual=True):
+    """Coloanele unui run, ca în Plugin_Prediction_Client"""
+    columns = {
+        "sample_id": np.arange(n_rows),
+        "size": np.full(n_rows, 5.0),
+        "shape": ["round"] * n_rows,
+        "weight": np.full(n_rows, 150.0),
+        "price": np.full(n_rows, 50.0),
+        "color": ["red"] * n_rows,
+        "taste": ["sweet"] * n_rows,
+        "type": np.array(["fruit"] * n_rows),
+        "type_confidence": np.full(n_rows, 0.9),
+        "name": np.array([name] * n_rows),
+        "name_confidence": np.full(n_rows, 0.8),
+        "top_names": np.array([[name, "pear", "plum"]] * n_rows),
+        "top_confidences": np.tile([0.8, 0.15, 0.05], (n_rows, 1)),
+    }
+    if actual:
+        columns["actual_type"] = ["fruit"] * n_rows
+        columns["actual_name"] = ["apple"] * n_rows
+    return columns
+
+
+def test_runs_are_appended_and_paged_newest_first(tmp_path):
+    first = Prediction_History.append_run(_run(7, "apple"), "Prediction_Client", directory=tmp_path)
+    second = Prediction_History.append_run(_run(5, "cherry", actual=False), directory=tmp_path)
+    assert second > first
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        records, cursor = Prediction_History.read_page(cursor, limit=4, directory=tmp_path)
+        seen += [(r["run_id"], r["sample_id"]) for r in records]
+        pages += 1
+        if cursor is None:
+            break
+    # ultimul run primul, fără goluri sau dubluri la graniţa dintre run-uri
+    assert seen == [(second, i) for i in range(5)] + [(first, i) for i in range(7)]
+    assert pages == 3
+
+    info = Prediction_History.summary(tmp_path)
+    assert (info["runs"], info["predictions"]) == (2, 12) and info["last_run"]
+
+    record = Prediction_History.read_page(directory=tmp_path)[0][0]
+    assert record["predictions"]["model2"]["top3"][0] == {"name": "cherry", "confidence": 0.8}
+    assert "actual" not in record
+
+    # primul run nu este modificat de al doilea
+    samples = Prediction_History.find_sample(3, directory=tmp_path)
+    assert [r["run_id"] for r in samples] == [second, first]
+    assert samples[1]["predictions"]["model2"]["name"] == "apple"
+    assert samples[1]["correct"] == {"model1": True, "model2": True}
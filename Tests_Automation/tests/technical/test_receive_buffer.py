@@ -0,0 +1,51 @@
+import socket
+import threading
+
+from utils.data_builder import load_base_dataset
+from config.paths import add_project_to_syspath, add_client_template_to_syspath
+
+add_project_to_syspath()
+add_client_template_to_syspath()
+
+from Server.App_Functions import CSV_Manager as csvm  # type: ignore
+from Server.App_Functions import Workflow_Manager  # type: ignore
+import Client_Template as base  # type: ignore
+import Receive_Buffer  # type: ignore
+
+
+def _transfer(payload, spill_dir):
+    left, right = socket.socketpair()
+    sender = threading.Thread(target=base.send_message,
+                              args=(left, {"action": "work_result", "size": len(payload)}, payload))
+    sender.start()
+    header, data = base.recv_message(right, spill_dir=spill_dir)
+    sender.join()
+    left.close()
+    right.close()
+    return header, data
+
+
+def test_small_body_is_received_into_one_buffer(tmp_path):
+    header, data = _transfer(b"x" * 1000, tmp_path)
+    assert isinstance(data, bytearray)
+    assert data == b"x" * 1000
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_large_body_is_spilled_to_disk_and_adopted_without_copy(tmp_path, monkeypatch):
+    monkeypatch.setattr(Receive_Buffer, "SPILL_THRESHOLD", 1024)
+    csv_bytes = load_base_dataset(limit=500).to_csv(index=False).encode("utf-8")
+
+    header, data = _transfer(csv_bytes, tmp_path)
+    assert Receive_Buffer.is_spilled(data)
+    assert data[:] == csv_bytes
+    assert data.path.startswith(str(tmp_path))
+
+    # serverul: fişierul primit devine direct fişierul temporar al versiunii noi
+    temp_file = tmp_path / "temp_receive.csv"
+    Workflow_Manager.set_csv_data("a\n1\n", str(temp_file))
+    Workflow_Manager._replace_data(csv_bytes=data)
+
+    assert temp_file.read_bytes() == csv_bytes
+    assert len(csvm.get_dataframe()) == 500
+    assert [p.name for p in tmp_path.iterdir()] == [temp_file.name]
@@ -0,0 +1,34 @@
+import socket
+import sys
+import threading
+
+from config.paths import SERVER_ROOT
+
+if str(SERVER_ROOT) not in sys.path:
+    sys.path.insert(0, str(SERVER_ROOT))
+
+from App.Server import send_file_to_client, recv_message  # type: ignore
+
+
+def test_file_is_streamed_after_framed_header(tmp_path):
+    path = tmp_path / "temp_processing.csv"
+    payload = b"name,type\n" + b"apple,fruit\n" * 200_000
+    path.write_bytes(payload)
+
+    server_side, client_side = socket.socketpair()
+    received = {}
+
+    def read():
+        received["message"] = recv_message(client_side)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    assert send_file_to_client(server_side, str(path), {"action": "work_request", "format": "csv"})
+    reader.join(timeout=10)
+
+    header, data = received["message"]
+    assert header == {"action": "work_request", "filename": "temp_processing.csv",
+                      "size": len(payload), "format": "csv"}
+    assert data == payload
+    server_side.close()
+    client_side.close()
@@ -0,0 +1,158 @@
+import os
+import threading
+
+import pandas as pd
+
+from utils.data_builder import load_base_dataset
+from config.paths import add_project_to_syspath, add_client_template_to_syspath
+
+add_project_to_syspath()
+add_client_template_to_syspath()
+
+from Server.App_Functions import CSV_Manager as csvm  # type: ignore
+from Server.App_Functions import Stage_Cache  # type: ignore
+from Server.App_Functions import Workflow_Manager  # type: ignore
+
+CLIENTS = {
+    ("10.0.0.1", 1): (None, "Prep", 1, "Sequential"),
+    ("10.0.0.1", 4): (None, "Train", 4, "Parallel"),
+    ("10.0.0.1", 8): (None, "Predict", 8, "Sequential"),
+}
+RESOURCES = {
+    "Prep": (["column:name"], ["column:clean", "rows"]),
+    "Train": (["column:clean"], ["model:m", "column:trained"]),
+    "Predict": (["model:m", "column:clean"], ["column:pred"]),
+}
+
+
+def _fake_run_node(workflow, calls):
+    """Nod fals: modifică tabelul comun exact ca plugin-ul real (rânduri / coloane)"""
+    def run_node(node):
+        name = node.stages[0][2]
+        calls.append(name)
+        df = csvm.get_dataframe()
+        if name == "Prep":
+            csvm.set_dataframe(df.sample(frac=1, random_state=0).assign(clean=df["name"].str.lower()))
+        elif name == "Train":
+            csvm.apply_columns(pd.DataFrame({"trained": "yes"}, index=df.index))
+            workflow._artifacts[node.stages[0][0]] = {"m": "hash-of-m"}
+        else:
+            csvm.apply_columns(pd.DataFrame({"pred": df["clean"].str.upper()}, index=df.index))
+        return True
+    return run_node
+
+
+def _run(tmp_path, versions, restored, uncacheable=()):
+    """O apăsare pe Start Work: tabelul iniţial, graful, cheile şi execuţia"""
+    initial = load_base_dataset(limit=100)
+    Workflow_Manager.set_csv_data(initial.to_csv(index=False), str(tmp_path / "temp.csv"))
+    capabilities = {addr: {"inputs": RESOURCES[name][0], "outputs": RESOURCES[name][1],
+                           "version": versions[name], "restore": True,
+                           "cacheable": name not in uncacheable}
+                    for addr, (_, name, _, _) in CLIENTS.items()}
+    workflow = Workflow_Manager.WorkflowManager(dict(CLIENTS), None, None, None,
+                                                capabilities_dict=capabilities)
+    calls = []
+    workflow._run_node = _fake_run_node(workflow, calls)
+
+    def restore_artifacts(node, artifacts):
+        if artifacts:
+            restored.append(artifacts)
+        return True
+
+    workflow._restore_artifacts = restore_artifacts
+
+    nodes = workflow._build_graph(sorted(CLIENTS.items(), key=lambda item: item[1][2]))
+    keys = workflow._stage_keys(nodes, Stage_Cache.dataset_hash(csvm.get_dataframe()))
+    workflow._run_graph(nodes, keys)
+    return sorted(calls), csvm.get_dataframe()
+
+
+def test_unchanged_run_is_replayed_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(Stage_Cache, "CACHE_DIR", tmp_path / "cache")
+    versions = {"Prep": "v1", "Train": "v1", "Predict": "v1"}
+
+    calls, first = _run(tmp_path, versions, [])
+    assert calls == ["Predict", "Prep", "Train"]
+
+    restored = []
+    calls, second = _run(tmp_path, versions, restored)
+    assert calls == []
+    # modelul antrenat este readus la versiunea din cache
+    assert restored == [{"Train": {"m": "hash-of-m"}}]
+    pd.testing.assert_frame_equal(second.sort_index(axis=1), first.sort_index(axis=1))
+
+
+def test_changed_stage_reruns_from_the_first_difference(tmp_path, monkeypatch):
+    monkeypatch.setattr(Stage_Cache, "CACHE_DIR", tmp_path / "cache")
+    versions = {"Prep": "v1", "Train": "v1", "Predict": "v1"}
+    _run(tmp_path, versions, [])
+
+    calls, _ = _run(tmp_path, dict(versions, Predict="v2"), [])
+    assert calls == ["Predict"]
+
+    calls, _ = _run(tmp_path, dict(versions, Prep="v2"), [])
+    assert calls == ["Predict", "Prep", "Train"]
+
+
+def test_uncacheable_stage_runs_on_cache_hit(tmp_path, monkeypatch):
+    monkeypatch.setattr(Stage_Cache, "CACHE_DIR", tmp_path / "cache")
+    versions = {"Prep": "v1", "Train": "v1", "Predict": "v1"}
+    _run(tmp_path, versions, [], uncacheable={"Predict"})
+
+    # Predict scrie istoria predicţiilor: rulează şi când restul vine din cache
+    restored = []
+    calls, second = _run(tmp_path, versions, restored, uncacheable={"Predict"})
+    assert calls == ["Predict"]
+    assert restored == [{"Train": {"m": "hash-of-m"}}]
+    assert (second["pred"] == second["clean"].str.upper()).all()
+
+
+def test_concurrent_stores_prune_without_errors(tmp_path, monkeypatch):
+    monkeypatch.setattr(Stage_Cache, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(Stage_Cache, "MAX_ENTRIES", 2)
+    errors = []
+
+    # nodurile paralele ale grafului salvează în acelaşi timp
+    def store_many(worker):
+        for i in range(100):
+            try:
+                Stage_Cache.store(f"{worker}-{i}", {"columns": pd.DataFrame(), "artifacts": {}})
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=store_many, args=(w,)) for w in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(list((tmp_path / "cache").glob("*.pkl"))) <= 2 + len(threads)
+
+
+def test_cache_write_failure_does_not_fail_the_node(tmp_path, monkeypatch):
+    monkeypatch.setattr(Stage_Cache, "CACHE_DIR", tmp_path / "cache")
+
+    def broken_store(key, entry):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(Stage_Cache, "store", broken_store)
+    calls, result = _run(tmp_path, {"Prep": "v1", "Train": "v1", "Predict": "v1"}, [])
+
+    # nodurile dependente rulează: eşecul cache-ului nu este eşecul etapei
+    assert calls == ["Predict", "Prep", "Train"]
+    assert "pred" in result.columns
+
+
+def test_entry_pruned_during_load_is_a_miss(tmp_path, monkeypatch):
+    monkeypatch.setattr(Stage_Cache, "CACHE_DIR", tmp_path / "cache")
+    Stage_Cache.store("k", {"columns": pd.DataFrame(), "artifacts": {}})
+
+    # alt fir şterge intrarea între citire şi actualizarea mtime
+    def pruned_utime(path, *args, **kwargs):
+        os.remove(path)
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(Stage_Cache.os, "utime", pruned_utime)
+    assert Stage_Cache.load("k") is None
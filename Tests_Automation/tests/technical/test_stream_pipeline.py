@@ -0,0 +1,188 @@
+import json
+import socket
+import threading
+import time
+
+import pandas as pd
+
+from utils.data_builder import load_base_dataset
+from config.paths import add_project_to_syspath, add_client_template_to_syspath
+
+add_project_to_syspath()
+add_client_template_to_syspath()
+
+from Client.Plugins.Text_Preprocesare import Plugin_Text_Cleaner as cleaner  # type: ignore
+from Server.App_Functions.Connection_Manager import ConnectionManager  # type: ignore
+from Server.App_Functions import Workflow_Manager  # type: ignore
+import Transfer_Format  # type: ignore
+
+send_message = cleaner.base.send_message
+recv_message = cleaner.base.recv_message
+
+
+def _fake_stream_client(address, name, level, column, delay, fail_after=None, seen=None):
+    """
+    Client minimal: pentru fiecare parte adaugă o coloană derivată din 'name'.
+    Cu fail_after se deconectează la primirea părţii cu numărul fail_after.
+    """
+    s = socket.create_connection(address)
+    s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    caps = {"formats": ["pickle"], "streaming": True}
+    s.send(f"{name}|{level}|Sequential|{json.dumps(caps)}".encode("utf-8"))
+    assert s.recv(1024) == b"CONNECTED"
+
+    def serve():
+        while True:
+            try:
+                header, data = recv_message(s)
+            except OSError:
+                return
+            if header is None:
+                return
+            chunk = Transfer_Format.decode_column_patch(data, header["format"])
+            seen.append((name, header["seq"]))
+            if fail_after is not None and len([n for n, _ in seen if n == name]) > fail_after:
+                s.shutdown(socket.SHUT_RDWR)
+                s.close()
+                return
+            time.sleep(delay)
+            patch = pd.DataFrame({column: chunk["name"].str.upper()}, index=chunk.index)
+            payload, fmt = Transfer_Format.encode_column_patch(patch, header["format"])
+            send_message(s, {"action": "work_result", "seq": header["seq"], "status": "ok",
+                             "format": fmt, "size": len(payload)}, payload)
+
+    threading.Thread(target=serve, daemon=True).start()
+    return s
+
+
+def _run_stream_workflow(specs, seen):
+    """
+    Porneşte serverul, conectează clienţii falşi şi rulează etapele secvenţiale.
+
+    Returns:
+        tuple: (ultimul client care a actualizat datele, True dacă toate etapele au reuşit)
+    """
+    clients, names = {}, set()
+    manager = ConnectionManager(clients, names)
+    address = manager.start("127.0.0.1", 0)
+    sockets = [_fake_stream_client(address, *spec, seen=seen) for spec in specs]
+    try:
+        deadline = time.monotonic() + 3
+        while len(clients) < len(specs) and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        workflow = Workflow_Manager.WorkflowManager(
+            clients_dict=clients,
+            send_file_func=None,
+            receive_file_func=recv_message,
+            send_message_func=send_message,
+            borrow_func=manager.borrow,
+            capabilities_dict=manager.capabilities,
+        )
+        stages = [(addr, conn, name, level)
+                  for addr, (conn, name, level, _) in sorted(clients.items(), key=lambda item: item[1][2])]
+        return workflow._run_stage_groups(stages)
+    finally:
+        for s in sockets:
+            s.close()
+        manager.stop()
+
+
+def test_pipeline_streams_chunks_between_stages(tmp_path, monkeypatch):
+    df = load_base_dataset(limit=1000)
+    Workflow_Manager.set_csv_data(df.to_csv(index=False), str(tmp_path / "temp_stream.csv"))
+    monkeypatch.setattr(Workflow_Manager, "STREAM_CHUNK_ROWS", 100)
+
+    seen = []
+    _, ok = _run_stream_workflow([
+        ("Upper1", 1, "upper1", 0.02),
+        ("Upper2", 2, "upper2", 0.02),
+    ], seen)
+
+    assert ok
+    result = Workflow_Manager.get_current_dataframe()
+    assert len(result) == len(df)
+    assert (result["upper1"] == df["name"].str.upper()).all()
+    assert (result["upper2"] == df["name"].str.upper()).all()
+
+    # al doilea etap primeşte partea 0 înainte ca primul să primească ultima parte
+    assert seen.index(("Upper2", 0)) < seen.index(("Upper1", 9))
+
+
+def test_pipeline_fails_when_single_client_level_dies(tmp_path, monkeypatch):
+    df = load_base_dataset(limit=1000)
+    Workflow_Manager.set_csv_data(df.to_csv(index=False), str(tmp_path / "temp_stream.csv"))
+    monkeypatch.setattr(Workflow_Manager, "STREAM_CHUNK_ROWS", 100)
+
+    seen = []
+    _, ok = _run_stream_workflow([
+        ("Upper1", 1, "upper1", 0.0, 3),
+        ("Upper2", 2, "upper2", 0.0),
+    ], seen)
+
+    # unicul client de nivel 1 a murit după 3 părţi: etapa eşuează,
+    # iar tabelul pe jumătate procesat nu înlocuieşte datele
+    assert not ok
+    assert [seq for name, seq in seen if name == "Upper1"] == [0, 1, 2, 3]
+    result = Workflow_Manager.get_current_dataframe()
+    assert "upper1" not in result.columns and "upper2" not in result.columns
+    assert list(result["name"]) == list(df["name"])
+
+
+def test_same_level_clients_share_rows_in_order(tmp_path, monkeypatch):
+    df = load_base_dataset(limit=1200)
+    Workflow_Manager.set_csv_data(df.to_csv(index=False), str(tmp_path / "temp_shard.csv"))
+    monkeypatch.setattr(Workflow_Manager, "STREAM_CHUNK_ROWS", 100)
+
+    seen = []
+    _, ok = _run_stream_workflow([
+        ("Cleaner_A", 1, "upper", 0.03),
+        ("Cleaner_B", 1, "upper", 0.03),
+        ("Cleaner_C", 1, "upper", 0.03),
+    ], seen)
+
+    assert ok
+    result = Workflow_Manager.get_current_dataframe()
+    assert list(result["name"]) == list(df["name"])
+    assert (result["upper"] == df["name"].str.upper()).all()
+
+    # fiecare instanţă a primit părţi, fiecare parte procesată o singură dată
+    workers = {name for name, _ in seen}
+    assert workers == {"Cleaner_A", "Cleaner_B", "Cleaner_C"}
+    assert sorted(seq for _, seq in seen) == list(range(12))
+
+
+def test_streaming_client_returns_row_id_keyed_chunk(monkeypatch):
+    # toate pluginurile folosesc acelaşi modul de bază; do_work trebuie fixat explicit
+    monkeypatch.setattr(cleaner.base, "do_work", cleaner.do_work)
+    df = load_base_dataset(limit=30)
+    chunk = df.iloc[10:20]
+    data, fmt = Transfer_Format.encode_column_patch(chunk, Transfer_Format.FORMAT_CSV)
+
+    reply, payload = cleaner.base.handle_work_request({"action": "work_request", "seq": 4, "format": fmt}, data)
+
+    assert reply["action"] == "work_result"
+    assert reply["seq"] == 4
+    assert reply["columns"] == ["cleaned_text"]
+    patch = Transfer_Format.decode_column_patch(payload, reply["format"])
+    assert list(patch.index) == list(range(10, 20))
+
+
+def test_streaming_csv_result_must_keep_every_row(monkeypatch):
+    df = load_base_dataset(limit=30)
+    chunk = df.iloc[10:20]
+    data, fmt = Transfer_Format.encode_column_patch(chunk, Transfer_Format.FORMAT_CSV)
+    header = {"action": "work_request", "seq": 2, "format": fmt}
+
+    # plugin vechi: întoarce CSV fără row id, cu aceleaşi rânduri
+    monkeypatch.setattr(cleaner.base, "do_work", lambda: ("ok", chunk[["name"]].to_csv(index=False)))
+    reply, payload = cleaner.base.handle_work_request(header, data)
+    patch = Transfer_Format.decode_column_patch(payload, reply["format"])
+    assert list(patch.index) == list(range(10, 20))
+
+    # un rând eliminat ar muta row id-urile: răspunsul este o eroare, fără date
+    filtered = chunk.iloc[1:][["name"]].to_csv(index=False)
+    monkeypatch.setattr(cleaner.base, "do_work", lambda: ("ok", filtered))
+    reply, payload = cleaner.base.handle_work_request(header, data)
+    assert reply["size"] == 0 and payload == b""
+    assert reply["status"].startswith("Error")
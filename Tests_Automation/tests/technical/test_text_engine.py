@@ -0,0 +1,37 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from config.paths import add_client_template_to_syspath
+
+add_client_template_to_syspath()
+
+import Text_Engine  # type: ignore
+
+
+def _reference(text):
+    """Varianta veche (per rând) din Plugin_Text_Cleaner"""
+    cleaned = str(text).lower()
+    cleaned = re.sub(r'[^a-zA-Z\s]', '', cleaned)
+    return ' '.join(cleaned.split())
+
+
+VALUES = [
+    "Hello, World!", "  a\tb\n c ", "Ünïcödé İstanbul Straße", "", "   ", "123",
+    "Σ final ΣΑΣ", "a \x1c\xa0 b", np.nan, 42, "tab\t", "\tlead", "a\x00b", "Coca-Cola 0.5L",
+]
+
+
+def test_clean_column_matches_row_by_row_version():
+    series = pd.Series(VALUES, index=range(100, 100 + len(VALUES)), dtype=object)
+    cleaned = Text_Engine.clean_column(series)
+
+    assert list(cleaned.index) == list(series.index)
+    assert list(cleaned) == [_reference(v) for v in VALUES]
+
+
+def test_multiprocess_mode_keeps_order():
+    series = pd.Series(VALUES * 50, dtype=object)
+    cleaned = Text_Engine.clean_column(series, n_jobs=3)
+    assert list(cleaned) == [_reference(v) for v in VALUES * 50]
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from config.paths import add_client_template_to_syspath
+
+add_client_template_to_syspath()
+
+import Token_List  # type: ignore
+import Transfer_Format  # type: ignore
+
+LISTS = [
+    [], ["apple"], ["red", "apple"], ["a|b", "c"], ["back\\slash", "x"],
+    ["[x", "y"], ["a", ""], ["|"], ["x[", "y]"],
+]
+
+
+def test_roundtrip_with_separator_escape_and_legacy_prefix():
+    for tokens in LISTS:
+        assert Token_List.decode_tokens(Token_List.encode_tokens(tokens)) == tokens
+
+    # formatul vechi (repr) şi valorile goale sunt încă înţelese
+    assert Token_List.decode_tokens("['red', 'apple']") == ["red", "apple"]
+    assert Token_List.decode_tokens(np.nan) == []
+    assert Token_List.decode_tokens(np.array(["q"])) == ["q"]
+
+
+def test_column_survives_csv_and_binary_transfer():
+    df = pd.DataFrame({"tokens": Token_List.encode_column(pd.Series(LISTS, dtype=object))})
+    for fmt in Transfer_Format.available_formats():
+        data, used_fmt = Transfer_Format.encode_dataframe(df, fmt)
+        restored = Transfer_Format.decode_dataframe(data, used_fmt)
+        assert Token_List.decode_column(restored["tokens"]) == LISTS
@@ -0,0 +1,43 @@
+import pandas as pd
+
+from utils.data_builder import load_base_dataset
+from config.paths import add_project_to_syspath, add_client_template_to_syspath
+
+add_project_to_syspath()
+add_client_template_to_syspath()
+
+from Client.Plugins.Text_Preprocesare import Plugin_Text_Cleaner as cleaner  # type: ignore
+import Transfer_Format  # type: ignore
+
+
+def test_all_formats_round_trip():
+    df = load_base_dataset(limit=100)
+
+    for fmt in Transfer_Format.available_formats():
+        data, used_fmt = Transfer_Format.encode_dataframe(df, fmt)
+        restored = Transfer_Format.decode_dataframe(data, used_fmt)
+        pd.testing.assert_frame_equal(restored, df, check_dtype=False)
+
+
+def test_choose_format_falls_back_to_csv():
+    assert Transfer_Format.choose_format(None) == Transfer_Format.FORMAT_CSV
+    assert Transfer_Format.choose_format(["csv"]) == Transfer_Format.FORMAT_CSV
+    assert Transfer_Format.choose_format(["pickle", "csv"]) == Transfer_Format.FORMAT_PICKLE
+
+
+def test_plugin_returns_dataframe_in_binary_mode():
+    df = load_base_dataset(limit=50)
+    base = cleaner.base
+
+    base.csv_data = None
+    base.dataframe = df
+    base.dataset_format = Transfer_Format.FORMAT_PICKLE
+    try:
+        msg, result = cleaner.do_work()
+    finally:
+        base.dataframe = None
+        base.dataset_format = Transfer_Format.FORMAT_CSV
+
+    assert "Error" not in msg
+    assert isinstance(result, pd.DataFrame)
+    assert "cleaned_text" in result.columns
@@ -0,0 +1,109 @@
+import json
+import socket
+import threading
+import time
+
+from utils.data_builder import load_base_dataset
+from config.paths import add_project_to_syspath, add_client_template_to_syspath
+
+add_project_to_syspath()
+add_client_template_to_syspath()
+
+from Client.Plugins.Text_Preprocesare import Plugin_Text_Cleaner as cleaner  # type: ignore
+from Server.App_Functions.Connection_Manager import ConnectionManager  # type: ignore
+from Server.App_Functions import Workflow_Manager  # type: ignore
+import Transfer_Format  # type: ignore
+
+base = cleaner.base
+
+
+def test_client_answers_work_request_with_single_framed_result(tmp_path, monkeypatch):
+    monkeypatch.setattr(base, "do_work", cleaner.do_work)
+    monkeypatch.setattr(base, "RECV_DIR", tmp_path)
+    monkeypatch.setattr(base, "PROCESSED_DIR", tmp_path)
+    df = load_base_dataset(limit=20)
+
+    header = {"action": "work_request", "filename": "data.csv", "accepts": ["return_columns"]}
+    reply, payload = base.handle_work_request(header, df.to_csv(index=False).encode("utf-8"))
+
+    # textul rezultatului vine în antet, datele în corp
+    assert reply["action"] == "work_result"
+    assert reply["status"].startswith("Text_Cleaner")
+    assert reply["result"] == "return_columns"
+    assert reply["size"] == len(payload)
+    patch = Transfer_Format.decode_column_patch(payload, reply["format"])
+    assert list(patch.columns) == ["cleaned_text"]
+
+
+def test_stage_round_trip_has_no_fixed_sleeps(tmp_path, monkeypatch):
+    df = load_base_dataset(limit=50)
+    Workflow_Manager.set_csv_data(df.to_csv(index=False), str(tmp_path / "temp_work.csv"))
+
+    clients, names = {}, set()
+    manager = ConnectionManager(clients, names)
+    address = manager.start("127.0.0.1", 0)
+
+    s = socket.create_connection(address)
+    s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    s.send(f"Echo|1|Sequential|{json.dumps({'formats': ['pickle']})}".encode("utf-8"))
+    assert s.recv(1024) == b"CONNECTED"
+
+    def serve():
+        header, data = base.recv_message(s)
+        assert header["action"] == "work_request"
+        frame = Transfer_Format.decode_dataframe(data, header["format"])
+        patch = frame[["name"]].rename(columns={"name": "echo"})
+        payload, fmt = Transfer_Format.encode_column_patch(patch, header["format"])
+        base.send_message(s, {"action": "work_result", "status": "Echo: done", "result": "return_columns",
+                              "format": fmt, "columns": ["echo"], "size": len(payload)}, payload)
+
+    serve_thread = threading.Thread(target=serve, daemon=True)
+    serve_thread.start()
+    try:
+        deadline = time.monotonic() + 3
+        while not clients and time.monotonic() < deadline:
+            time.sleep(0.01)
+        addr, (conn, name, level, _) = next(iter(clients.items()))
+
+        # toate mesajele serverului trec prin aceste funcţii
+        messages = []
+
+        def send_message(sock, header, data, codec=None):
+            messages.append(("sent", header["action"]))
+            return base.send_message(sock, header, data, codec=codec)
+
+        def receive_message(sock):
+            header, data = base.recv_message(sock)
+            messages.append(("received", header and header.get("action")))
+            return header, data
+
+        workflow = Workflow_Manager.WorkflowManager(
+            clients_dict=clients,
+            send_file_func=None,
+            receive_file_func=receive_message,
+            send_message_func=send_message,
+            borrow_func=manager.borrow,
+            capabilities_dict=manager.capabilities,
+        )
+
+        # nicio pauză fixă nici pe server, nici în clientul care răspunde
+        sleeps = []
+        sleep = time.sleep
+        exchange_threads = {threading.current_thread(), serve_thread}
+
+        def recording_sleep(seconds):
+            if threading.current_thread() in exchange_threads:
+                sleeps.append(seconds)
+            sleep(seconds)
+
+        monkeypatch.setattr(time, "sleep", recording_sleep)
+        assert workflow._run_sequential_client(addr, conn, name, level)
+        monkeypatch.undo()
+    finally:
+        s.close()
+        manager.stop()
+
+    assert (Workflow_Manager.get_current_dataframe()["echo"] == df["name"]).all()
+    # înainte: send + sleep(0.5) + "WORK" + sleep(0.3) pe client + recv
+    assert sleeps == []
+    assert messages == [("sent", "work_request"), ("received", "work_result")]
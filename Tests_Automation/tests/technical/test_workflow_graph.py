@@ -0,0 +1,144 @@
+import importlib.util
+import threading
+import time
+
+from config.paths import add_project_to_syspath, add_client_template_to_syspath, CLIENT_ROOT
+
+add_project_to_syspath()
+add_client_template_to_syspath()
+
+from Server.App_Functions import Workflow_Manager  # type: ignore
+from Server.App_Functions import Workflow_Graph  # type: ignore
+import Client_Template as base  # type: ignore
+
+PLUGINS = [
+    "Text_Preprocesare/Plugin_Text_Cleaner.py",
+    "Text_Preprocesare/Plugin_Tokenizer.py",
+    "Text_Preprocesare/Plugin_Lemmatizer.py",
+    "Model_Antrenare/Plugin_Antrenare_Model1.py",
+    "Model_Antrenare/Plugin_Validare_Model1.py",
+    "Model_Antrenare/Plugin_Antrenare_Model2.py",
+    "Model_Antrenare/Plugin_Validare_Model2.py",
+    "Model_Antrenare/Plugin_Prediction_Client.py",
+]
+
+
+def _plugin_clients(monkeypatch):
+    """Clienţii (addr, conn, name, level, mode, capabilities) cu declaraţiile reale ale plugin-urilor"""
+    # plugin-urile rescriu atributele şablonului la import
+    for attr in ("CLIENT_NAME", "CLIENT_LEVEL", "CLIENT_MODE", "CLIENT_STREAMING",
+                 "CLIENT_INPUTS", "CLIENT_OUTPUTS", "CLIENT_DEPENDENCIES", "CLIENT_CACHEABLE", "do_work"):
+        monkeypatch.setattr(base, attr, getattr(base, attr))
+
+    clients = []
+    for i, plugin in enumerate(PLUGINS):
+        monkeypatch.setattr(base, "CLIENT_INPUTS", None)
+        monkeypatch.setattr(base, "CLIENT_OUTPUTS", None)
+        monkeypatch.setattr(base, "CLIENT_CACHEABLE", True)
+        path = CLIENT_ROOT / "Plugins" / plugin
+        spec = importlib.util.spec_from_file_location(f"_graph_{path.stem}", path)
+        spec.loader.exec_module(importlib.util.module_from_spec(spec))
+        caps = {k: v for k, v in base.client_capabilities().items() if k in ("inputs", "outputs")}
+        caps["cacheable"] = base.CLIENT_CACHEABLE
+        clients.append((("10.0.0.1", i), None, base.CLIENT_NAME, int(base.CLIENT_LEVEL),
+                        base.CLIENT_MODE, caps))
+    return clients
+
+
+def _graph(clients):
+    nodes = Workflow_Graph.build_nodes(clients)
+    return Workflow_Graph.merge_chains(Workflow_Graph.build_graph(nodes))
+
+
+def _deps(nodes):
+    return {node.name: sorted(dep.name for dep in node.deps) for node in nodes}
+
+
+def test_plugin_declarations_order_validation_after_its_own_training(monkeypatch):
+    nodes = _graph(_plugin_clients(monkeypatch))
+
+    chain = "Text_Cleaner → Tokenizer → Lemmatizer"
+    assert _deps(nodes) == {
+        chain: [],
+        "Model1_Training": [chain],
+        "Model2_Training": [chain],
+        "Model1_Validation": ["Model1_Training"],
+        "Model2_Validation": ["Model2_Training"],
+        "Prediction_Client": ["Model1_Training", "Model2_Training"],
+    }
+
+
+def test_only_prediction_client_opts_out_of_stage_cache(monkeypatch):
+    # Prediction_Client dublează istoria la fiecare rulare: nu poate fi luat din cache
+    uncacheable = [name for _, _, name, _, _, caps in _plugin_clients(monkeypatch) if not caps["cacheable"]]
+    assert uncacheable == ["Prediction_Client"]
+
+
+def test_prediction_waits_for_stages_that_write_the_true_labels(monkeypatch):
+    # Prediction_Client citeşte type şi name (acurateţe, actual_* în istorie)
+    relabel = (("10.0.0.2", 1), None, "Relabel", 6, "Parallel",
+               {"inputs": ["column:name"], "outputs": ["column:type"]})
+    nodes = _graph(_plugin_clients(monkeypatch) + [relabel])
+
+    assert "Relabel" in _deps(nodes)["Prediction_Client"]
+
+
+def test_undeclared_clients_keep_the_stage_order():
+    clients = [(("10.0.0.1", level), None, f"C{level}", level, mode, {})
+               for level, mode in [(1, "Sequential"), (2, "Sequential"), (4, "Parallel"),
+                                   (5, "Parallel"), (8, "Sequential")]]
+
+    assert _deps(_graph(clients)) == {
+        "C1 → C2": [],
+        "C4": ["C1 → C2"],
+        "C5": ["C1 → C2"],
+        "C8": ["C4", "C5"],
+    }
+
+
+def _run_fake_graph(durations, failing=()):
+    """Rulează graful modelelor cu noduri false; întoarce (timpi, noduri pornite)"""
+    resources = {
+        "Train1": (["column:model_target"], ["model:model1", "column:m1"]),
+        "Val1": (["model:model1", "column:model_target"], ["column:v1"]),
+        "Train2": (["column:model_target"], ["model:model2", "column:m2"]),
+        "Val2": (["model:model2", "column:model_target"], ["column:v2"]),
+        "Predict": (["model:model1", "model:model2"], ["column:p"]),
+    }
+    clients = [(("10.0.0.1", level), None, name, level,
+                "Sequential" if name == "Predict" else "Parallel",
+                {"inputs": resources[name][0], "outputs": resources[name][1]})
+               for level, name in enumerate(resources, start=4)]
+    nodes = _graph(clients)
+    workflow = Workflow_Manager.WorkflowManager({}, None, None, None)
+    started, lock = [], threading.Lock()
+
+    def fake_run_node(node):
+        with lock:
+            started.append(node.name)
+        time.sleep(durations[node.name])
+        return node.name not in failing
+
+    workflow._run_node = fake_run_node
+    timings = workflow._run_graph(nodes)
+    return {node.name: span for node, span in timings.items()}, started
+
+
+def test_nodes_start_as_soon_as_their_dependencies_finish():
+    durations = {"Train1": 0.05, "Val1": 0.05, "Train2": 0.4, "Val2": 0.05, "Predict": 0.05}
+    timings, _ = _run_fake_graph(durations)
+
+    # Val1 nu aşteaptă Train2
+    assert timings["Val1"][0] < timings["Train2"][1]
+    assert timings["Val1"][0] >= timings["Train1"][1]
+    assert timings["Predict"][0] >= timings["Train2"][1]
+    # Val2 şi Predict rulează împreună după Train2
+    assert timings["Val2"][0] < timings["Predict"][1]
+
+
+def test_failed_node_skips_its_dependents():
+    durations = dict.fromkeys(["Train1", "Val1", "Train2", "Val2", "Predict"], 0.01)
+    timings, started = _run_fake_graph(durations, failing={"Train1"})
+
+    assert sorted(started) == ["Train1", "Train2", "Val2"]
+    assert "Val1" not in timings and "Predict" not in timings
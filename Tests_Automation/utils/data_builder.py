@@ -44,3 +44,12 @@ def to_csv_string(df: pd.DataFrame) -> str:
     buffer = StringIO()
     df.to_csv(buffer, index=False)
     return buffer.getvalue()
+
+
+def build_synthetic_dataset(n_rows: int) -> pd.DataFrame:
+    """
+    Dataset sintetic de dimensiune arbitrară pentru benchmark-uri:
+    rândurile originale sunt eşantionate cu înlocuire până la n_rows.
+    """
+    df = load_base_dataset()
+    return df.sample(n=n_rows, replace=True, random_state=42).reset_index(drop=True)